@@ -26,7 +26,7 @@ def main():
                         level=logging.INFO if options.verbose else logging.WARNING)
 
     if options.command == 'list':
-        for isomme in [pyisomme.Isomme().read(input_path) for input_path in options.input_paths]:
+        for isomme in [pyisomme.Isomme().read(input_path, lazy=True) for input_path in options.input_paths]:
             print("\n")
             print(isomme.test_number)
 
@@ -93,8 +93,8 @@ def main():
                 isomme.crop(options.crop)
 
         report = {report.__name__: report for report in REPORTS}[options.report_name](isomme_list)
-        report.calculate()
-        report.export_pptx(options.report_path, template=options.template)
+        report.calculate(workers=options.workers)
+        report.export_pptx(options.report_path, template=options.template, workers=options.workers)
 
     if options.command == "plot":
         if options.calculate:
@@ -106,7 +106,8 @@ def main():
         pyisomme.Plot_Line({isomme: [isomme.get_channels(*options.codes)[n]] for isomme in isomme_list},
                            xlim=options.xlim,
                            ylim=options.ylim,
-                           legend=options.legend).show()
+                           legend=options.legend,
+                           max_points=options.max_points).show()
 
 
 if __name__ == "__main__":
@@ -200,6 +201,10 @@ if __name__ == "__main__":
                                type=float,
                                metavar=('START', 'STOP'),
                                help="Crop ISO-MME channels to x-min to x-max e.g. (--crop 0.0 0.15)")
+    report_parser.add_argument("--workers",
+                               dest="workers",
+                               type=int,
+                               help="Number of processes to calculate tests and render pages in parallel")
 
     plot_parser = command_parsers.add_parser("plot", help="Plot Channels")
     plot_parser.add_argument(nargs="+",
@@ -234,6 +239,11 @@ if __name__ == "__main__":
                              dest="legend",
                              action="store_false",
                              help="Hide legend")
+    plot_parser.add_argument("--max-points",
+                             dest="max_points",
+                             type=int,
+                             help="Maximum number of points per line. Long channels are reduced to minimum and maximum "
+                                  "values of consecutive samples (peaks are preserved). Default: all samples")
 
     options = parser.parse_args()
 
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from pyisomme.info import Info
+from pyisomme.channel import Channel
+
+import os
+import json
+import hashlib
+import tempfile
+import zipfile
+import logging
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".gz")
+
+
+def get_source_stats(path: str | Path) -> list:
+    """
+    Collect (relative path, mtime in ns, size) of all files a test is read from.
+    Archives are a single file, otherwise all files of the test folder are considered.
+    :param path: path of test (see Isomme.read())
+    :return: list of file stats
+    """
+    path = Path(path).absolute()
+    if path.is_file():
+        if path.suffix.lower() in ARCHIVE_SUFFIXES:
+            stat = path.stat()
+            return [(path.name, stat.st_mtime_ns, stat.st_size)]
+        elif path.suffix.lower() == ".mme":
+            path = path.parent
+        else:  # .chn/.001/... in Channel folder
+            path = path.parent.parent
+
+    stats = []
+    for root, _, files in os.walk(path):
+        for file in sorted(files):
+            stat = os.stat(os.path.join(root, file))
+            stats.append((os.path.relpath(os.path.join(root, file), path), stat.st_mtime_ns, stat.st_size))
+    return sorted(stats)
+
+
+def get_cache_key(path: str | Path, channel_code_patterns: tuple = ()) -> str:
+    """
+    Cache key of test depending on source path, modification time and size of source files and channel code patterns.
+    :param path: path of test (see Isomme.read())
+    :param channel_code_patterns: channel code patterns used to read the test
+    :return: hex digest
+    """
+    key = json.dumps([CACHE_VERSION, str(Path(path).absolute()), get_source_stats(path), sorted(channel_code_patterns)])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def encode_info(info: Info) -> list:
+    return [(name, {"datetime": value.isoformat()} if isinstance(value, datetime) else value) for name, value in info]
+
+
+def decode_info(info: list) -> Info:
+    return Info([(name, datetime.fromisoformat(value["datetime"]) if isinstance(value, dict) else value) for name, value in info])
+
+
+def write_cache(isomme, cache_dir: str | Path, key: str, source: str | Path) -> None:
+    """
+    Write test to cache directory. Data of all channels is stored in a (uncompressed) .npz-file, test info and channel
+    info in a .json-sidecar. Outdated cache entries of the same source (modified source files) are removed, entries
+    of other channel code patterns are kept (see evict_cache()).
+    :param isomme: Isomme-object
+    :param cache_dir: cache directory
+    :param key: cache key (see get_cache_key())
+    :param source: path of test
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    source = str(Path(source).absolute())
+    source_stats = [list(stat) for stat in get_source_stats(source)]
+
+    # Invalidate outdated entries of same source
+    for sidecar_path in cache_dir.glob("*.json"):
+        if sidecar_path.stem == key:
+            continue
+        try:
+            with open(sidecar_path, "r", encoding="utf-8") as sidecar_file:
+                sidecar = json.load(sidecar_file)
+            if sidecar.get("source") == source and sidecar.get("source_stats") != source_stats:
+                delete_cache_entry(cache_dir, sidecar_path.stem)
+        except (OSError, ValueError):
+            continue
+
+    arrays = {}
+    channels = []
+    for idx, channel in enumerate(isomme.channels):
+        arrays[f"index_{idx}"] = channel.get_time()
+        arrays[f"values_{idx}"] = channel.get_data()
+        column = channel.data_labels[1]
+        channels.append({"code": str(channel.code),
+                         "columns": [column if isinstance(column, (int, str)) else str(column)],
+                         "info": encode_info(channel.info)})
+    sidecar = {"version": CACHE_VERSION,
+               "source": source,
+               "source_stats": source_stats,
+               "created": datetime.now().isoformat(),
+               "test_number": isomme.test_number,
+               "test_info": encode_info(isomme.test_info),
+               "channel_info": encode_info(isomme.channel_info),
+               "channels": channels}
+
+    # Write sidecar last, entries without sidecar are incomplete and ignored
+    replace_file(cache_dir / f"{key}.npz", lambda npz_file: np.savez(npz_file, **arrays))
+    replace_file(cache_dir / f"{key}.json", lambda sidecar_file: sidecar_file.write(json.dumps(sidecar).encode("utf-8")))
+
+
+def replace_file(path: Path, write) -> None:
+    """
+    Write file under temporary name and rename it afterwards. Concurrent readers never see a partially written file
+    and an interrupted write does not leave a truncated file behind.
+    :param path: path of file
+    :param write: function writing the content to the given file object (binary mode)
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            write(tmp_file)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def read_cache(isomme, cache_dir: str | Path, key: str) -> bool:
+    """
+    Read test from cache directory into Isomme-object.
+    :param isomme: Isomme-object
+    :param cache_dir: cache directory
+    :param key: cache key (see get_cache_key())
+    :return: True if cache entry exists and was read
+    """
+    cache_dir = Path(cache_dir)
+    sidecar_path = cache_dir / f"{key}.json"
+    npz_path = cache_dir / f"{key}.npz"
+    if not sidecar_path.exists() or not npz_path.exists():
+        return False
+
+    try:
+        with open(sidecar_path, "r", encoding="utf-8") as sidecar_file:
+            sidecar = json.load(sidecar_file)
+        if sidecar.get("version") != CACHE_VERSION:
+            return False
+        with np.load(npz_path) as arrays:
+            channels = []
+            for idx, channel_dict in enumerate(sidecar["channels"]):
+                info = decode_info(channel_dict["info"])
+                channel = Channel(channel_dict["code"], None, unit=info.get("Unit"), info=info)
+                channels.append(channel.set_data(arrays[f"values_{idx}"], arrays[f"index_{idx}"], labels=(None, channel_dict["columns"][0])))
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+        logger.warning(f"Could not read cache entry {key}: {e!r}")
+        return False
+
+    isomme.test_number = sidecar["test_number"]
+    isomme.test_info = decode_info(sidecar["test_info"])
+    isomme.channel_info = decode_info(sidecar["channel_info"])
+    isomme.channels = channels
+
+    # Update access time for eviction
+    os.utime(sidecar_path)
+    return True
+
+
+def delete_cache_entry(cache_dir: str | Path, key: str) -> None:
+    for suffix in (".json", ".npz"):
+        (Path(cache_dir) / f"{key}{suffix}").unlink(missing_ok=True)
+
+
+def evict_cache(cache_dir: str | Path, max_size: int) -> None:
+    """
+    Delete least recently used cache entries until total size of cache directory is below max_size.
+    :param cache_dir: cache directory
+    :param max_size: maximum size in bytes
+    """
+    entries = []
+    total_size = 0
+    for sidecar_path in Path(cache_dir).glob("*.json"):
+        npz_path = sidecar_path.with_suffix(".npz")
+        try:  # entry might be deleted by other process in the meantime
+            size = sidecar_path.stat().st_size + (npz_path.stat().st_size if npz_path.exists() else 0)
+            entries.append((sidecar_path.stat().st_mtime_ns, sidecar_path.stem, size))
+        except OSError:
+            continue
+        total_size += size
+
+    for _, key, size in sorted(entries):
+        if total_size <= max_size:
+            break
+        logger.debug(f"Evict cache entry {key}")
+        delete_cache_entry(cache_dir, key)
+        total_size -= size
+
+
+def clear_cache(cache_dir: str | Path) -> None:
+    """
+    Delete all cache entries (including temporary files of interrupted writes).
+    :param cache_dir: cache directory
+    """
+    for path in list(Path(cache_dir).glob("*.json")) + list(Path(cache_dir).glob("*.npz")) + list(Path(cache_dir).glob("*.tmp")):
+        path.unlink(missing_ok=True)
@@ -9,7 +9,9 @@ import copy
 import logging
 import numpy as np
 import pandas as pd
-from scipy.integrate import solve_ivp, trapezoid
+from scipy.integrate import solve_ivp, trapezoid, cumulative_trapezoid
+from scipy.linalg import expm
+from scipy.signal import lfilter
 
 
 logger = logging.getLogger(__name__)
@@ -60,40 +62,58 @@ def calculate_hic(channel: Channel, max_delta_t) -> Channel | None:
     if channel is None:
         return None
 
-    channel = channel.convert_unit(g0)
-
     max_delta_t *= 1e-3
-    time_array = np.array(channel.data.index)
+    time_array = np.array(channel.get_time())
+    value_array = channel.get_data(unit=g0)
     res = 0
     res_t1 = None
     res_t2 = None
 
-    if np.all(channel.get_data() >= 0):  # this is the case for resultant channels
-        # Integral can only be positive -> extrema expected for maximum timespan (more runtime efficient)
-        for idx_1, t1 in enumerate(time_array[:-1]):
-            upper_limit_idx = (t1 + max_delta_t <= time_array).argmax()
-            idx_2 = upper_limit_idx - 1
-            t2 = time_array[idx_2]
-            a_int = np.trapz(channel.get_data(time_array[idx_1:idx_2+1]), time_array[idx_1:idx_2+1])
+    # Integral over every window [t1, t2] as difference of cumulative integral
+    cumulative_integral = cumulative_trapezoid(value_array, time_array, initial=0)
+    idx_1 = np.arange(len(time_array) - 1)
+    upper_limit_idx = np.searchsorted(time_array, time_array[:-1] + max_delta_t, side="left")
+    upper_limit_idx[upper_limit_idx == len(time_array)] = 0  # No window of max_delta_t possible
+
+    def get_windows():
+        if np.all(value_array >= 0):  # this is the case for resultant channels
+            # Integral can only be positive -> extrema expected for maximum timespan (more runtime efficient)
+            valid = upper_limit_idx > 0
+            yield idx_1[valid], upper_limit_idx[valid] - 1
+        else:
+            # Integral can be negative -> extrema can occur for smaller timespan
+            for idx2_offset in range(1, np.max(upper_limit_idx - idx_1, initial=1)):
+                valid = idx_1 + idx2_offset < upper_limit_idx
+                yield idx_1[valid], idx_1[valid] + idx2_offset
+
+    def get_hic_values(window_idx_1, window_idx_2):
+        delta_t = time_array[window_idx_2] - time_array[window_idx_1]
+        a_int = cumulative_integral[window_idx_2] - cumulative_integral[window_idx_1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(a_int >= 0, delta_t * (1 / delta_t * a_int) ** 2.5, np.nan)
+
+    max_res = np.nanmax([np.nanmax(get_hic_values(*window), initial=0) for window in get_windows()], initial=0)
+
+    if max_res > 0:
+        # Windows close to maximum are evaluated exactly (in original order) to be independent of rounding errors
+        candidates = []
+        for window_idx_1, window_idx_2 in get_windows():
+            is_candidate = get_hic_values(window_idx_1, window_idx_2) >= max_res * (1 - 1e-6)
+            candidates.append(np.column_stack([window_idx_1[is_candidate], window_idx_2[is_candidate]]))
+        candidates = np.concatenate(candidates)
+        candidates = candidates[np.lexsort((candidates[:, 1], candidates[:, 0]))]
+
+        for window_idx_1, window_idx_2 in candidates:
+            t1 = time_array[window_idx_1]
+            t2 = time_array[window_idx_2]
+            a_int = np.trapz(value_array[window_idx_1:window_idx_2+1], time_array[window_idx_1:window_idx_2+1])
+            if a_int < 0:
+                continue
             new_res = (t2 - t1) * (1 / (t2 - t1) * a_int) ** 2.5
             if new_res > res:
                 res = new_res
                 res_t1 = t1
                 res_t2 = t2
-    else:
-        # Integral can be negative -> extrema can occur for smaller timespan
-        for idx_1, t1 in enumerate(time_array[:-1]):
-            upper_limit_idx = (t1 + max_delta_t <= time_array).argmax()
-            for idx2_offset, t2 in enumerate(time_array[idx_1+1:upper_limit_idx]):
-                idx_2 = idx_1 + 1 + idx2_offset
-                a_int = np.trapz(channel.get_data(time_array[idx_1:idx_2+1]), time_array[idx_1:idx_2+1])
-                if a_int < 0:
-                    continue
-                new_res = (t2 - t1) * (1 / (t2 - t1) * a_int) ** 2.5
-                if new_res > res:
-                    res = new_res
-                    res_t1 = t1
-                    res_t2 = t2
 
     return Channel(
         code=channel.code.set(main_location="HICR",
@@ -112,6 +132,28 @@ def calculate_hic(channel: Channel, max_delta_t) -> Channel | None:
               (".Analysis end time", channel.data.index[-1]),])
 
 
+def get_range_min(value_array: np.ndarray, idx_1: np.ndarray, idx_2: np.ndarray) -> np.ndarray:
+    """
+    Minimum of value_array[idx_1:idx_2+1] for each pair of indices.
+    Uses a table of minima over windows with length of powers of 2, so each range is covered by two overlapping windows.
+    :param value_array: 1D array
+    :param idx_1: start indices
+    :param idx_2: end indices (inclusive, idx_2 >= idx_1)
+    :return: array of minima
+    """
+    length = idx_2 - idx_1 + 1
+    level = np.floor(np.log2(length)).astype(int)
+    res = np.empty(len(idx_1))
+
+    table = np.asarray(value_array, dtype=float)
+    for k in range(np.max(level, initial=0) + 1):
+        if k > 0:
+            table = np.minimum(table[:-2**(k-1)], table[2**(k-1):])
+        is_level = level == k
+        res[is_level] = np.minimum(table[idx_1[is_level]], table[idx_2[is_level] - 2**k + 1])
+    return res
+
+
 @debug_logging(logger)
 def calculate_xms(channel: Channel, min_delta_t: float = 3, method: str = "S") -> Channel | None:
     """
@@ -128,7 +170,7 @@ def calculate_xms(channel: Channel, min_delta_t: float = 3, method: str = "S") -
         return None
 
     min_delta_t *= 1e-3  # convert to s
-    time_array = channel.data.index
+    time_array = channel.data.index.to_numpy()
     value_array = channel.get_data()
 
     res = 0
@@ -136,37 +178,57 @@ def calculate_xms(channel: Channel, min_delta_t: float = 3, method: str = "S") -
     res_t2 = None
 
     if method == "S":
-        for t1 in time_array:
-            t2_pts = time_array[time_array >= t1 + min_delta_t]
-            if len(t2_pts) == 0:
-                break
-            t2 = t2_pts[0]
-            indices = np.where((t1 <= time_array)*(time_array <= t2))
-            values = value_array[indices]
-
-            new_res = np.min(values)
-
-            if new_res > res:
-                res = new_res
-                res_t1 = t1
-                res_t2 = t2
+        # Window [t1, t2] with t2 as first sample at least min_delta_t after t1
+        idx_2 = np.searchsorted(time_array, time_array + min_delta_t, side="left")
+        idx_1 = np.arange(np.count_nonzero(idx_2 < len(time_array)))
+        idx_2 = idx_2[idx_1]
+
+        if len(idx_1) != 0:
+            window_min = get_range_min(value_array, idx_1, idx_2)
+            window_min[np.isnan(window_min)] = -np.inf
+            idx_max = np.argmax(window_min)
+            if window_min[idx_max] > res:
+                res = window_min[idx_max]
+                res_t1 = time_array[idx_1[idx_max]]
+                res_t2 = time_array[idx_2[idx_max]]
 
     elif method == "C":
+        # Duration above value: sum of all time steps with both boundary values greater or equal
         dt = np.append(np.diff(time_array), 0)
-
-        for value in np.sort(value_array)[::-1]:
-            greater_indices = np.nonzero(value_array >= value)[0]
-            greater_indices_left = np.array([greater_idx for greater_idx in greater_indices if (greater_idx+1) in greater_indices], dtype=int)
-
-            if np.sum(dt[greater_indices_left]) >= min_delta_t:
-                res = value
-                res_t1 = time_array[greater_indices_left[0]]
-                res_t2 = time_array[greater_indices_left[-1] + 1]  #  +1 because right bound was delete
-                break
+        step_min = np.minimum(value_array[:-1], value_array[1:])
+        is_defined = ~np.isnan(step_min)
+        step_idx = np.nonzero(is_defined)[0][np.argsort(-step_min[is_defined], kind="stable")]
+        step_min_sorted = step_min[step_idx]
+        duration = np.append(0, np.cumsum(dt[step_idx]))
+
+        values = np.sort(value_array[~np.isnan(value_array)])[::-1]
+        number_of_steps = np.searchsorted(-step_min_sorted, -values, side="right")
+        values_duration = duration[number_of_steps]
+
+        def get_steps(value):
+            return np.nonzero(step_min >= value)[0]
+
+        def is_exceeded(value):
+            return np.sum(dt[get_steps(value)]) >= min_delta_t
+
+        candidates = np.nonzero(values_duration >= min_delta_t)[0]
+        if len(candidates) != 0:
+            # Check threshold exactly (summation order) to be independent of rounding errors of cumulative sum
+            idx = candidates[0]
+            while idx > 0 and is_exceeded(values[idx - 1]):
+                idx -= 1
+            while idx < len(values) and not is_exceeded(values[idx]):
+                idx += 1
+
+            if idx < len(values):
+                res = values[idx]
+                steps = get_steps(res)
+                res_t1 = time_array[steps[0]]
+                res_t2 = time_array[steps[-1] + 1]  # +1 because right bound was delete
 
     new_code = channel.code.set(fine_location_2=f"{(min_delta_t*1e3):.0f}{method}",
                                 filter_class="X")
-    new_info = channel.info
+    new_info = copy.deepcopy(channel.info)
     new_info.update({
         "Data source": "calculation",
     }).add({
@@ -225,13 +287,9 @@ def calculate_bric(c_av_x: Channel | None,
             "Average of CSDM and MPS": 42.87,
         }[method]  # rad/s
 
-    c_av_x = c_av_x.convert_unit("rad/s")
-    c_av_y = c_av_y.convert_unit("rad/s")
-    c_av_z = c_av_z.convert_unit("rad/s")
-
-    av_x = c_av_x.get_data()
-    av_y = c_av_x.get_data()
-    av_z = c_av_x.get_data()
+    av_x = c_av_x.get_data(unit="rad/s")
+    av_y = c_av_x.get_data(unit="rad/s")
+    av_z = c_av_x.get_data(unit="rad/s")
 
     bric = np.sqrt((np.max(np.abs(av_x))/critical_av_x)**2 + (np.max(np.abs(av_y))/critical_av_y)**2 + (np.max(np.abs(av_z))/critical_av_z)**2)
 
@@ -254,11 +312,16 @@ def calculate_bric(c_av_x: Channel | None,
 @debug_logging(logger)
 def calculate_damage(c_aa_x: Channel | None,
                      c_aa_y: Channel | None,
-                     c_aa_z: Channel | None) -> tuple[Channel, ...] | None:
+                     c_aa_z: Channel | None,
+                     method: str = "expm") -> tuple[Channel, ...] | None:
     """
     :param c_aa_x: Angular Acceleration Channel
     :param c_aa_y: Angular Acceleration Channel
     :param c_aa_z: Angular Acceleration Channel
+    :param method: "expm" for exact solution of the linear system with angular acceleration linear between samples
+    (requires constant sampling interval, otherwise "solve_ivp" is used) or "solve_ivp" (RK45 with default tolerances).
+    Compared to solve_ivp with rtol=1e-10, "expm" deviates less than 1e-6 (relative to maximum), "solve_ivp" with
+    default tolerances up to 3% (approx. 1% for maximum damage).
     :return: 8 Channels with time and scalar data for each direction (x,y,z,resultant)
     References:
     - Euro-NCAP Technical Bulletin: https://cdn.euroncap.com/media/77157/tb-035-brain-injury-calculation-v101.pdf
@@ -282,10 +345,8 @@ def calculate_damage(c_aa_x: Channel | None,
     if c_aa_x is None or c_aa_y is None or c_aa_z is None:
         return None
 
-    # Convert Units to SI
-    c_aa_x = c_aa_x.convert_unit("rad/s^2")
-    c_aa_y = c_aa_y.convert_unit("rad/s^2")
-    c_aa_z = c_aa_z.convert_unit("rad/s^2")
+    # Units in SI
+    unit = "rad/s^2"
 
     # Constants
     m_x = 1  # Mass [kg]
@@ -306,29 +367,41 @@ def calculate_damage(c_aa_x: Channel | None,
     c_zz = a_1 * k_zz
     beta = 2.9903  # [1/m]
 
-    # Define the system of differential equations (reduction of order)
-    def dydt(t, y):
-        return [y[3],
-                y[4],
-                y[5],
-                1/m_x*(-(c_xx+c_xy+c_xz)*y[3] + c_xy*y[4]             + c_xz*y[5]             - (k_xx+k_xy+k_xz)*y[0] + k_xy*y[1]             + k_xz*y[2])             + c_aa_x.get_data(t),
-                1/m_y*(c_xy*y[3]              - (c_xy+c_yy+c_yz)*y[4] + c_yz*y[5]             + k_xy*y[0]             - (k_xy+k_yy+k_yz)*y[1] + k_yz*y[2])             + c_aa_y.get_data(t),
-                1/m_z*(c_xz*y[3]              + c_yz*y[4]             - (c_xz+c_yz+c_zz)*y[5] + k_xz*y[0]             + k_yz*y[1]             - (k_xz+k_yz+k_zz)*y[2]) + c_aa_z.get_data(t)]
-
-    # Define the initial conditions
-    initial_conditions = [0, 0, 0, 0, 0, 0]
+    # Define the system of differential equations (reduction of order): dy/dt = A*y + aa
+    a_matrix = np.zeros((6, 6))
+    a_matrix[:3, 3:] = np.eye(3)
+    a_matrix[3:, :3] = -np.diag([1/m_x, 1/m_y, 1/m_z]) @ np.array([[k_xx+k_xy+k_xz, -k_xy, -k_xz],
+                                                                    [-k_xy, k_xy+k_yy+k_yz, -k_yz],
+                                                                    [-k_xz, -k_yz, k_xz+k_yz+k_zz]])
+    a_matrix[3:, 3:] = -np.diag([1/m_x, 1/m_y, 1/m_z]) @ np.array([[c_xx+c_xy+c_xz, -c_xy, -c_xz],
+                                                                    [-c_xy, c_xy+c_yy+c_yz, -c_yz],
+                                                                    [-c_xz, -c_yz, c_xz+c_yz+c_zz]])
+    b_matrix = np.zeros((6, 3))
+    b_matrix[3:, :] = np.eye(3)
 
     # Define the time span over which to solve the system
     t_array = time_intersect(c_aa_x, c_aa_y, c_aa_z)
-    t_span = (t_array[0], t_array[-1])
 
-    # Solve the system of differential equations
-    sol = solve_ivp(dydt, t_span, initial_conditions, t_eval=t_array)
+    if method == "expm" and len(t_array) > 1 and not np.allclose(np.diff(t_array), t_array[1] - t_array[0], rtol=1e-6, atol=0):
+        logger.info("Sampling interval not constant. Use solve_ivp to calculate damage.")
+        method = "solve_ivp"
+
+    if method == "expm":
+        aa_array = np.column_stack([c_aa_x.get_data(t_array, unit=unit), c_aa_y.get_data(t_array, unit=unit), c_aa_z.get_data(t_array, unit=unit)])
+        y = solve_lti_foh(a_matrix, b_matrix, aa_array, t_array[1] - t_array[0] if len(t_array) > 1 else 0).T
+    elif method == "solve_ivp":
+        def dydt(t, y):
+            return a_matrix @ y + b_matrix @ [c_aa_x.get_data(t, unit=unit), c_aa_y.get_data(t, unit=unit), c_aa_z.get_data(t, unit=unit)]
+
+        # Solve the system of differential equations
+        y = solve_ivp(dydt, (t_array[0], t_array[-1]), [0, 0, 0, 0, 0, 0], t_eval=t_array).y
+    else:
+        raise NotImplementedError(f"Method '{method}' not implemented.")
 
     # Create time channels
     damage_x = Channel(code=c_aa_x.code.set(fine_location_1="DA", fine_location_2="MA", direction="X"),
-                       data=pd.DataFrame(beta * np.abs(sol.y[0]), index=sol.t),
-                       unit=c_aa_x.unit,
+                       data=pd.DataFrame(beta * np.abs(y[0]), index=t_array),
+                       unit=unit,
                        info={"Data source": "calculation",
                              ".Channel 001": c_aa_x.code,
                              ".Channel 002": c_aa_y.code,
@@ -337,12 +410,12 @@ def calculate_damage(c_aa_x: Channel | None,
                              ".Filter 002": c_aa_y.code.filter_class,
                              ".Filter 003": c_aa_z.code.filter_class,})
     damage_y = Channel(code=c_aa_y.code.set(fine_location_1="DA", fine_location_2="MA", direction="Y"),
-                       data=pd.DataFrame(beta * np.abs(sol.y[1]), index=sol.t),
-                       unit=c_aa_y.unit,
+                       data=pd.DataFrame(beta * np.abs(y[1]), index=t_array),
+                       unit=unit,
                        info=damage_x.info)
     damage_z = Channel(code=c_aa_z.code.set(fine_location_1="DA", fine_location_2="MA", direction="Z"),
-                       data=pd.DataFrame(beta * np.abs(sol.y[2]), index=sol.t),
-                       unit=c_aa_z.unit,
+                       data=pd.DataFrame(beta * np.abs(y[2]), index=t_array),
+                       unit=unit,
                        info=damage_x.info)
     damage_r = calculate_resultant(damage_x, damage_y, damage_z)
 
@@ -375,6 +448,46 @@ def calculate_damage(c_aa_x: Channel | None,
     return damage_x, damage_y, damage_z, damage_r, damage_x_max, damage_y_max, damage_z_max, damage_r_max
 
 
+def solve_lti_foh(a_matrix: np.ndarray, b_matrix: np.ndarray, u: np.ndarray, sampling_interval: float) -> np.ndarray:
+    """
+    Solve linear time-invariant system dx/dt = A*x + B*u with x(0) = 0 on a constant time grid. The input u is assumed
+    linear between samples (first-order hold), for which the matrix exponential gives the exact state transition.
+    The recursion x[k+1] = Phi*x[k] + w[k] is evaluated per eigenmode of Phi with lfilter.
+    :param a_matrix: system matrix (n x n)
+    :param b_matrix: input matrix (n x m)
+    :param u: input (number of samples x m)
+    :param sampling_interval: in s
+    :return: state (number of samples x n)
+    """
+    n, m = b_matrix.shape
+    number_of_samples = len(u)
+    x = np.zeros((number_of_samples, n))
+    if number_of_samples < 2:
+        return x
+
+    # Discretization (first-order hold)
+    augmented_matrix = np.zeros((n + 2 * m, n + 2 * m))
+    augmented_matrix[:n, :n] = a_matrix * sampling_interval
+    augmented_matrix[:n, n:n + m] = b_matrix * sampling_interval
+    augmented_matrix[n:n + m, n + m:] = np.eye(m)
+    transition = expm(augmented_matrix)
+    phi = transition[:n, :n]
+    gamma_1 = transition[:n, n:n + m]
+    gamma_2 = transition[:n, n + m:]
+    w = u[:-1] @ gamma_1.T + np.diff(u, axis=0) @ gamma_2.T
+
+    eigenvalues, eigenvectors = np.linalg.eig(phi)
+    if np.linalg.cond(eigenvectors) < 1e8:
+        # Decoupled first order recursions z[k+1] = lambda*z[k] + s[k]
+        s = np.linalg.solve(eigenvectors, w.T)
+        z = np.array([lfilter([1], [1, -eigenvalue], s_i) for eigenvalue, s_i in zip(eigenvalues, s)])
+        x[1:] = (eigenvectors @ z).real.T
+    else:
+        for k in range(number_of_samples - 1):
+            x[k + 1] = phi @ x[k] + w[k]
+    return x
+
+
 @debug_logging(logger)
 def calculate_neck_nij(c_fz: Channel,
                        c_mocy: Channel,
@@ -551,8 +664,8 @@ def calculate_neck_MOCx(channel_Mx: Channel, channel_Fy: Channel, d: float = Non
 
         d = {"WS": 0.0195}[dummy]  # [m]
 
-    channel_Mx = channel_Mx.convert_unit("N*m")
-    channel_Fy = channel_Fy.convert_unit("N")
+    channel_Mx = copy.copy(channel_Mx.load()).convert_unit("N*m")
+    channel_Fy = copy.copy(channel_Fy.load()).convert_unit("N")
 
     channel = channel_Mx + channel_Fy * d
     channel.set_code(main_location="TMON")
@@ -602,8 +715,8 @@ def calculate_neck_MOCy(channel_My: Channel, channel_Fx: Channel, d: float = Non
              "H3": 0.01778,
              "HF": 0.01778}[dummy]  # [m]
 
-    channel_My = channel_My.convert_unit("N*m")
-    channel_Fx = channel_Fx.convert_unit("N")
+    channel_My = copy.copy(channel_My.load()).convert_unit("N*m")
+    channel_Fx = copy.copy(channel_Fx.load()).convert_unit("N")
 
     channel = channel_My - channel_Fx * d
     channel.set_code(main_location="TMON")
@@ -652,8 +765,8 @@ def calculate_neck_Mx_base(channel_Mx: Channel, channel_Fy: Channel, dz: float =
 
         dz = {"WS": 0.0145}[dummy]  # [m]
 
-    channel_Mx = channel_Mx.convert_unit("N*m")
-    channel_Fy = channel_Fy.convert_unit("N")
+    channel_Mx = copy.copy(channel_Mx.load()).convert_unit("N*m")
+    channel_Fy = copy.copy(channel_Fy.load()).convert_unit("N")
 
     channel = channel_Mx - channel_Fy * dz
     channel.set_code(main_location="TMON")
@@ -702,8 +815,8 @@ def calculate_neck_My_base(channel_My: Channel, channel_Fx: Channel, dz: float =
 
         dz = {"WS": 0.0145}[dummy]  # [m]
 
-    channel_My = channel_My.convert_unit("N*m")
-    channel_Fx = channel_Fx.convert_unit("N")
+    channel_My = copy.copy(channel_My.load()).convert_unit("N*m")
+    channel_Fx = copy.copy(channel_Fx.load()).convert_unit("N")
 
     channel = channel_My + channel_Fx * dz
     channel.set_unit("N*m")
@@ -783,12 +896,76 @@ def calculate_vc(channel: Channel | None,
     """
     if channel is None:
         return None, None
+    return calculate_vc_channels([channel], scaling_factor=scaling_factor, defo_constant=defo_constant, dummy=dummy)[0]
 
-    channel = copy.deepcopy(channel).convert_unit("m")
 
+@debug_logging(logger)
+def calculate_vc_channels(channels: list,
+                          scaling_factor: float = None,
+                          defo_constant: float = None,
+                          dummy: str = None) -> list:
+    """
+    Calculate viscous criterion for multiple deflection channels in one call (e.g. all chest and abdomen deflection
+    channels of a THOR or WorldSID). Channels with the same time array are differentiated together.
+    See calculate_vc().
+    :param channels: deflection channels
+    :param scaling_factor: None to choose by dummy type of each channel
+    :param defo_constant: in unit m, None to choose by dummy type of each channel
+    :param dummy: Dummy type, None to use fine location 3 of each channel code
+    :return: list of tuples (VC channel, VC maximum channel) in order of channels
+    """
+    groups = {}
+    for idx, channel in enumerate(channels):
+        time_array = channel.data.index.to_numpy()
+        groups.setdefault((len(time_array), time_array.tobytes()), []).append(idx)
+
+    results = [None] * len(channels)
+    for indices in groups.values():
+        t = channels[indices[0]].data.index
+        v = np.vstack([channels[idx].get_data(unit="m") for idx in indices])
+        v_t = get_vc_velocity(v, t.to_numpy())
+
+        for idx, channel_v, channel_v_t in zip(indices, v, v_t):
+            channel = channels[idx]
+            channel_scaling_factor, channel_defo_constant = get_vc_constants(channel.code, scaling_factor, defo_constant, dummy)
+            c_t = channel_v / channel_defo_constant
+            vc = channel_scaling_factor * channel_v_t * c_t
+
+            channel_vc = Channel(code=channel.code.set(main_location="VCCR" if channel.code.main_location in ("CHST", "TRRI", "RIBS") else "VCAR" if channel.code.main_location in ("ABDO", "ABRI") else "VC??", physical_dimension="VE"),
+                                 data=pd.DataFrame(vc, index=t),
+                                 unit=Unit("m") / Unit("s"),
+                                 info=copy.deepcopy(channel.info).update({
+                                     "Data source": "calculation",
+                                 }).add({
+                                     ".Channel 001": channel.code,
+                                     ".Filter": channel.code.filter_class,
+                                     ".Scaling factor": channel_scaling_factor,
+                                     ".Deformation constant": channel_defo_constant}))
+
+            channel_vc_x = Channel(code=channel_vc.code.set(filter_class="X"),
+                                   data=pd.DataFrame([np.max(np.abs(channel_vc.get_data()))], index=[t[np.argmax(np.abs(channel_vc.get_data()))]]),
+                                   unit=channel_vc.unit,
+                                   info=channel_vc.info.add({
+                                       ".Analysis start time": channel_vc.data.index[0],
+                                       ".Analysis end time": channel_vc.data.index[-1],
+                                       ".Time": t[np.argmax(channel_vc.get_data())],
+                                   }))
+            results[idx] = (channel_vc, channel_vc_x)
+    return results
+
+
+def get_vc_constants(code, scaling_factor: float = None, defo_constant: float = None, dummy: str = None) -> tuple[float, float]:
+    """
+    Scaling factor and deformation constant of viscous criterion by dummy type.
+    :param code: channel code of deflection channel
+    :param scaling_factor: None to choose by dummy type
+    :param defo_constant: in unit m, None to choose by dummy type
+    :param dummy: Dummy type, None to use fine location 3 of code
+    :return: (scaling factor, deformation constant in m)
+    """
     if scaling_factor is None or defo_constant is None:
         if dummy is None:
-            dummy = channel.code.fine_location_3
+            dummy = code.fine_location_3
         assert dummy in ("BS", "E2", "ER", "H3", "HF", "HM", "S2", "WF", "WS", "Y6", "Y7", "YA"), f"Dummy {dummy} not supported by {calculate_vc.__name__}"
 
         if scaling_factor is None:
@@ -822,40 +999,21 @@ def calculate_vc(channel: Channel | None,
                 "Y7": 0.143,
                 "YA": 0.166,
             }[dummy]  # unit: m
+    return scaling_factor, defo_constant
 
-    c_t = channel.get_data() / defo_constant
-
-    v = channel.get_data()
-    t = channel.data.index
-    n = len(v)
-    v_t = np.zeros(n)
-    for i in range(n):
-        if 2 <= i < (n - 2):
-            v_t[i] = (8 * (v[i+1] - v[i-1]) - (v[i+2] - v[i-2])) / (12 * (t[i] - t[i-1]))
-
-    vc = scaling_factor * v_t * c_t
-
-    channel_vc = Channel(code=channel.code.set(main_location="VCCR" if channel.code.main_location in ("CHST", "TRRI", "RIBS") else "VCAR" if channel.code.main_location in ("ABDO", "ABRI") else "VC??", physical_dimension="VE"),
-                         data=pd.DataFrame(vc, index=t),
-                         unit=channel.unit / Unit("s"),
-                         info=channel.info.update({
-                             "Data source": "calculation",
-                         }).add({
-                             ".Channel 001": channel.code,
-                             ".Filter": channel.code.filter_class,
-                             ".Scaling factor": scaling_factor,
-                             ".Deformation constant": defo_constant}))
-
-    channel_vc_x = Channel(code=channel_vc.code.set(filter_class="X"),
-                           data=pd.DataFrame([np.max(np.abs(channel_vc.get_data()))], index=[channel.data.index[np.argmax(np.abs(channel_vc.get_data()))]]),
-                           unit=channel_vc.unit,
-                           info=channel_vc.info.add({
-                               ".Analysis start time": channel_vc.data.index[0],
-                               ".Analysis end time": channel_vc.data.index[-1],
-                               ".Time": channel.data.index[np.argmax(channel_vc.get_data())],
-                           }))
-
-    return channel_vc, channel_vc_x
+
+def get_vc_velocity(v: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    Deformation velocity by 5-point stencil. First and last two values are zero.
+    :param v: deformation (1D or 2D array with samples along last axis)
+    :param t: time array
+    :return: deformation velocity with same shape as v
+    """
+    v_t = np.zeros(v.shape)
+    n = v.shape[-1]
+    if n >= 5:
+        v_t[..., 2:n-2] = (8 * (v[..., 3:n-1] - v[..., 1:n-3]) - (v[..., 4:] - v[..., :n-4])) / (12 * (t[2:n-2] - t[1:n-3]))
+    return v_t
 
 
 @debug_logging(logger)
@@ -960,41 +1118,50 @@ def calculate_olc(c_v: Channel | None,
     if c_v is None:
         return None, None
 
-    c_v = c_v.convert_unit("m/s")
+    c_v = copy.copy(c_v.load()).convert_unit("m/s")
 
-    c_olc_visual = copy.deepcopy(c_v)
+    t = c_v.data.index.to_numpy()
+    v = c_v.get_data()
 
-    v_0 = c_v.get_data(t=0)
-    c_v_rel = -c_v + v_0
-    c_s_rel = c_v_rel.integrate()
+    v_0 = np.interp(0, t, v, left=0, right=0)
+    v_rel = -v + v_0
+    s_rel = cumulative_trapezoid(v_rel, t, initial=0)
+    s_rel = s_rel - np.interp(0, t, s_rel, left=0, right=0)
 
     # Free flight phase
-    is_not_free_flight_phase = c_s_rel.data.iloc[:, 0] >= free_flight_phase_displacement
+    is_not_free_flight_phase = s_rel >= free_flight_phase_displacement
     if is_not_free_flight_phase.any():
-        t_1 = is_not_free_flight_phase.idxmax()
+        t_1 = t[np.argmax(is_not_free_flight_phase)]
     else:
         raise ArithmeticError("OLC: Could not calculate t_1. Free flight phase too short.")
 
-    # Restraining phase
-
-    for i_2, t_2 in enumerate(c_s_rel.data.index):
-        if t_2 <= t_1:
-            continue
-        v_2 = c_v.get_data(t=t_2)
-        olc = float((v_0 - v_2)/(t_2 - t_1))
-        if c_s_rel.data.iloc[i_2, 0] - olc * (1/2*t_2**2 + 1/2*t_1**2 - t_1*t_2) >= free_flight_phase_displacement + restraining_phase_displacement:
-            break
-
-    is_restraining_phase = (t_1 < c_s_rel.data.index) * (c_s_rel.data.index < t_2)
-    after_restraining_phase = c_s_rel.data.index >= t_2
+    # Restraining phase: first t_2 > t_1 reaching restraining phase displacement (otherwise last sample)
+    candidates = np.nonzero(t > t_1)[0]
+    if len(candidates) == 0:
+        raise ArithmeticError("OLC: Could not calculate t_2. Free flight phase ends at last sample.")
+    t_2_array = t[candidates]
+    v_2_array = np.interp(t_2_array, t, v, left=0, right=0)
+    olc_array = (v_0 - v_2_array) / (t_2_array - t_1)
+    is_reached = s_rel[candidates] - olc_array * (1/2*t_2_array**2 + 1/2*t_1**2 - t_1*t_2_array) >= free_flight_phase_displacement + restraining_phase_displacement
+    i_2 = np.argmax(is_reached) if is_reached.any() else len(candidates) - 1
+    t_2 = t_2_array[i_2]
+    v_2 = v_2_array[i_2]
+    olc = float(olc_array[i_2])
+
+    after_restraining_phase = t >= t_2
     if not after_restraining_phase.any():
         logger.warning("Incorrect OLC values. Not reached restraining phase displacement.")
 
-    c_olc_visual.data.iloc[np.logical_xor(is_not_free_flight_phase, after_restraining_phase), 0] = -olc * c_olc_visual.data[np.logical_xor(is_not_free_flight_phase, after_restraining_phase)].index + (v_0 + olc*t_1)
-    c_olc_visual.data.iloc[np.logical_and(is_not_free_flight_phase, after_restraining_phase), 0] = v_2
-    c_olc_visual.data[~is_not_free_flight_phase] = v_0
+    olc_visual = v.copy()
+    is_restraining_phase = np.logical_xor(is_not_free_flight_phase, after_restraining_phase)
+    olc_visual[is_restraining_phase] = -olc * t[is_restraining_phase] + (v_0 + olc*t_1)
+    olc_visual[np.logical_and(is_not_free_flight_phase, after_restraining_phase)] = v_2
+    olc_visual[~is_not_free_flight_phase] = v_0
 
-    c_olc_visual.set_code(c_v.code.set(fine_location_1="0O", fine_location_2="LC", filter_class=c_v.code.filter_class))
+    c_olc_visual = Channel(code=c_v.code.set(fine_location_1="0O", fine_location_2="LC", filter_class=c_v.code.filter_class),
+                           data=None,
+                           unit=c_v.unit,
+                           info=copy.deepcopy(c_v.info)).set_data(olc_visual, c_v.time, c_v.time_grid, c_v.data_labels)
 
     c_olc_visual.info["OLC [g]"] = olc / 9.81
     c_olc_visual.info["t_1 [s]"] = t_1
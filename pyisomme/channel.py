@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from pyisomme.unit import Unit, g0
+from pyisomme.unit import Unit, g0, convert
 from pyisomme.info import Info
 from pyisomme.code import Code
+from pyisomme.filtering import get_cfc_and_filter_class, filter_iso_6487, filter_sae_j211_1
 
 import re
 import pandas as pd
@@ -11,7 +12,8 @@ import logging
 from fnmatch import fnmatch
 from scipy.integrate import cumulative_trapezoid
 import copy
-from astropy.units import CompositeUnit
+import functools
+import zlib
 
 
 logger = logging.getLogger(__name__)
@@ -19,16 +21,148 @@ logger = logging.getLogger(__name__)
 
 class Channel:
     code: Code
-    data: pd.DataFrame
     unit: Unit
     info: Info
-
-    def __init__(self, code: str | Code, data: pd.DataFrame, unit: str | Unit = None, info: list | dict = None):
+    values: np.ndarray | None = None  # samples (float64), None if not loaded
+    time: np.ndarray | None = None  # time array, None if uniformly sampled (see time_grid)
+    time_grid: tuple | None = None  # (first time, last time, number of samples) if uniformly sampled, see get_time_grid()
+    data_labels: tuple = (None, 0)  # (name of time index, column label) of data
+    data_view: pd.DataFrame | None = None  # DataFrame built from values and time on first access of data
+    data_loader = None
+    loaded_checksum: int | None = None  # checksum of values after loading, see unload()
+    version = 0  # incremented if data or unit is modified in place, see Isomme.get_channel()
+
+    def __init__(self, code: str | Code, data: pd.DataFrame | None, unit: str | Unit = None, info: list | dict = None, data_loader=None):
+        """
+        :param code: channel code
+        :param data: DataFrame with time as index. None if data should be loaded by data_loader on first access.
+        :param unit: unit of data
+        :param info: channel info
+        :param data_loader: function returning data (DataFrame) of given channel, used to load data lazily
+        """
         self.set_code(code)
-        self.data = data
+        if data is not None or data_loader is None:
+            self.data = data
+        self.data_loader = data_loader
         self.set_unit(unit)
         self.info = Info([]) if info is None else Info(info) if isinstance(info, list) else Info([(n, v) for n, v in info.items()])
 
+    @property
+    def data(self) -> pd.DataFrame | None:
+        """
+        Data as DataFrame with time as index. The DataFrame is built on first access and shares memory with values,
+        therefore values can be modified in place (e.g. channel.data.iloc[0, 0] = 0). Other modifications must be
+        assigned to data or done by set_data().
+        """
+        self.load()
+        if self.values is None:
+            return None
+        if self.data_view is None:
+            self.data_view = pd.DataFrame(self.values.reshape(-1, 1),
+                                          index=pd.Index(self.get_time(), name=self.data_labels[0], copy=False),
+                                          columns=[self.data_labels[1]],
+                                          copy=False)
+        return self.data_view
+
+    @data.setter
+    def data(self, data: pd.DataFrame | None):
+        self.set_data_frame(data)
+
+    @data.deleter
+    def data(self):
+        self.set_data(None)
+
+    def __getstate__(self):
+        # DataFrame is rebuilt from values on first access
+        state = self.__dict__.copy()
+        state.pop("data_view", None)
+        return state
+
+    def set_data_frame(self, data: pd.DataFrame | None, modified: bool = True) -> Channel:
+        """
+        Set data of Channel from DataFrame with time as index (see set_data()).
+        :param data: DataFrame, None to remove data
+        :param modified: see set_data()
+        :return: Channel (self)
+        """
+        if data is None:
+            self.set_data(None, modified=modified)
+        elif len(data.columns) == 0:
+            self.set_data(np.zeros(0), np.zeros(0), labels=(data.index.name, 0), modified=modified)
+        else:
+            self.set_data(data.iloc[:, 0].to_numpy(dtype=float), data.index.to_numpy(), labels=(data.index.name, data.columns[0]), modified=modified)
+        return self
+
+    def set_data(self, values: np.ndarray | None, time: np.ndarray = None, time_grid: tuple = None, labels: tuple = (None, 0),
+                 modified: bool = True) -> Channel:
+        """
+        Set data of Channel from arrays without creating a DataFrame.
+        Uniformly sampled time arrays are not stored, but recreated from time grid if needed (see get_time()).
+        :param values: samples, None to remove data
+        :param time: time array (same length as values)
+        :param time_grid: (first time, last time, number of samples) instead of time array
+        :param labels: (name of time index, column label) of data
+        :param modified: False if data is only (re)loaded (see load(), unload()). Otherwise, the data loader is removed,
+        because modified data can not be loaded again, and the version is incremented.
+        :return: Channel (self)
+        """
+        if modified:
+            self.data_loader = None
+            self.version += 1
+        self.data_view = None
+        if values is None:
+            self.values = None
+            self.time = None
+            self.time_grid = None
+            return self
+
+        self.values = np.ascontiguousarray(values, dtype=float).reshape(-1)
+        if time_grid is None:
+            time_grid = get_time_grid(time)
+        self.time = np.asarray(time) if time_grid is None else None
+        self.time_grid = time_grid
+        self.data_labels = labels
+        return self
+
+    def get_time(self) -> np.ndarray:
+        """
+        :return: time array
+        """
+        self.load()
+        if self.time_grid is not None:
+            return get_time_array(*self.time_grid)
+        return self.time
+
+    def load(self) -> Channel:
+        """
+        Load data of lazy loaded channel if not in memory.
+        :return: Channel (self)
+        """
+        if self.values is None and self.data_loader is not None:
+            self.set_data_frame(self.data_loader(self), modified=False)
+            self.loaded_checksum = zlib.crc32(self.values)
+        return self
+
+    def is_loaded(self) -> bool:
+        """
+        :return: True if data is in memory
+        """
+        return self.values is not None
+
+    def unload(self) -> Channel:
+        """
+        Remove data from memory. Data will be loaded again on next access.
+        Only possible for lazy loaded channels whose data has not been modified.
+        If values have been modified in place (e.g. channel.data.iloc[0, 0] = 0), the data is kept in memory.
+        :return: Channel (self)
+        """
+        if self.data_loader is not None and self.is_loaded():
+            if zlib.crc32(self.values) != self.loaded_checksum:
+                self.data_loader = None
+                return self
+            self.set_data(None, modified=False)
+        return self
+
     def __str__(self):
         return self.code
 
@@ -75,6 +209,7 @@ class Channel:
             logger.warning("None is not a valid unit. Set unit to 1.")
             new_unit = "1"
         self.unit = Unit(new_unit)
+        self.version += 1
         return self
 
     def convert_unit(self, new_unit: str | Unit) -> Channel:
@@ -86,8 +221,14 @@ class Channel:
         """
         if self.unit is None:
             raise AttributeError(f"{self}. Not possible to convert units when current unit is None.")
-        self.data.iloc[:, :] = (self.data.to_numpy() * self.unit).to(new_unit).to_value()
+        if Unit(new_unit) == self.unit:
+            self.unit = Unit(new_unit)
+            return self
+        self.load()
+        if self.values is not None:
+            self.set_data(convert(self.values, self.unit, new_unit), self.time, self.time_grid, self.data_labels)
         self.unit = Unit(new_unit)
+        self.version += 1
         return self
 
     def cfc(self, value: int | str, method="ISO-6487", return_copy: bool = True) -> Channel:
@@ -101,201 +242,7 @@ class Channel:
         :param return_copy:
         :return:
         """
-        if isinstance(value, str):
-            filter_class = value
-            cfc = None
-        elif isinstance(value, int):
-            filter_class = None
-            cfc = value
-        else:
-            raise ValueError
-
-        # Convert Filter-Class to cfc value
-        if cfc is None:
-            if filter_class == "0":
-                cfc = np.inf
-            elif filter_class == "A":
-                cfc = 1000
-            elif filter_class == "B":
-                cfc = 600
-            elif filter_class == "C":
-                cfc = 180
-            elif filter_class == "D":
-                cfc = 60
-            else:
-                raise NotImplementedError
-
-        if filter_class is None:
-            if np.isinf(cfc):
-                filter_class = "0"
-            elif cfc == 1000:
-                filter_class = "A"
-            elif cfc == 600:
-                filter_class = "B"
-            elif cfc == 180:
-                filter_class = "C"
-            elif cfc == 60:
-                filter_class = "D"
-            else:
-                filter_class = "S"
-
-        # Check if Channel is already filtered
-        if filter_class == "0":
-            return copy.deepcopy(self) if return_copy else self
-        elif (filter_class == "A" and self.code.filter_class in ("A", "B", "C", "D") or
-              filter_class == "B" and self.code.filter_class in ("B", "C", "D") or
-              filter_class == "C" and self.code.filter_class in ("C", "D") or
-              filter_class == "D" and self.code.filter_class in ("D",)):
-            logger.warning("No filtering applied. Channel is already filtered.")
-            return copy.deepcopy(self) if return_copy else self
-
-        # Calculation
-        if method == "ISO-6487":
-            # Variables used
-            samples = self.get_data()
-            number_of_samples = len(samples)
-            sample_rate = self.info.get("Sampling interval")
-            if sample_rate is None:
-                sample_rate = np.diff(self.data.index).mean()
-                logger.debug(f"Sampling interval not found in channel info. Set sampling interval to mean diff: {sample_rate}.")
-
-            number_of_add_points = 0.01 * sample_rate
-            number_of_add_points = min([max([number_of_add_points, 100]), number_of_samples - 1])
-            index_last_point = number_of_samples + 2 * number_of_add_points - 1
-
-            # Initial condition
-            filter_tab = np.zeros(index_last_point + 1)
-            for i in range(number_of_add_points, number_of_add_points + number_of_samples):
-                filter_tab[i] = samples[i - number_of_add_points]
-
-            for i in range(0, number_of_add_points):
-                filter_tab[number_of_add_points - i - 1] = 2 * samples[0] - samples[i+1]
-                filter_tab[number_of_samples + number_of_add_points + i] = 2 * samples[number_of_samples-1] - samples[number_of_samples - i - 2]
-
-            # Computer filter coefficients
-            wd = 2 * np.pi * cfc / 0.6 * 1.25
-            wa = np.tan(wd * sample_rate / 2.0)
-            b0 = wa**2 / (1 + wa**2 + np.sqrt(2) * wa)
-            b1 = 2 * b0
-            b2 = b0
-            a1 = -2 * (wa**2 - 1) / (1 + wa**2 + np.sqrt(2) * wa)
-            a2 = (-1 + np.sqrt(2)*wa - wa**2) / (1 + wa**2 + np.sqrt(2) * wa)
-
-            # Filter forward
-            y1 = 0
-            for i in range(0, 10):
-                y1 = y1 + filter_tab[i]
-            y1 = y1/10
-            x2 = 0
-            x1 = filter_tab[0]
-            x0 = filter_tab[1]
-            filter_tab[0] = y1
-            filter_tab[1] = y1
-            for i in range(2, index_last_point+1):
-                x2 = x1
-                x1 = x0
-                x0 = filter_tab[i]
-                filter_tab[i] = b0 * x0 + b1 * x1 + b2 * x2 + a1 * filter_tab[i - 1] + a2 * filter_tab[i - 2]
-
-            # Filter backward
-            y1 = 0
-            for i in range(index_last_point, index_last_point-9-1, -1):
-                y1 = y1 + filter_tab[i]
-            y1 = y1/10
-            x2 = 0
-            x1 = filter_tab[index_last_point]
-            x0 = filter_tab[index_last_point-1]
-            filter_tab[index_last_point] = y1
-            filter_tab[index_last_point-1] = y1
-            for i in range(index_last_point-2, 0-1, -1):
-                x2 = x1
-                x1 = x0
-                x0 = filter_tab[i]
-                filter_tab[i] = b0 * x0 + b1 * x1 + b2 * x2 + a1 * filter_tab[i + 1] + a2 * filter_tab[i + 2]
-
-            # Filtering of samples
-            for i in range(number_of_add_points, number_of_add_points + number_of_samples):
-                samples[i - number_of_add_points] = filter_tab[i]
-
-            data = copy.deepcopy(self.data)
-            data.iloc[:, 0] = samples
-
-            info = copy.deepcopy(self.info)
-            info.update({"Channel frequency class": cfc})
-
-            if return_copy:
-                return Channel(
-                    code=self.code.set(filter_class=filter_class),
-                    data=data,
-                    unit=self.unit,
-                    info=info
-                )
-            else:
-                self.code = self.code.set(filter_class=filter_class)
-                self.data = data
-                self.info = info
-                return self
-
-        elif method == "SAE-J211-1":
-            input_values = self.get_data()
-            sample_interval = self.info.get("Sampling interval")
-            if sample_interval is None:
-                sample_interval = np.diff(self.data.index).mean()
-                logger.debug(f"Sampling interval not found in channel info. Set sampling interval to mean diff: {sample_interval}.")
-            wd = 2 * np.pi * cfc / 0.6 * 1.25
-            wa = np.tan(wd * sample_interval / 2.0)
-            a0 = wa**2 / (1 + wa**2 + np.sqrt(2) * wa)
-            a1 = 2 * a0
-            a2 = a0
-            b1 = -2 * (wa**2 - 1) / (1 + wa**2 + np.sqrt(2) * wa)
-            b2 = (-1 + np.sqrt(2)*wa - wa**2) / (1 + wa**2 + np.sqrt(2) * wa)
-
-            # forward
-            output_values = np.zeros(len(input_values))
-            for i in range(2, len(input_values)):
-                inp0 = input_values[i]
-                inp1 = input_values[i - 1]
-                inp2 = input_values[i - 2]
-
-                out2 = output_values[i - 2]
-                out1 = output_values[i - 1]
-
-                output_values[i] = a0 * inp0 + a1 * inp1 + a2 * inp2 + b1 * out1 + b2 * out2
-
-            # backward
-            input_values = output_values
-            output_values = np.zeros(len(input_values))
-            for i in range(len(input_values)-3, 0, -1):
-                inp0 = input_values[i]
-                inp2 = input_values[i + 2]
-                inp1 = input_values[i + 1]
-
-                out2 = output_values[i + 2]
-                out1 = output_values[i + 1]
-
-                output_values[i] = a0 * inp0 + a1 * inp1 + a2 * inp2 + b1 * out1 + b2 * out2
-
-            # final
-            data = copy.deepcopy(self.data)
-            data.iloc[:, 0] = output_values
-
-            info = self.info
-            info.update({"Channel frequency class": cfc})
-
-            if return_copy:
-                return Channel(
-                    code=self.code.set(filter_class=filter_class),
-                    data=data,
-                    unit=self.unit,
-                    info=info
-                )
-            else:
-                self.code = self.code.set(filter_class=filter_class)
-                self.data = data
-                self.info = info
-                return self
-        else:
-            raise NotImplementedError
+        return cfc_channels([self], value, method=method, return_copy=return_copy)[0]
 
     def get_data(self, t=None, unit=None) -> np.ndarray | float:
         """
@@ -305,24 +252,20 @@ class Channel:
         :param unit:
         :return:
         """
-        time_array = self.data.index.to_numpy()
-        value_array = self.data.iloc[:, 0].to_numpy()
+        self.load()
+        value_array = self.values
 
         # Unit conversion
         if unit is not None:
-            old_unit = self.unit
-            if isinstance(old_unit, CompositeUnit) or True:
-                if not isinstance(unit, Unit):
-                    unit = Unit(unit)
-                value_array = (value_array * old_unit).to(unit).to_value()
-            else:
-                print(type(old_unit))
-                logger.error("Could not determine old unit. No conversion will be performed.")
+            value_array = convert(value_array, self.unit, unit)
 
         if t is None:
             return value_array
 
-        # Interpolation
+        # Interpolation (not needed if t is time array of channel, see time_intersect())
+        time_array = self.get_time()
+        if t is time_array:
+            return value_array.copy() if value_array is self.values else value_array
         return np.interp(t, time_array, value_array, left=0, right=0)
 
     def get_info(self, *labels: str) -> str | None:
@@ -348,15 +291,15 @@ class Channel:
         Return new Channel with differentiated data
         :return: Channel
         """
-        new_data = copy.deepcopy(self.data)
-        new_data.iloc[:, 0] = np.gradient(self.get_data(), self.data.index)
+        time_array = self.get_time()
+        new_values = np.gradient(self.get_data(), time_array)
 
         new_code = self.code.differentiate()
         new_unit = Unit(self.unit) / "s"
         new_info = self.info
         new_info.update({"Dimension": new_code.physical_dimension})
 
-        new_channel = Channel(new_code, new_data, unit=new_unit, info=new_info)
+        new_channel = Channel(new_code, None, unit=new_unit, info=new_info).set_data(new_values, self.time, self.time_grid, self.data_labels)
         return new_channel
 
     def integrate(self, x_0: float = 0) -> Channel:
@@ -365,16 +308,13 @@ class Channel:
         :param x_0: value at t=0
         :return: Channel
         """
-        new_data = pd.DataFrame(
-            cumulative_trapezoid(self.data.iloc[:, 0], self.data.index, initial=0),
-            index=self.data.index
-        )
+        new_values = cumulative_trapezoid(self.get_data(), self.get_time(), initial=0)
         new_code = self.code.integrate()
         new_unit = Unit(self.unit) * "s"
         new_info = self.info
         new_info.update({"Dimension": new_code.physical_dimension})
 
-        new_channel = Channel(new_code, new_data, unit=new_unit, info=new_info)
+        new_channel = Channel(new_code, None, unit=new_unit, info=new_info).set_data(new_values, self.time, self.time_grid, (self.data_labels[0], 0))
         new_channel -= new_channel.get_data(t=0)
         new_channel += x_0
         return new_channel
@@ -418,63 +358,83 @@ class Channel:
         self.data.plot(*args, **kwargs).get_figure().show()
 
     def scale_y(self, factor: float) -> Channel:
-        self.data *= factor
+        self.load()
+        self.set_data(self.values * factor, self.time, self.time_grid, self.data_labels)
         return self
 
     def scale_x(self, factor: float) -> Channel:
-        self.data = pd.DataFrame(self.data.values, index=self.data.index * factor)
+        self.load()
+        self.set_data(self.values, self.get_time() * factor, labels=self.data_labels)
         return self
 
     def offset_y(self, offset: float) -> Channel:
-        self.data += offset
+        self.load()
+        self.set_data(self.values + offset, self.time, self.time_grid, self.data_labels)
         return self
 
     def auto_offset_y(self, t: float = 0) -> Channel:
         return self.offset_y(offset=self.get_data(t=t))
 
     def offset_x(self, offset: float) -> Channel:
-        self.data = pd.DataFrame(self.data.values, index=self.data.index + offset)
+        self.load()
+        self.set_data(self.values, self.get_time() + offset, labels=self.data_labels)
         return self
 
     def crop(self, x_min: float = None, x_max: float = None) -> Channel:
-        self.data = self.data.truncate(before=x_min, after=x_max)
+        time_array = self.get_time()
+        start = 0 if x_min is None else np.searchsorted(time_array, x_min, side="left")
+        end = len(time_array) if x_max is None else np.searchsorted(time_array, x_max, side="right")
+        self.set_data(self.values[start:end].copy(), time_array[start:end], labels=self.data_labels)
         return self
 
     # Operator methods
     def __eq__(self, other):
         if isinstance(other, Channel):
             if self.unit.physical_type == other.unit.physical_type:
-                return self.data.equals(other.convert_unit(self.unit).data)
+                self.load()
+                other.load()
+                if self.values is None or other.values is None:
+                    return self.values is None and other.values is None
+                return (self.time_grid == other.time_grid
+                        and np.array_equal(self.values, other.get_data(unit=self.unit), equal_nan=True)
+                        and (self.time_grid is not None or np.array_equal(self.time, other.time, equal_nan=True)))
         return False
 
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def new_channel(self, values: np.ndarray, time: np.ndarray = None, unit: Unit = None, history: str = None) -> Channel:
+        """
+        Create new Channel with code and info of this Channel (used by operator methods).
+        :param values: samples
+        :param time: time array, None to keep time of this Channel
+        :param unit: None to keep unit of this Channel
+        :param history: entry of calculation history
+        :return: Channel
+        """
+        new_channel = Channel(code=self.code,
+                              data=None,
+                              unit=self.unit if unit is None else unit,
+                              info=self.info + [("Calculation History", history)])
+        if time is None:
+            return new_channel.set_data(values, self.time, self.time_grid, self.data_labels)
+        elif time is self.get_time():
+            return new_channel.set_data(values, self.time, self.time_grid)
+        return new_channel.set_data(values, time)
+
     def __neg__(self):
-        return Channel(self.code,
-                       -self.data,
-                       self.unit,
-                       info=self.info + [("Calculation History", f"-1 * {self.code}")])
+        return self.new_channel(-self.get_data(), history=f"-1 * {self.code}")
 
     def __add__(self, other):
         if isinstance(other, Channel):
             t = time_intersect(self, other)
             if self.unit.physical_type == other.unit.physical_type:
-                return Channel(code=self.code,
-                               data=pd.DataFrame(self.get_data(t) + other.get_data(t, unit=self.unit), index=t),
-                               unit=self.unit,
-                               info=self.info + [("Calculation History", f"{self.code} - {other.code}")])
+                return self.new_channel(self.get_data(t) + other.get_data(t, unit=self.unit), t, history=f"{self.code} - {other.code}")
             else:
                 logger.warning(f"Adding channels with non compatible physical units: {self.unit} and {other.unit}")
-                return Channel(code=self.code,
-                               data=pd.DataFrame(self.get_data(t=t) + other.get_data(t=t), index=t),
-                               unit=self.unit,
-                               info=self.info + [("Calculation History", f"{self.code} - {other.code}")])
+                return self.new_channel(self.get_data(t=t) + other.get_data(t=t), t, history=f"{self.code} - {other.code}")
         else:
-            return Channel(code=self.code,
-                           data=self.data + other,
-                           unit=self.unit,
-                           info=self.info + [("Calculation History", f"{self.code} - {other}")])
+            return self.new_channel(self.get_data() + other, history=f"{self.code} - {other}")
 
     def __radd__(self, other):
         return self.__add__(other)
@@ -483,34 +443,19 @@ class Channel:
         if isinstance(other, Channel):
             t = time_intersect(self, other)
             if self.unit.physical_type == other.unit.physical_type:
-                return Channel(code=self.code,
-                               data=pd.DataFrame(self.get_data(t) - other.get_data(t, unit=self.unit), index=t),
-                               unit=self.unit,
-                               info=self.info + [("Calculation History", f"{self.code} - {other.code}")])
+                return self.new_channel(self.get_data(t) - other.get_data(t, unit=self.unit), t, history=f"{self.code} - {other.code}")
             else:
                 logger.warning(f"Subtracting channels with non compatible physical units: {self.unit} and {other.unit}")
-                return Channel(code=self.code,
-                               data=pd.DataFrame(self.get_data(t=t) - other.get_data(t=t), index=t),
-                               unit=self.unit,
-                               info=self.info + [("Calculation History", f"{self.code} - {other.code}")])
+                return self.new_channel(self.get_data(t=t) - other.get_data(t=t), t, history=f"{self.code} - {other.code}")
         else:
-            return Channel(code=self.code,
-                           data=self.data - other,
-                           unit=self.unit,
-                           info=self.info + [("Calculation History", f"{self.code} - {other}")])
+            return self.new_channel(self.get_data() - other, history=f"{self.code} - {other}")
 
     def __mul__(self, other):
         if isinstance(other, Channel):
             t = time_intersect(self, other)
-            return Channel(code=self.code,
-                           data=pd.DataFrame(self.get_data(t=t) * other.get_data(t=t), index=t),
-                           unit=self.unit * other.unit,
-                           info=self.info + [("Calculation History", f"{self.code} / {other.code}")])
+            return self.new_channel(self.get_data(t=t) * other.get_data(t=t), t, unit=self.unit * other.unit, history=f"{self.code} / {other.code}")
         else:
-            return Channel(code=self.code,
-                           data=self.data * other,
-                           unit=self.unit,
-                           info=self.info + [("Calculation History", f"{self.code} / {other}")])
+            return self.new_channel(self.get_data() * other, history=f"{self.code} / {other}")
 
     def __rmul__(self, other):
         return self.__mul__(other)
@@ -518,27 +463,15 @@ class Channel:
     def __truediv__(self, other):
         if isinstance(other, Channel):
             t = time_intersect(self, other)
-            return Channel(code=self.code,
-                           data=pd.DataFrame(self.get_data(t=t) / other.get_data(t=t), index=t),
-                           unit=self.unit / other.unit,
-                           info=self.info + [("Calculation History", f"{self.code} / {other.code}")])
+            return self.new_channel(self.get_data(t=t) / other.get_data(t=t), t, unit=self.unit / other.unit, history=f"{self.code} / {other.code}")
         else:
-            return Channel(code=self.code,
-                           data=self.data / other,
-                           unit=self.unit,
-                           info=self.info + [("Calculation History", f"{self.code} / {other}")])
+            return self.new_channel(self.get_data() / other, history=f"{self.code} / {other}")
 
     def __pow__(self, power, modulo=None):
-        return Channel(code=self.code,
-                       data=self.data**power,
-                       unit=self.unit,
-                       info=self.info + [("Calculation History", f"{self.code}^{power}")])
+        return self.new_channel(self.get_data()**power, history=f"{self.code}^{power}")
 
     def __abs__(self):
-        return Channel(code=self.code,
-                       data=abs(self.data),
-                       unit=self.unit,
-                       info=self.info + [("Calculation History", f"abs({self.code})")])
+        return self.new_channel(np.abs(self.get_data()), history=f"abs({self.code})")
 
 
 def create_sample(code: str = "SAMPLE??????????",
@@ -571,15 +504,128 @@ def create_sample(code: str = "SAMPLE??????????",
     return Channel(code, data, unit, info=[("Sampling interval", np.diff(time_array)[0])])
 
 
+def cfc_channels(channels: list, value: int | str, method="ISO-6487", return_copy: bool = True) -> list:
+    """
+    Apply filter to multiple channels at once (see Channel.cfc()).
+    Channels with same sampling interval and number of samples are stacked and filtered in a single pass.
+    :param channels: list of Channel objects
+    :param value: CFC value or filter class
+    :param method: "ISO-6487" or "SAE-J211-1"
+    :param return_copy: if False, channels are modified inplace
+    :return: list of filtered channels (same order as given)
+    """
+    cfc, filter_class = get_cfc_and_filter_class(value)
+    if method == "ISO-6487":
+        filter_func = filter_iso_6487
+    elif method == "SAE-J211-1":
+        filter_func = filter_sae_j211_1
+    else:
+        raise NotImplementedError
+
+    filtered_channels = list(channels)
+    groups = {}
+    for idx, channel in enumerate(channels):
+        # Check if Channel is already filtered
+        if filter_class == "0":
+            filtered_channels[idx] = copy.deepcopy(channel) if return_copy else channel
+            continue
+        elif (filter_class == "A" and channel.code.filter_class in ("A", "B", "C", "D") or
+              filter_class == "B" and channel.code.filter_class in ("B", "C", "D") or
+              filter_class == "C" and channel.code.filter_class in ("C", "D") or
+              filter_class == "D" and channel.code.filter_class in ("D",)):
+            logger.warning("No filtering applied. Channel is already filtered.")
+            filtered_channels[idx] = copy.deepcopy(channel) if return_copy else channel
+            continue
+
+        sampling_interval = channel.info.get("Sampling interval")
+        if sampling_interval is None:
+            sampling_interval = np.diff(channel.get_time()).mean()
+            logger.debug(f"Sampling interval not found in channel info. Set sampling interval to mean diff: {sampling_interval}.")
+        groups.setdefault((sampling_interval, len(channel.get_data())), []).append(idx)
+
+    # Calculation
+    for (sampling_interval, _), indices in groups.items():
+        samples = filter_func(np.vstack([channels[idx].get_data() for idx in indices]), cfc, sampling_interval)
+
+        for idx, channel_samples in zip(indices, samples):
+            channel = channels[idx]
+            info = copy.deepcopy(channel.info)
+            info.update({"Channel frequency class": cfc})
+
+            if return_copy:
+                filtered_channels[idx] = Channel(
+                    code=channel.code.set(filter_class=filter_class),
+                    data=None,
+                    unit=channel.unit,
+                    info=info
+                ).set_data(channel_samples, channel.time, channel.time_grid, channel.data_labels)
+            else:
+                channel.code = channel.code.set(filter_class=filter_class)
+                channel.set_data(channel_samples, channel.time, channel.time_grid, channel.data_labels)
+                channel.info = info
+    return filtered_channels
+
+
 def time_intersect(*channels: Channel) -> np.ndarray:
     """
-    Returns intersection of time-array of given channels.
+    Returns common time array of given channels.
+    - Channels with same time array (e.g. same time grid): time array is returned as it is. get_data(t) of these
+      channels returns samples without interpolation.
+    - Otherwise: intersection of time arrays, if it contains all samples of the channel with the lowest number of
+      samples within the overlapping time range. If not (e.g. shifted or rounded time arrays), the samples of this
+      channel within the overlapping time range are used and the other channels are interpolated by get_data(t).
     :param channels: Channel objects
     :return: time array
     """
     if len(channels) == 0:
         return np.array([])
-    time_array = channels[0].data.index
+    time_array = channels[0].get_time()
     for channel in channels[1:]:
-        time_array = np.intersect1d(time_array, channel.data.index)
+        other_time_array = channel.get_time()
+        if other_time_array is time_array or (channel.time_grid is None and np.array_equal(other_time_array, time_array)):
+            continue
+
+        intersection = np.intersect1d(time_array, other_time_array)
+        if len(time_array) == 0 or len(other_time_array) == 0:
+            time_array = intersection
+            continue
+        t_min = max(time_array[0], other_time_array[0])
+        t_max = min(time_array[-1], other_time_array[-1])
+        overlaps = [t[(t_min <= t) & (t <= t_max)] for t in (time_array, other_time_array)]
+        coarse_time_array = overlaps[0] if len(overlaps[0]) <= len(overlaps[1]) else overlaps[1]
+        if len(intersection) < len(coarse_time_array):
+            logger.debug(f"Time arrays of {channels[0].code} and {channel.code} do not match. Resample to {len(coarse_time_array)} samples.")
+            time_array = coarse_time_array
+        else:
+            time_array = intersection
     return time_array
+
+
+@functools.lru_cache(maxsize=64)
+def get_time_array(first: float, last: float, n: int) -> np.ndarray:
+    """
+    Time array of uniformly sampled channels (see Channel.time_grid). Channels with the same time grid share the same
+    (read-only) array.
+    :param first: first time
+    :param last: last time
+    :param n: number of samples
+    :return: time array
+    """
+    time_array = np.linspace(first, last, n)
+    time_array.flags.writeable = False
+    return time_array
+
+
+def get_time_grid(time_array: np.ndarray | None) -> tuple | None:
+    """
+    Check if time array is uniformly sampled. Only time arrays which are recreated exactly by np.linspace() are
+    considered uniform (e.g. time arrays of channel files with implicit reference channel, see parse_xxx_data()).
+    :param time_array: time array
+    :return: (first time, last time, number of samples) or None if not uniformly sampled
+    """
+    if time_array is None or len(time_array) < 2 or np.asarray(time_array).dtype != float or not time_array[0] < time_array[-1]:
+        return None
+    time_grid = (time_array[0], time_array[-1], len(time_array))
+    if np.array_equal(np.linspace(*time_grid), time_array):
+        return time_grid
+    return None
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from pyisomme.unit import Unit
 
+import os
 import re
-from fnmatch import fnmatch
+from fnmatch import fnmatch, translate
+import functools
 import logging
 from pathlib import Path
 import xml.etree.ElementTree as ET
@@ -68,14 +70,11 @@ class Code(str):
         :return: dict with code attributes
         """
         info = {}
-        root = ET.parse(Path(__file__).parent.joinpath("channel_codes.xml")).getroot()
-        for element in root.findall("Codification/Element"):
-            for channel in element.findall(".//Channel"):
-                if fnmatch(str(self), channel.get("code")):
-                    info[element.get("name")] = channel.get("description")
-                    break
-            if element.get("name") not in info:
-                logger.warning(f"'{element.get('name')}' of '{self}' not valid.")
+        for name, attributes in match_channel_codes(self):
+            if attributes is None:
+                logger.warning(f"'{name}' of '{self}' not valid.")
+            else:
+                info[name] = attributes.get("description")
         return info
 
     def get_default_unit(self) -> Unit | None:
@@ -84,13 +83,9 @@ class Code(str):
         Default Units are stored in 'channel_codes.xml'
         :return: Unit or None
         """
-        root = ET.parse(Path(__file__).parent.joinpath("channel_codes.xml")).getroot()
-        for element in root.findall("Codification/Element[@name='Physical Dimension']"):
-            for channel in element.findall(".//Channel"):
-                if fnmatch(str(self), channel.get("code")):
-                    default_unit = channel.get("default_unit")
-                    if default_unit is not None:
-                        return Unit(default_unit)
+        for name, attributes in match_channel_codes(self, required_attribute="default_unit"):
+            if name == "Physical Dimension" and attributes is not None:
+                return Unit(attributes["default_unit"])
         return None
 
     def integrate(self):
@@ -135,15 +130,9 @@ class Code(str):
             logger.error("Code length not 16 characters.")
             return False
 
-        root = ET.parse(Path(__file__).parent.joinpath("channel_codes.xml")).getroot()
-        for element in root.findall("Codification/Element"):
-            match = False
-            for channel in element.findall(".//Channel"):
-                if fnmatch(str(self), channel.get("code")):
-                    match = True
-                    break
-            if not match:
-                logger.debug(f"{element.get('name')} of '{self}' not valid.")
+        for name, attributes in match_channel_codes(self):
+            if attributes is None:
+                logger.debug(f"{name} of '{self}' not valid.")
                 return False
         return True
 
@@ -159,3 +148,171 @@ def combine_codes(*codes: str | Code) -> Code:
             if code_char != comnbined_code_char:
                 comnbined_code = Code(f"{comnbined_code[:idx]}?{comnbined_code[idx+1:]}")
     return comnbined_code
+
+
+CODE_FIELDS = (slice(0, 1),    # Test object
+               slice(1, 2),    # Position
+               slice(2, 6),    # Main location
+               slice(6, 8),    # Fine location 1
+               slice(8, 10),   # Fine location 2
+               slice(10, 12),  # Fine location 3
+               slice(12, 14),  # Physical dimension
+               slice(14, 15),  # Direction
+               slice(15, 16))  # Filter class
+
+
+def split_code_pattern(code_pattern: str) -> list | None:
+    """
+    Split fnmatch-pattern of channel code into one token per code character (literal character, '?' or '[...]').
+    :param code_pattern: e.g. "11HEAD0000??AC[XY]A"
+    :return: list of 16 tokens or None if pattern contains '*' or does not consist of 16 tokens
+    """
+    tokens = []
+    idx = 0
+    while idx < len(code_pattern):
+        char = code_pattern[idx]
+        if char == "*":
+            return None
+        if char == "[":
+            end_idx = idx + 1
+            if end_idx < len(code_pattern) and code_pattern[end_idx] == "!":
+                end_idx += 1
+            if end_idx < len(code_pattern) and code_pattern[end_idx] == "]":
+                end_idx += 1
+            end_idx = code_pattern.find("]", end_idx)
+            if end_idx != -1:
+                tokens.append(code_pattern[idx:end_idx + 1])
+                idx = end_idx + 1
+                continue
+        tokens.append(char)
+        idx += 1
+    return tokens if len(tokens) == 16 else None
+
+
+class CodeIndex:
+    """
+    Index of a list of channel codes to find codes by fnmatch-pattern without testing every code.
+    Codes are indexed by their fields (test object, position, main location, ...). Fields of the pattern without
+    wildcards are looked up in the index, only the codes of the most selective field are tested with fnmatch.
+    Patterns containing '*' are tested against all codes.
+    """
+    def __init__(self, codes: list = None):
+        self.codes = []
+        self.normcase_codes = []
+        self.fields = [{} for _ in CODE_FIELDS]
+        self.extend([] if codes is None else codes)
+
+    def extend(self, codes: list) -> CodeIndex:
+        """
+        Append codes to index.
+        :param codes: list of codes
+        :return: self
+        """
+        for code in codes:
+            idx = len(self.codes)
+            self.codes.append(code)
+            normcase_code = os.path.normcase(code)
+            self.normcase_codes.append(normcase_code)
+            for field_dict, field in zip(self.fields, CODE_FIELDS):
+                field_dict.setdefault(normcase_code[field], []).append(idx)
+        return self
+
+    def update(self, codes: list) -> CodeIndex:
+        """
+        Update index to given list of codes. Index is extended if codes were only appended, otherwise rebuilt.
+        :param codes: list of codes
+        :return: self
+        """
+        n = len(self.codes)
+        if codes[:n] == self.codes:
+            if len(codes) > n:
+                self.extend(codes[n:])
+        else:
+            self.__init__(codes)
+        return self
+
+    def find(self, code_pattern: str) -> list:
+        """
+        Find codes matching pattern (same as fnmatch).
+        :param code_pattern: fnmatch-pattern
+        :return: list of indices (ascending) of matching codes
+        """
+        code_pattern = os.path.normcase(code_pattern)
+        tokens = split_code_pattern(code_pattern)
+        candidates = range(len(self.codes))
+        if tokens is not None:
+            # Smallest set of candidates by any field without wildcards
+            for field_dict, field in zip(self.fields, CODE_FIELDS):
+                field_tokens = tokens[field]
+                if any(len(token) != 1 or token == "?" for token in field_tokens):
+                    continue
+                indices = field_dict.get("".join(field_tokens), [])
+                if len(indices) < len(candidates):
+                    candidates = indices
+                    if len(candidates) == 0:
+                        return []
+        match = compile_code_pattern(code_pattern)
+        return [idx for idx in candidates if match(self.normcase_codes[idx]) is not None]
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_code_pattern(code_pattern: str):
+    """
+    :param code_pattern: fnmatch-pattern (already normcased)
+    :return: match-function of compiled regular expression
+    """
+    return re.compile(translate(code_pattern)).match
+
+
+@functools.lru_cache(maxsize=None)
+def get_channel_code_tables(required_attribute: str = None) -> tuple:
+    """
+    Read 'channel_codes.xml' once and prepare lookup tables for each element (Test Object, Position, ...).
+    Entries which only define the characters of their own code field (e.g. "??HEAD??????????") are stored in a dict
+    with the field as key. All other entries are compiled to regular expressions.
+    The tables are shared by all codes of the process. Parsing the file takes only a few milliseconds, therefore the
+    tables are not cached on disk.
+    :param required_attribute: only consider entries with this attribute (e.g. "default_unit")
+    :return: tuple of (element name, field slice, dict field -> (position, attributes), list of (position, regex, attributes))
+    """
+    root = ET.parse(Path(__file__).parent.joinpath("channel_codes.xml")).getroot()
+    elements = root.findall("Codification/Element")
+    tables = []
+    for element_idx, element in enumerate(elements):
+        field = CODE_FIELDS[element_idx] if len(elements) == len(CODE_FIELDS) else None
+        literals = {}
+        patterns = []
+        for position, channel in enumerate(element.findall(".//Channel")):
+            if required_attribute is not None and channel.get(required_attribute) is None:
+                continue
+            code_pattern = os.path.normcase(channel.get("code"))
+            attributes = dict(channel.attrib)
+            if (field is not None and len(code_pattern) == 16 and code_pattern[field].isalnum()
+                    and set(code_pattern[:field.start] + code_pattern[field.stop:]) == {"?"}):
+                literals.setdefault(code_pattern[field], (position, attributes))
+            else:
+                patterns.append((position, re.compile(translate(code_pattern)), attributes))
+        tables.append((element.get("name"), field, literals, patterns))
+    return tuple(tables)
+
+
+@functools.lru_cache(maxsize=4096)
+def match_channel_codes(code: str, required_attribute: str = None) -> tuple:
+    """
+    Find first matching entry of 'channel_codes.xml' for each element (same result as checking all entries with fnmatch).
+    :param code: channel code
+    :param required_attribute: only consider entries with this attribute (e.g. "default_unit")
+    :return: tuple of (element name, attributes of first matching entry or None)
+    """
+    code = os.path.normcase(str(code))
+    result = []
+    for name, field, literals, patterns in get_channel_code_tables(required_attribute):
+        position, attributes = literals.get(code[field], (None, None)) if field is not None else (None, None)
+        for pattern_position, regex, pattern_attributes in patterns:
+            if position is not None and pattern_position > position:
+                break
+            if regex.match(code):
+                attributes = pattern_attributes
+                break
+        result.append((name, attributes))
+    return tuple(result)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import numpy as np
+from scipy.signal import lfilter
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_cfc_and_filter_class(value: int | float | str) -> tuple:
+    """
+    Convert filter class (str) or CFC value (int) to tuple of both.
+    :param value: CFC value (e.g. 180) or filter class (e.g. "C")
+    :return: (cfc, filter_class)
+    """
+    if isinstance(value, str):
+        filter_class = value
+        if filter_class == "0":
+            cfc = np.inf
+        elif filter_class == "A":
+            cfc = 1000
+        elif filter_class == "B":
+            cfc = 600
+        elif filter_class == "C":
+            cfc = 180
+        elif filter_class == "D":
+            cfc = 60
+        else:
+            raise NotImplementedError
+    elif isinstance(value, (int, float, np.integer, np.floating)):
+        cfc = value
+        if np.isinf(cfc):
+            filter_class = "0"
+        elif cfc == 1000:
+            filter_class = "A"
+        elif cfc == 600:
+            filter_class = "B"
+        elif cfc == 180:
+            filter_class = "C"
+        elif cfc == 60:
+            filter_class = "D"
+        else:
+            filter_class = "S"
+    else:
+        raise ValueError
+    return cfc, filter_class
+
+
+def get_cfc_coefficients(cfc: float, sampling_interval: float) -> tuple:
+    """
+    Coefficients of the 2nd order Butterworth filter (single pass) as given in ISO 6487 Annex A and SAE J211-1 Appendix C.
+    :param cfc: channel frequency class
+    :param sampling_interval: in s
+    :return: (b0, b1, b2, a1, a2) with y[i] = b0*x[i] + b1*x[i-1] + b2*x[i-2] + a1*y[i-1] + a2*y[i-2]
+    """
+    wd = 2 * np.pi * cfc / 0.6 * 1.25
+    wa = np.tan(wd * sampling_interval / 2.0)
+    denominator = 1 + wa**2 + np.sqrt(2) * wa
+    b0 = wa**2 / denominator
+    b1 = 2 * b0
+    b2 = b0
+    a1 = -2 * (wa**2 - 1) / denominator
+    a2 = (-1 + np.sqrt(2) * wa - wa**2) / denominator
+    return b0, b1, b2, a1, a2
+
+
+def filter_pass(x: np.ndarray, y0: np.ndarray, y1: np.ndarray, coefficients: tuple) -> np.ndarray:
+    """
+    Single (forward) filter pass along last axis. The first two output values are given as initial values.
+    Equivalent to the recursive formula y[i] = b0*x[i] + b1*x[i-1] + b2*x[i-2] + a1*y[i-1] + a2*y[i-2] for i >= 2,
+    but evaluated with scipy.signal.lfilter and explicit initial conditions.
+    :param x: input array (1D or 2D with samples along last axis)
+    :param y0: output value at index 0 (scalar or array broadcastable to x[..., 0])
+    :param y1: output value at index 1
+    :param coefficients: (b0, b1, b2, a1, a2)
+    :return: output array with same shape as x
+    """
+    b0, b1, b2, a1, a2 = coefficients
+    y = np.empty(x.shape, dtype=float)
+    y[..., 0] = y0
+    y[..., 1] = y1
+    if x.shape[-1] <= 2:
+        return y
+
+    # State of transposed direct form II after index 1
+    zi = np.stack([b1 * x[..., 1] + b2 * x[..., 0] + a1 * y[..., 1] + a2 * y[..., 0],
+                   b2 * x[..., 1] + a2 * y[..., 1]], axis=-1)
+    y[..., 2:], _ = lfilter([b0, b1, b2], [1, -a1, -a2], x[..., 2:], axis=-1, zi=zi)
+    return y
+
+
+def filter_iso_6487(samples: np.ndarray, cfc: float, sampling_interval: float) -> np.ndarray:
+    """
+    Phaseless CFC filter according to ISO 6487 Annex A.
+    The signal is extended at both ends by point reflection (100 points), filtered forward and backward.
+    Initial values of each pass are the mean of the first 10 values.
+    :param samples: 1D array or 2D array (channels x samples) with same sampling interval
+    :param cfc: channel frequency class
+    :param sampling_interval: in s
+    :return: filtered array with same shape as samples
+    """
+    samples = np.asarray(samples, dtype=float)
+    number_of_samples = samples.shape[-1]
+    number_of_add_points = int(min([max([0.01 * sampling_interval, 100]), number_of_samples - 1]))
+    coefficients = get_cfc_coefficients(cfc, sampling_interval)
+
+    # Extend by point reflection at first and last sample
+    p = number_of_add_points
+    head = 2 * samples[..., :1] - samples[..., p:0:-1]
+    tail = 2 * samples[..., -1:] - samples[..., -2:-p-2:-1]
+    filter_tab = np.concatenate([head, samples, tail], axis=-1)
+
+    # Filter forward
+    y1 = filter_tab[..., :10].mean(axis=-1)
+    filter_tab = filter_pass(filter_tab, y1, y1, coefficients)
+
+    # Filter backward
+    filter_tab = filter_tab[..., ::-1]
+    y1 = filter_tab[..., :10].mean(axis=-1)
+    filter_tab = filter_pass(filter_tab, y1, y1, coefficients)[..., ::-1]
+
+    return np.ascontiguousarray(filter_tab[..., p:p + number_of_samples])
+
+
+def filter_sae_j211_1(samples: np.ndarray, cfc: float, sampling_interval: float) -> np.ndarray:
+    """
+    Phaseless CFC filter according to SAE J211-1 Appendix C.
+    Forward and backward pass without extension of the signal, initial output values are zero.
+    :param samples: 1D array or 2D array (channels x samples) with same sampling interval
+    :param cfc: channel frequency class
+    :param sampling_interval: in s
+    :return: filtered array with same shape as samples
+    """
+    samples = np.asarray(samples, dtype=float)
+    if samples.shape[-1] < 3:
+        return np.zeros(samples.shape)
+    coefficients = get_cfc_coefficients(cfc, sampling_interval)
+
+    # forward
+    output_values = filter_pass(samples, 0, 0, coefficients)
+
+    # backward (first sample is not part of the backward pass and stays zero)
+    output_values = output_values[..., :0:-1]
+    output_values = filter_pass(output_values, 0, 0, coefficients)[..., ::-1]
+    return np.concatenate([np.zeros(samples.shape[:-1] + (1,)), output_values], axis=-1)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from pyisomme.parsing import parse_mme, parse_chn, parse_xxx
-from pyisomme.channel import create_sample
-from pyisomme.code import Code
+from pyisomme.parsing import parse_mme, parse_chn, parse_xxx, parse_xxx_content, split_xxx, parse_xxx_values, parse_xxx_data, read_xxx_info, is_explicit_reference, decode
+from pyisomme.channel import Channel, create_sample, cfc_channels
+from pyisomme.code import Code, CodeIndex
+from pyisomme.cache import get_cache_key, read_cache, write_cache, evict_cache
 from pyisomme.calculate import *
 from pyisomme.utils import debug_logging
 from pyisomme.info import Info
@@ -20,6 +21,14 @@ import logging
 import shutil
 import pandas as pd
 import tarfile
+import collections
+import itertools
+import weakref
+import mmap
+import zlib
+import io
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import IO
 
 
 logger = logging.getLogger(__name__)
@@ -42,6 +51,11 @@ class Isomme:
         self.test_info = Info([]) if test_info is None else Info(test_info)
         self.channels = [] if channels is None else channels
         self.channel_info = Info([]) if channel_info is None else Info(channel_info)
+        self.max_loaded_channels = None
+        self.loaded_channels = []
+        self.code_index = CodeIndex()
+        self.dependency_stack = []
+        self.clear_derived_channels()
 
     def get_test_info(self, *labels):
         """
@@ -79,7 +93,8 @@ class Isomme:
                     continue
         return None
 
-    def read(self, path: str | Path, *channel_code_patterns) -> Isomme:
+    def read(self, path: str | Path, *channel_code_patterns, lazy: bool = False, max_loaded_channels: int = None,
+             workers: int = None, use_threads: bool = False, cache_dir: str | Path = None, cache_max_size: int = None) -> Isomme:
         """
         path must reference...
         - a .zip/.tar/.tar.gz which contains .mme-file
@@ -88,40 +103,63 @@ class Isomme:
         - a .chn file
         - a .001/.002/.. file
         :param path:
+        :param channel_code_patterns: only read channels matching any of the patterns
+        :param lazy: only read channel header (info). Data of each channel will be read on first access.
+        :param max_loaded_channels: (only lazy) maximum number of channels with data in memory.
+        If exceeded, the least recently loaded unmodified channel will be unloaded. None for no limit.
+        :param workers: number of parallel workers to parse channel files. None to parse sequentially.
+        Ignored if lazy, because only the channel headers are read.
+        :param use_threads: use thread pool instead of process pool (see workers)
+        :param cache_dir: directory of binary cache. If the test has been read before with same channel code patterns and
+        the source files did not change (path, modification time, size), it is read from cache. Otherwise, the cache
+        entry is (re-)written. Not used if lazy.
+        :param cache_max_size: (only cache_dir) maximum size of cache directory in bytes. Least recently used entries are
+        deleted if exceeded. None for no limit.
         :return:
         """
         path = Path(path).absolute()
+        self.max_loaded_channels = max_loaded_channels
+        kwargs = {"lazy": lazy, "workers": workers, "use_threads": use_threads}
 
         if not path.exists():
             raise FileNotFoundError(path)
-        elif path.suffix.lower() == ".mme":
-            self.read_from_mme(path, *channel_code_patterns)
+
+        use_cache = cache_dir is not None and not lazy
+        if use_cache:
+            cache_key = get_cache_key(path, channel_code_patterns)
+            if read_cache(self, cache_dir, cache_key):
+                logger.info(f"Reading '{path}' from cache done. Number of channel: {len(self.channels)}")
+                return self
+
+        if path.suffix.lower() == ".mme":
+            self.read_from_mme(path, *channel_code_patterns, **kwargs)
         elif path.suffix == "":
-            self.read_from_folder(path, *channel_code_patterns)
+            self.read_from_folder(path, *channel_code_patterns, **kwargs)
         elif path.suffix.lower() == ".zip":
-            self.read_from_zip(path, *channel_code_patterns)
+            self.read_from_zip(path, *channel_code_patterns, **kwargs)
         elif path.suffix.lower() == ".chn":
-            self.read_from_chn(path, *channel_code_patterns)
+            self.read_from_chn(path, *channel_code_patterns, **kwargs)
         elif re.fullmatch(r"\.\d+", path.suffix):
-            self.read_from_xxx(path, *channel_code_patterns)
+            self.read_from_xxx(path, *channel_code_patterns, **kwargs)
         elif path.suffix.lower() == ".tar":
-            self.read_from_tarfile(path, *channel_code_patterns, mode="r")
+            self.read_from_tarfile(path, *channel_code_patterns, mode="r", **kwargs)
         elif len(path.suffixes) >= 2 and path.suffixes[-1].lower() == ".gz" and path.suffixes[-2].lower() == ".tar":
-            self.read_from_tarfile(path, *channel_code_patterns, mode="r:gz")
+            self.read_from_tarfile(path, *channel_code_patterns, mode="r:gz", **kwargs)
         else:
             raise NotImplementedError(f"Could not read path: {path}")
         logger.info(f"Reading '{path}' done. Number of channel: {len(self.channels)}")
+
+        if use_cache:
+            write_cache(self, cache_dir, cache_key, path)
+            if cache_max_size is not None:
+                evict_cache(cache_dir, cache_max_size)
         return self
 
-    def read_from_mme(self, mme_path: Path, *channel_code_patterns) -> Isomme:
+    def read_from_mme(self, mme_path: Path, *channel_code_patterns, **kwargs) -> Isomme:
         # MME
         self.test_number = mme_path.stem
-        try:
-            with open(mme_path, "r", encoding="utf-8") as mme_file:
-                self.test_info = parse_mme(mme_file.read())
-        except UnicodeDecodeError:
-            with open(mme_path, "r", encoding="iso-8859-1") as mme_file:
-                self.test_info = parse_mme(mme_file.read())
+        with open(mme_path, "rb") as mme_file:
+            self.test_info = parse_mme(decode(mme_file.read()))
 
         # CHN
         chn_paths = list(mme_path.parent.glob(f"[cC][hH][aA][nN][nN][eE][lL]*/{self.test_number}.[cC][hH][nN]"))
@@ -131,135 +169,79 @@ class Isomme:
             logger.warning(f"Multiple .chn file found. {chn_paths}. Only first will be considered.")
 
         chn_path = chn_paths[0]
-        try:
-            with open(chn_path, "r", encoding="utf-8") as chn_file:
-                self.channel_info = parse_chn(chn_file.read())
-        except UnicodeDecodeError:
-            with open(chn_path, "r", encoding="iso-8859-1") as chn_file:
-                self.channel_info = parse_chn(chn_file.read())
+        with open(chn_path, "rb") as chn_file:
+            self.channel_info = parse_chn(decode(chn_file.read()))
 
         # 001
-        self.channels = []  # in case channel exist trough constructor, use extend()
-        with logging_redirect_tqdm():
-            for key in tqdm(fnmatch.filter(self.channel_info.keys(), "Name of channel *"), desc=f"Read Channel of {self.test_number}"):
-                code = self.channel_info[key].split()[0].split("/")[0]
-                if len(channel_code_patterns) != 0:
-                    skip = True
-                    for channel_code_pattern in channel_code_patterns:
-                        if fnmatch.fnmatch(code, channel_code_pattern):
-                            skip = False
-                            break
-                    if skip:
-                        continue
-
-                xxx = re.search(r"Name of channel (\d*)", key)
-                if xxx is None:
-                    raise Exception
-                xxx = xxx.groups()[0]
-                xxx_paths = list(Path(chn_path).parent.glob(f"{self.test_number}.{xxx}"))
-                if len(xxx_paths) == 0:
-                    logger.critical(f"Channel file '{self.test_number}.{xxx}' not found.")
-                    continue
+        def find_xxx(xxx: str) -> Path | None:
+            xxx_paths = list(Path(chn_path).parent.glob(f"{self.test_number}.{xxx}"))
+            return xxx_paths[0] if len(xxx_paths) != 0 else None
 
-                xxx_path = xxx_paths[0]
-                logger.debug(xxx_path)
-                try:
-                    with open(xxx_path, "r", encoding="utf-8") as xxx_file:
-                        self.channels.append(parse_xxx(xxx_file.read(), isomme=self))
-                except UnicodeDecodeError:
-                    with open(xxx_path, "r", encoding="iso-8859-1") as xxx_file:
-                        self.channels.append(parse_xxx(xxx_file.read(), isomme=self))
-        return self
+        def open_xxx(xxx_path: Path) -> IO[bytes]:
+            return open(xxx_path, "rb")
+
+        def get_data_loader(xxx_path: Path) -> ChannelLoader:
+            return ChannelLoader(xxx_path, isomme=self)
 
-    def read_from_folder(self, folder_path: Path, *channel_code_patterns) -> Isomme:
+        return self.read_channels(find_xxx, open_xxx, *channel_code_patterns, **kwargs, get_data_loader=get_data_loader)
+
+    def read_from_folder(self, folder_path: Path, *channel_code_patterns, **kwargs) -> Isomme:
         mme_paths = list(folder_path.rglob("*.[mM][mM][eE]"))
         if len(mme_paths) == 0:
             raise FileNotFoundError("Folder not containing any .mme/.MME file.")
         elif len(mme_paths) > 1:
             raise Exception("Multiple .mme files found inside of the folder. Please specify the .mme-file path.")
-        return self.read_from_mme(mme_paths[0], *channel_code_patterns)
+        return self.read_from_mme(mme_paths[0], *channel_code_patterns, **kwargs)
 
-    def read_from_chn(self, chn_path: Path, *channel_code_patterns) -> Isomme:
+    def read_from_chn(self, chn_path: Path, *channel_code_patterns, **kwargs) -> Isomme:
         mme_paths = list(chn_path.parent.parent.glob("*.[mM][mM][eE]"))
         if len(mme_paths) == 0:
             raise FileNotFoundError("Parent Folder not containing any .mme file.")
-        return self.read_from_mme(mme_paths[0], *channel_code_patterns)
+        return self.read_from_mme(mme_paths[0], *channel_code_patterns, **kwargs)
 
-    def read_from_xxx(self, xxx_path: Path, *channel_code_patterns) -> Isomme:
+    def read_from_xxx(self, xxx_path: Path, *channel_code_patterns, **kwargs) -> Isomme:
         mme_paths = list(xxx_path.parent.parent.glob("*.[mM][mM][eE]"))
         if len(mme_paths) == 0:
             raise FileNotFoundError("Parent Folder not containing any .mme file.")
-        return self.read_from_mme(mme_paths[0], *channel_code_patterns)
-
-    def read_from_zip(self, zip_path: Path, *channel_code_patterns) -> Isomme:
-        archive = zipfile.ZipFile(zip_path, "r")
+        return self.read_from_mme(mme_paths[0], *channel_code_patterns, **kwargs)
 
-        # MME
-        mme_paths = fnmatch.filter(archive.namelist(), "*.[mM][mM][eE]")
-        if len(mme_paths) == 0:
-            raise FileNotFoundError("No .mme file found.")
-        elif len(mme_paths) > 1:
-            raise Exception("Multiple .mme files found.")
+    def read_from_zip(self, zip_path: Path, *channel_code_patterns, **kwargs) -> Isomme:
+        with zipfile.ZipFile(zip_path, "r") as archive:
+            # MME
+            mme_paths = fnmatch.filter(archive.namelist(), "*.[mM][mM][eE]")
+            if len(mme_paths) == 0:
+                raise FileNotFoundError("No .mme file found.")
+            elif len(mme_paths) > 1:
+                raise Exception("Multiple .mme files found.")
 
-        mme_path = mme_paths[0]
-        self.test_number = Path(mme_path).stem
+            mme_path = mme_paths[0]
+            self.test_number = Path(mme_path).stem
 
-        with archive.open(mme_path, "r") as mme_file:
-            mme_content = mme_file.read()
-            try:
-                self.test_info = parse_mme(mme_content.decode("utf-8"))
-            except UnicodeDecodeError:
-                self.test_info = parse_mme(mme_content.decode("iso-8859-1"))
+            with archive.open(mme_path, "r") as mme_file:
+                self.test_info = parse_mme(decode(mme_file.read()))
 
-        # CHN
-        chn_paths = fnmatch.filter(archive.namelist(), str(Path(mme_path).parent.joinpath("[cC][hH][aA][nN][nN][eE][lL]*", f"{self.test_number}.[cC][hH][nN]")))
-        if len(chn_paths) == 0:
-            raise FileNotFoundError("No .chn file found.")
-        elif len(chn_paths) > 1:
-            logger.warning(f"Multiple .chn file found. {chn_paths}. Only first will be considered.")
+            # CHN
+            chn_paths = fnmatch.filter(archive.namelist(), str(Path(mme_path).parent.joinpath("[cC][hH][aA][nN][nN][eE][lL]*", f"{self.test_number}.[cC][hH][nN]")))
+            if len(chn_paths) == 0:
+                raise FileNotFoundError("No .chn file found.")
+            elif len(chn_paths) > 1:
+                logger.warning(f"Multiple .chn file found. {chn_paths}. Only first will be considered.")
 
-        chn_path = chn_paths[0]
-        with archive.open(chn_path, "r") as chn_file:
-            chn_content = chn_file.read()
-            try:
-                self.channel_info = parse_chn(chn_content.decode("utf-8"))
-            except UnicodeDecodeError:
-                self.channel_info = parse_chn(chn_content.decode("iso-8859-1"))
+            chn_path = chn_paths[0]
+            with archive.open(chn_path, "r") as chn_file:
+                self.channel_info = parse_chn(decode(chn_file.read()))
 
-        # 001
-        self.channels = []  # in case channel exist trough constructor
-        with logging_redirect_tqdm():
-            for key in tqdm(fnmatch.filter(self.channel_info.keys(), "Name of channel *"), desc=f"Read Channel of {self.test_number}"):
-                code = self.channel_info[key].split()[0].split("/")[0]
-                if len(channel_code_patterns) != 0:
-                    skip = True
-                    for channel_code_pattern in channel_code_patterns:
-                        if fnmatch.fnmatch(code, channel_code_pattern):
-                            skip = False
-                            break
-                    if skip:
-                        continue
-
-                xxx = re.search(r"Name of channel (\d*)", key)
-                if xxx is None:
-                    raise Exception
-                xxx = xxx.groups()[0]
+            # 001
+            def find_xxx(xxx: str) -> str | None:
                 xxx_paths = fnmatch.filter(archive.namelist(), str(Path(chn_path).parent.joinpath(f"*.{xxx}")))
-                if len(xxx_paths) == 0:
-                    logger.critical(f"Channel file '*.{xxx}' not found.")
-                    continue
+                return xxx_paths[0] if len(xxx_paths) != 0 else None
 
-                xxx_path = xxx_paths[0]
-                logger.debug(xxx_path)
-                with archive.open(xxx_path, "r") as xxx_file:
-                    xxx_content = xxx_file.read()
-                    try:
-                        self.channels.append(parse_xxx(xxx_content.decode("utf-8"), isomme=self))
-                    except UnicodeDecodeError:
-                        self.channels.append(parse_xxx(xxx_content.decode("iso-8859-1"), isomme=self))
-        return self
+            def get_data_loader(xxx_path: str) -> ChannelLoader:
+                return ChannelLoader(zip_path, xxx_path, archive="zip", isomme=self)
 
-    def read_from_tarfile(self, tar_path: Path, *channel_code_patterns, mode: str = "r") -> Isomme:
+            return self.read_channels(find_xxx, archive.open, *channel_code_patterns, **kwargs, get_data_loader=get_data_loader)
+
+    def read_from_tarfile(self, tar_path: Path, *channel_code_patterns, mode: str = "r", **kwargs) -> Isomme:
         with tarfile.open(tar_path, mode) as tar_file:
             # MME
             mme_paths = fnmatch.filter(tar_file.getnames(), "*.[mM][mM][eE]")
@@ -272,11 +254,7 @@ class Isomme:
             self.test_number = Path(mme_path).stem
 
             with tar_file.extractfile(mme_path) as mme_file:
-                mme_content = mme_file.read()
-                try:
-                    self.test_info = parse_mme(mme_content.decode("utf-8"))
-                except UnicodeDecodeError:
-                    self.test_info = parse_mme(mme_content.decode("iso-8859-1"))
+                self.test_info = parse_mme(decode(mme_file.read()))
 
             # CHN
             chn_paths = fnmatch.filter(tar_file.getnames(), f"*{self.test_number}.[cC][hH][nN]")
@@ -287,44 +265,122 @@ class Isomme:
 
             chn_path = chn_paths[0]
             with tar_file.extractfile(chn_path) as chn_file:
-                chn_content = chn_file.read()
-                try:
-                    self.channel_info = parse_chn(chn_content.decode("utf-8"))
-                except UnicodeDecodeError:
-                    self.channel_info = parse_chn(chn_content.decode("iso-8859-1"))
+                self.channel_info = parse_chn(decode(chn_file.read()))
 
             # 001
-            self.channels = []  # in case channel exist trough constructor
-            with logging_redirect_tqdm():
-                for key in tqdm(fnmatch.filter(self.channel_info.keys(), "Name of channel *"), desc=f"Read Channel of {self.test_number}"):
-                    code = self.channel_info[key].split()[0].split("/")[0]
-                    if len(channel_code_patterns) != 0:
-                        skip = True
-                        for channel_code_pattern in channel_code_patterns:
-                            if fnmatch.fnmatch(code, channel_code_pattern):
-                                skip = False
-                                break
-                        if skip:
+            def find_xxx(xxx: str) -> str | None:
+                xxx_paths = fnmatch.filter(tar_file.getnames(), str(Path(chn_path).parent.joinpath(f"*.{xxx}")))
+                return xxx_paths[0] if len(xxx_paths) != 0 else None
+
+            def get_data_loader(xxx_path: str) -> ChannelLoader:
+                if mode == "r":  # random access by position in archive
+                    member = tar_file.getmember(xxx_path)
+                    return ChannelLoader(tar_path, xxx_path, archive=mode, isomme=self, offset=member.offset_data, size=member.size)
+                # Decompressing again on each access would start at the beginning of the archive
+                with tar_file.extractfile(xxx_path) as xxx_file:
+                    return ChannelLoader(tar_path, xxx_path, archive=mode, isomme=self, content=xxx_file.read())
+
+            return self.read_channels(find_xxx, tar_file.extractfile, *channel_code_patterns, **kwargs, get_data_loader=get_data_loader)
+
+    def read_channels(self, find_xxx, open_xxx, *channel_code_patterns, lazy: bool = False, get_data_loader=None,
+                      workers: int = None, use_threads: bool = False) -> Isomme:
+        """
+        Read all channel files (.001/.002/...) listed in channel info (.chn) and replace channel list.
+        :param find_xxx: function returning path of channel file by channel number (e.g. "001") or None if not found
+        :param open_xxx: function returning channel file (binary mode) by path
+        :param channel_code_patterns: only read channels matching any of the patterns
+        :param lazy: only read header of channel files. Data will be read on first access.
+        :param get_data_loader: (only lazy) function returning data loader (see ChannelLoader) by path of channel file
+        :param workers: number of parallel workers to parse channel files. None to parse sequentially.
+        Ignored if lazy. Channels with explicit reference channel are created after all other channels. The order of channels is kept.
+        :param use_threads: use thread pool instead of process pool (see workers)
+        :return: self
+        """
+        self.channels = []  # in case channel exist trough constructor, use extend()
+        self.loaded_channels = []
+
+        xxx_paths = []
+        for key in fnmatch.filter(self.channel_info.keys(), "Name of channel *"):
+            code = self.channel_info[key].split()[0].split("/")[0]
+            if len(channel_code_patterns) != 0:
+                skip = True
+                for channel_code_pattern in channel_code_patterns:
+                    if fnmatch.fnmatch(code, channel_code_pattern):
+                        skip = False
+                        break
+                if skip:
+                    continue
+
+            xxx = re.search(r"Name of channel (\d*)", key)
+            if xxx is None:
+                raise Exception
+            xxx = xxx.groups()[0]
+            xxx_path = find_xxx(xxx)
+            if xxx_path is None:
+                logger.critical(f"Channel file '*.{xxx}' not found.")
+                continue
+            xxx_paths.append(xxx_path)
+
+        def read_xxx(xxx_path) -> bytes:
+            logger.debug(xxx_path)
+            with open_xxx(xxx_path) as xxx_file:
+                return xxx_file.read()
+
+        with logging_redirect_tqdm():
+            if lazy:
+                if workers is not None:
+                    logger.info("Channel headers are read sequentially, workers are ignored if lazy.")
+                for xxx_path in tqdm(xxx_paths, desc=f"Read Channel of {self.test_number}"):
+                    data_loader = get_data_loader(xxx_path)
+                    if data_loader.content is not None:
+                        info = read_xxx_info(io.BytesIO(data_loader.read()))
+                    else:
+                        with open_xxx(xxx_path) as xxx_file:
+                            info = read_xxx_info(xxx_file)
+                    self.channels.append(Channel(info.get("Channel code"), None, unit=info.get("Unit"), info=info, data_loader=data_loader))
+
+            elif workers is None:
+                for xxx_path in tqdm(xxx_paths, desc=f"Read Channel of {self.test_number}"):
+                    self.channels.append(parse_xxx(read_xxx(xxx_path), isomme=self))
+
+            else:
+                executor_class = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+                with executor_class(max_workers=workers) as executor:
+                    results = list(tqdm(executor.map(parse_xxx_content, (read_xxx(xxx_path) for xxx_path in xxx_paths)),
+                                        total=len(xxx_paths),
+                                        desc=f"Read Channel of {self.test_number}"))
+
+                # Explicit reference channels need time array of other channels --> second pass
+                channels = [None] * len(results)
+                for second_pass in (False, True):
+                    for idx, (info, array) in enumerate(results):
+                        if is_explicit_reference(info) != second_pass:
                             continue
+                        channels[idx] = Channel(info.get("Channel code"), parse_xxx_data(array, info, isomme=self), unit=info.get("Unit"), info=info)
+                        self.channels.append(channels[idx])
+                self.channels = channels
+        return self
+
+    def add_loaded_channel(self, channel: Channel) -> Isomme:
+        """
+        Register data of lazy loaded channel as loaded (see read() and ChannelLoader).
+        If max_loaded_channels is exceeded, the least recently loaded channels will be unloaded.
+        :param channel: Channel-object
+        :return: self
+        """
+        self.loaded_channels = [c for c in self.loaded_channels if c is not channel and c.is_loaded() and c.data_loader is not None]
+        if self.max_loaded_channels is not None:
+            while len(self.loaded_channels) >= max(self.max_loaded_channels, 1):
+                self.loaded_channels.pop(0).unload()
+        self.loaded_channels.append(channel)
+        return self
 
-                    xxx = re.search(r"Name of channel (\d*)", key)
-                    if xxx is None:
-                        raise Exception
-                    xxx = xxx.groups()[0]
-                    xxx_paths = fnmatch.filter(tar_file.getnames(), str(Path(chn_path).parent.joinpath(f"*.{xxx}")))
-                    if len(xxx_paths) == 0:
-                        logger.critical(f"Channel file '*.{xxx}' not found.")
-                        continue
-
-                    xxx_path = xxx_paths[0]
-                    logger.debug(xxx_path)
-                    with tar_file.extractfile(xxx_path) as xxx_file:
-                        xxx_content = xxx_file.read()
-                        try:
-                            self.channels.append(parse_xxx(xxx_content.decode("utf-8"), isomme=self))
-                        except UnicodeDecodeError:
-                            self.channels.append(parse_xxx(xxx_content.decode("iso-8859-1"), isomme=self))
-            return self
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Reference to Isomme-object is not pickled, see ChannelLoader
+        for channel in self.channels:
+            if isinstance(channel.data_loader, ChannelLoader):
+                channel.data_loader.isomme_ref = weakref.ref(self)
 
     def write_mme(self, path: str | Path, *channel_code_patterns) -> Isomme:
         channels = self.get_channels(*channel_code_patterns) if len(channel_code_patterns) != 0 else self.channels
@@ -440,20 +496,26 @@ class Isomme:
         :param filter_class_duplicates: Delete redundant channels and only keep channels with the least amount of filtering applied
         :return: self
         """
-        for code in {channel.code for channel in self.channels}:
-            channels = self.get_channels(code, calculate=False, filter=False, differentiate=False, integrate=False)
-            for channel in channels[1:]:
-                self.channels.remove(channel)
-                logger.debug(f"Removed duplicate Channel: {channel.code}")
+        code_index = CodeIndex([channel.code for channel in self.channels])
+        removed = set()
+
+        for code in dict.fromkeys(channel.code for channel in self.channels):
+            indices = [idx for idx in code_index.find(code) if idx not in removed]
+            for idx in indices[1:]:
+                removed.add(idx)
+                logger.debug(f"Removed duplicate Channel: {self.channels[idx].code}")
 
         if filter_class_duplicates:
-            for code in {channel.code for channel in self.channels}:
-                channels = self.get_channels(code[:-1].replace("?", "[?]") + "?", calculate=False, filter=False, differentiate=False, integrate=False)
-                sort_seq = "0XAEPBF2CG3DHQLVS"
-                sort_map = {filter_class: sort_seq.index(filter_class) for filter_class in sort_seq}
-                for channel in sorted(channels, key=lambda c: sort_map.get(c.code.filter_class, float('inf')))[1:]:
-                    self.channels.remove(channel)
-                    logger.debug(f"Removed duplicate filter Channel: {channel.code}")
+            sort_seq = "0XAEPBF2CG3DHQLVS"
+            sort_map = {filter_class: sort_seq.index(filter_class) for filter_class in sort_seq}
+            for code in dict.fromkeys(channel.code for idx, channel in enumerate(self.channels) if idx not in removed):
+                indices = [idx for idx in code_index.find(code[:-1].replace("?", "[?]") + "?") if idx not in removed]
+                for idx in sorted(indices, key=lambda i: sort_map.get(self.channels[i].code.filter_class, float('inf')))[1:]:
+                    removed.add(idx)
+                    logger.debug(f"Removed duplicate filter Channel: {self.channels[idx].code}")
+
+        if len(removed) != 0:
+            self.channels = [channel for idx, channel in enumerate(self.channels) if idx not in removed]
         return self
 
     def __eq__(self, other):
@@ -487,12 +549,146 @@ class Isomme:
     def __hash__(self):
         return hash(self.test_number)
 
+    def find_channels(self, code_pattern: str) -> list:
+        """
+        Find existing channels matching code pattern (no filtering or calculation, see get_channels()).
+        Uses an index of channel codes, which is updated if channels or their codes changed.
+        :param code_pattern: fnmatch-pattern
+        :return: list of Channels in order of channel list
+        """
+        self.code_index.update([channel.code for channel in self.channels])
+        channels = [self.channels[idx] for idx in self.code_index.find(code_pattern)]
+        self.add_dependencies({id(channel): channel for channel in channels})
+        return channels
+
+    def clear_derived_channels(self) -> Isomme:
+        """
+        Clear cache of channels created by get_channel() (filtering and calculations).
+        :return: self
+        """
+        self.derived_channels = {}
+        self.calculation_results = {}
+        self.derived_channels_state = ([], [])
+        return self
+
+    def check_derived_channels(self) -> None:
+        """
+        Clear cache of derived channels if channels were added, removed or renamed since the cache was filled.
+        Channels modified in place are checked for each cached channel (see get_channel()).
+        """
+        channels, codes = self.derived_channels_state
+        if (len(channels) != len(self.channels)
+                or list(map(id, channels)) != list(map(id, self.channels))
+                or codes != [channel.code for channel in self.channels]):
+            self.clear_derived_channels()
+            self.derived_channels_state = (list(self.channels), [channel.code for channel in self.channels])
+
+    def add_dependencies(self, dependencies: dict) -> None:
+        """
+        Add channels to the dependencies of the channels currently created by get_channel().
+        :param dependencies: dict of channels by id
+        """
+        if len(self.dependency_stack) != 0:
+            self.dependency_stack[-1].update(dependencies)
+
+    def get_derived_channel_entries(self, channel: Channel) -> list[tuple]:
+        """
+        Valid cache entries of a channel created by get_channel(). Used to transfer derived channels from other
+        processes (see add_derived_channel()).
+        :param channel: Channel-object
+        :return: list of (key, indices of channels of this object the channel was created from)
+        """
+        self.check_derived_channels()
+        entries = []
+        for key, (cached_channel, code, dependencies) in self.derived_channels.items():
+            if (cached_channel is channel and channel.code == code
+                    and all(dependency.version == version for dependency, version in dependencies.values())):
+                entries.append((key, [idx for idx, c in enumerate(self.channels) if id(c) in dependencies]))
+        return entries
+
+    def add_derived_channel(self, channel: Channel, entries: list[tuple]) -> Isomme:
+        """
+        Add channel created in another process to the cache of derived channels (see get_derived_channel_entries()),
+        so that get_channel() returns it without filtering or calculating it again.
+        :param channel: Channel-object
+        :param entries: list of (key, indices of channels of this object the channel was created from)
+        :return: self
+        """
+        self.check_derived_channels()
+        for key, indices in entries:
+            dependencies = {id(self.channels[idx]): self.channels[idx] for idx in indices}
+            dependencies[id(channel)] = channel
+            self.derived_channels[key] = (channel,
+                                          channel.code,
+                                          {idx: (dependency, dependency.version) for idx, dependency in dependencies.items()})
+        return self
+
+    def calculate_cached(self, func, *channels: Channel, **kwargs):
+        """
+        Call calculation function once per set of input channels and keyword arguments.
+        Used for calculations with multiple outputs (e.g. Nij), so that all outputs are created in one go, and for
+        filtering and calculations requested by differently spelled code patterns (e.g. "...ACXA" and "...AC?A"),
+        so that the same channel is not filtered or calculated twice.
+        The result is calculated again if input or output channels were modified in place (see Channel.version).
+        :param func: calculation function (see calculate.py)
+        :param channels: input channels
+        :param kwargs: keyword arguments of func
+        :return: return value of func
+        """
+        key = (func, tuple(map(id, channels)), tuple(sorted(kwargs.items())))
+        if key in self.calculation_results:
+            input_channels, input_versions, result, output_versions = self.calculation_results[key]
+            if (all(channel is input_channel for channel, input_channel in zip(channels, input_channels))
+                    and [channel.version for channel in channels] == input_versions
+                    and get_output_versions(result) == output_versions):
+                return result
+        result = func(*channels, **kwargs)
+        self.calculation_results[key] = (channels, [channel.version for channel in channels], result, get_output_versions(result))
+        return result
+
     @debug_logging(logger)
     def get_channel(self, *code_patterns: str, filter: bool = True, calculate: bool = True, differentiate=True, integrate=True) -> Channel | None:
         """
         Get channel by channel code pattern.
         First match will be returned, although multiple matches could exist.
         If channel does not exist, it will be created through filtering and calculations if possible.
+        Created channels are cached until the channels of this object are added, removed or renamed (see
+        check_derived_channels()). Therefore, repeated calls return the same Channel-object. If this Channel-object or
+        any channel it was created from (including intermediate channels) is modified in place (e.g. unit conversion,
+        scale, see Channel.version), it will be created again on the next call.
+        :param code_patterns:
+        :param filter: create channel by filtering if channel does not exist yet
+        :param calculate: create channel by calculation if channel does not exist yet
+        :param differentiate: Allow differentiation if channel not found otherwise
+        :param integrate: Allow integration if channel not found otherwise
+        :return: Channel object or None
+        """
+        self.check_derived_channels()
+        key = (tuple(str(code_pattern) for code_pattern in code_patterns), filter, calculate, differentiate, integrate)
+        if key in self.derived_channels:
+            channel, code, dependencies = self.derived_channels[key]
+            if ((channel is None or channel.code == code)
+                    and all(dependency.version == version for dependency, version in dependencies.values())):
+                self.add_dependencies({idx: dependency for idx, (dependency, _) in dependencies.items()})
+                return channel
+
+        # Collect all channels used to create the channel, their versions are checked on the next call
+        self.dependency_stack.append({})
+        try:
+            channel = self.get_channel_uncached(*code_patterns, filter=filter, calculate=calculate, differentiate=differentiate, integrate=integrate)
+        finally:
+            dependencies = self.dependency_stack.pop()
+        if channel is not None:
+            dependencies[id(channel)] = channel
+        self.add_dependencies(dependencies)
+        self.derived_channels[key] = (channel,
+                                      None if channel is None else channel.code,
+                                      {idx: (dependency, dependency.version) for idx, dependency in dependencies.items()})
+        return channel
+
+    def get_channel_uncached(self, *code_patterns: str, filter: bool = True, calculate: bool = True, differentiate=True, integrate=True) -> Channel | None:
+        """
+        Get channel by channel code pattern without using the cache of derived channels (see get_channel()).
         :param code_patterns:
         :param filter: create channel by filtering if channel does not exist yet
         :param calculate: create channel by calculation if channel does not exist yet
@@ -502,14 +698,14 @@ class Isomme:
         """
         for code_pattern in code_patterns:
             # 1. Channel does exist already
-            for channel in self.channels:
-                if fnmatch.fnmatch(channel.code, code_pattern):
-                    return channel
+            channels = self.find_channels(code_pattern)
+            if len(channels) != 0:
+                return channels[0]
             # 2. Filter Channel
             if filter and fnmatch.fnmatch(code_pattern, "*[ABCD]"):
-                for channel in self.channels:
-                    if fnmatch.fnmatch(channel.code, code_pattern[:-1] + "?"):
-                        return channel.cfc(code_pattern[-1])
+                channels = self.find_channels(code_pattern[:-1] + "?")
+                if len(channels) != 0:
+                    return self.calculate_cached(Channel.cfc, channels[0], value=code_pattern[-1])
             try:
                 code_pattern = Code(code_pattern)
             except AssertionError:
@@ -520,16 +716,16 @@ class Isomme:
                 if code_pattern.direction == "R" and code_pattern.filter_class != "X":
                     channel_xyz = [self.get_channel(code_pattern.set(direction=direction)) for direction in "XYZ"]
                     if None not in channel_xyz:
-                        return calculate_resultant(*channel_xyz)
+                        return self.calculate_cached(calculate_resultant, *channel_xyz)
                     channel_123 = [self.get_channel(code_pattern.set(direction=direction)) for direction in "123"]
                     if None not in channel_123:
-                        return calculate_resultant(*channel_123)
+                        return self.calculate_cached(calculate_resultant, *channel_123)
 
                 # BrIC
                 if code_pattern.main_location == "BRIC" and code_pattern.filter_class == "X":
                     channel_head_av_xyz = [self.get_channel(code_pattern.set(main_location="HEAD", physical_dimension="AV", direction=direction, filter_class="D")) for direction in "XYZ"]
                     if None not in channel_head_av_xyz:
-                        return calculate_bric(*channel_head_av_xyz)
+                        return self.calculate_cached(calculate_bric, *channel_head_av_xyz)
 
                 # HIC
                 if code_pattern.main_location == "HICR" and code_pattern.filter_class == "X":
@@ -539,14 +735,14 @@ class Isomme:
                                                                      physical_dimension="AC",
                                                                      filter_class="A"))
                     if head_channel is not None:
-                        return calculate_hic(head_channel, max_delta_t=int(code_pattern.fine_location_2))
+                        return self.calculate_cached(calculate_hic, head_channel, max_delta_t=int(code_pattern.fine_location_2))
 
                 # xms
                 if fnmatch.fnmatch(code_pattern.fine_location_2, "[0-9][CS]") and code_pattern.filter_class == "X":
                     channel = self.get_channel(code_pattern.set(fine_location_2="00",
                                                                 filter_class="A" if not code_pattern.main_location == "THSP" else "C"))
                     if channel is not None:
-                        return calculate_xms(channel, min_delta_t=int(code_pattern.fine_location_2[0]), method=code_pattern.fine_location_2[1])
+                        return self.calculate_cached(calculate_xms, channel, min_delta_t=int(code_pattern.fine_location_2[0]), method=code_pattern.fine_location_2[1])
 
                 # Damage
                 if code_pattern.fine_location_1 == "DA" and code_pattern.fine_location_2 == "MA" and code_pattern.physical_dimension == "AA":
@@ -555,25 +751,25 @@ class Isomme:
                                                         code_pattern.set(fine_location_1="CG", fine_location_2="00", direction=direction, filter_class="A")) for direction in "XYZ"]
                         if None not in channel_xyz:
                             if code_pattern.direction == "X":
-                                return calculate_damage(*channel_xyz)[4]
+                                return self.calculate_cached(calculate_damage, *channel_xyz)[4]
                             if code_pattern.direction == "Y":
-                                return calculate_damage(*channel_xyz)[5]
+                                return self.calculate_cached(calculate_damage, *channel_xyz)[5]
                             if code_pattern.direction == "Z":
-                                return calculate_damage(*channel_xyz)[6]
+                                return self.calculate_cached(calculate_damage, *channel_xyz)[6]
                             if code_pattern.direction == "R":
-                                return calculate_damage(*channel_xyz)[7]
+                                return self.calculate_cached(calculate_damage, *channel_xyz)[7]
                     else:
                         channel_xyz = [self.get_channel(code_pattern.set(fine_location_1="00", fine_location_2="00", direction=direction),
                                                         code_pattern.set(fine_location_1="CG", fine_location_2="00", direction=direction)) for direction in "XYZ"]
                         if None not in channel_xyz:
                             if code_pattern.direction == "X":
-                                return calculate_damage(*channel_xyz)[0]
+                                return self.calculate_cached(calculate_damage, *channel_xyz)[0]
                             if code_pattern.direction == "Y":
-                                return calculate_damage(*channel_xyz)[1]
+                                return self.calculate_cached(calculate_damage, *channel_xyz)[1]
                             if code_pattern.direction == "Z":
-                                return calculate_damage(*channel_xyz)[2]
+                                return self.calculate_cached(calculate_damage, *channel_xyz)[2]
                             if code_pattern.direction == "R":
-                                return calculate_damage(*channel_xyz)[3]
+                                return self.calculate_cached(calculate_damage, *channel_xyz)[3]
 
                 # Neck Total Moment
                 if code_pattern.main_location == "TMON":
@@ -583,46 +779,46 @@ class Isomme:
                                 channel_mx = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="MO", direction="X", filter_class="B"))
                                 channel_fy = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="FO", direction="Y", filter_class="B"))
                                 if None not in (channel_mx, channel_fy):
-                                    return calculate_neck_MOCx(channel_mx, channel_fy)[1]
+                                    return self.calculate_cached(calculate_neck_MOCx, channel_mx, channel_fy)[1]
                             else:
                                 channel_mx = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="MO", direction="X"))
                                 channel_fy = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="FO", direction="Y"))
                                 if None not in (channel_mx, channel_fy):
-                                    return calculate_neck_MOCx(channel_mx, channel_fy)[0]
+                                    return self.calculate_cached(calculate_neck_MOCx, channel_mx, channel_fy)[0]
                         elif code_pattern.direction == "Y":
                             if code_pattern.filter_class == "X":
                                 channel_my = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="MO", direction="Y", filter_class="B"))
                                 channel_fx = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="FO", direction="X", filter_class="B"))
                                 if None not in (channel_my, channel_fx):
-                                    return calculate_neck_MOCy(channel_my, channel_fx)[1]
+                                    return self.calculate_cached(calculate_neck_MOCy, channel_my, channel_fx)[1]
                             else:
                                 channel_my = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="MO", direction="Y"))
                                 channel_fx = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="FO", direction="X"))
                                 if None not in (channel_my, channel_fx):
-                                    return calculate_neck_MOCy(channel_my, channel_fx)[0]
+                                    return self.calculate_cached(calculate_neck_MOCy, channel_my, channel_fx)[0]
                     elif code_pattern.fine_location_1 == "LO":
                         if code_pattern.direction == "X":
                             if code_pattern.filter_class == "X":
                                 channel_mx = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="MO", direction="X", filter_class="B"))
                                 channel_fy = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="FO", direction="Y", filter_class="B"))
                                 if None not in (channel_mx, channel_fy):
-                                    return calculate_neck_Mx_base(channel_mx, channel_fy)[1]
+                                    return self.calculate_cached(calculate_neck_Mx_base, channel_mx, channel_fy)[1]
                             else:
                                 channel_mx = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="MO", direction="X"))
                                 channel_fy = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="FO", direction="Y"))
                                 if None not in (channel_mx, channel_fy):
-                                    return calculate_neck_Mx_base(channel_mx, channel_fy)[0]
+                                    return self.calculate_cached(calculate_neck_Mx_base, channel_mx, channel_fy)[0]
                         elif code_pattern.direction == "Y":
                             if code_pattern.filter_class == "X":
                                 channel_my = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="MO", direction="Y", filter_class="B"))
                                 channel_fx = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="FO", direction="X", filter_class="B"))
                                 if None not in (channel_my, channel_fx):
-                                    return calculate_neck_My_base(channel_my, channel_fx)[1]
+                                    return self.calculate_cached(calculate_neck_My_base, channel_my, channel_fx)[1]
                             else:
                                 channel_my = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="MO", direction="Y"))
                                 channel_fx = self.get_channel(code_pattern.set(main_location="NECK", physical_dimension="FO", direction="X"))
                                 if None not in (channel_my, channel_fx):
-                                    return calculate_neck_My_base(channel_my, channel_fx)[0]
+                                    return self.calculate_cached(calculate_neck_My_base, channel_my, channel_fx)[0]
 
                 # Neck NIJ  # FIXME: Total Moment (TMON statt NECK ??)
                 if code_pattern.main_location == "NIJC":
@@ -631,29 +827,29 @@ class Isomme:
                         c_mocy = self.get_channel(code_pattern.set(main_location="NECK", fine_location_1="UP", fine_location_2="00", physical_dimension="MO", direction="Y", filter_class="B"))
                         if None not in (c_fz, c_mocy):
                             if code_pattern.fine_location_2 == "00":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[5]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[5]
                             elif code_pattern.fine_location_2 == "CF":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[6]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[6]
                             elif code_pattern.fine_location_2 == "CE":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[7]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[7]
                             elif code_pattern.fine_location_2 == "TF":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[8]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[8]
                             elif code_pattern.fine_location_2 == "TE":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[9]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[9]
                     else:
                         c_fz = self.get_channel(code_pattern.set(main_location="NECK", fine_location_1="UP", fine_location_2="00", physical_dimension="FO", direction="Z"))
                         c_mocy = self.get_channel(code_pattern.set(main_location="NECK", fine_location_1="UP", fine_location_2="00", physical_dimension="MO", direction="Y"))
                         if None not in (c_fz, c_mocy):
                             if code_pattern.fine_location_2 == "00":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[0]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[0]
                             elif code_pattern.fine_location_2 == "CF":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[1]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[1]
                             elif code_pattern.fine_location_2 == "CE":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[2]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[2]
                             elif code_pattern.fine_location_2 == "TF":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[3]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[3]
                             elif code_pattern.fine_location_2 == "TE":
-                                return calculate_neck_nij(c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[4]
+                                return self.calculate_cached(calculate_neck_nij, c_fz, c_mocy, oop=code_pattern.fine_location_1 == "OP")[4]
 
                 # Shoulder Lateral Force (Y) (min/max of left and right)
                 if code_pattern.main_location == "SHLD" and code_pattern.fine_location_1 == "00" and code_pattern.physical_dimension == "FO" and code_pattern.direction == "Y":
@@ -674,23 +870,23 @@ class Isomme:
                         if code_pattern.filter_class == "X":
                             channel = self.get_channel(code_pattern.set(main_location="CHST", physical_dimension="DS", filter_class="C"))
                             if channel is not None:
-                                return calculate_vc(channel)[1]
+                                return self.calculate_cached(calculate_vc, channel)[1]
                             channel = self.get_channel(code_pattern.set(main_location="TRRI", physical_dimension="DS", filter_class="C"))
                             if channel is not None:
-                                return calculate_vc(channel)[1]
+                                return self.calculate_cached(calculate_vc, channel)[1]
                             channel = self.get_channel(code_pattern.set(main_location="RIBS", physical_dimension="DS", filter_class="C"))
                             if channel is not None:
-                                return calculate_vc(channel)[1]
+                                return self.calculate_cached(calculate_vc, channel)[1]
                         else:
                             channel = self.get_channel(code_pattern.set(main_location="CHST", physical_dimension="DS"))
                             if channel is not None:
-                                return calculate_vc(channel)[0]
+                                return self.calculate_cached(calculate_vc, channel)[0]
                             channel = self.get_channel(code_pattern.set(main_location="TRRI", physical_dimension="DS"))
                             if channel is not None:
-                                return calculate_vc(channel)[0]
+                                return self.calculate_cached(calculate_vc, channel)[0]
                             channel = self.get_channel(code_pattern.set(main_location="RIBS", physical_dimension="DS"))
                             if channel is not None:
-                                return calculate_vc(channel)[0]
+                                return self.calculate_cached(calculate_vc, channel)[0]
 
                         if code_pattern.fine_location_2 == "00":
                             if code_pattern.filter_class == "X":
@@ -774,17 +970,17 @@ class Isomme:
                         if code_pattern.filter_class == "X":
                             channel = self.get_channel(code_pattern.set(main_location="ABDO", physical_dimension="DS", filter_class="C"))
                             if channel is not None:
-                                return calculate_vc(channel)[1]
+                                return self.calculate_cached(calculate_vc, channel)[1]
                             channel = self.get_channel(code_pattern.set(main_location="ABRI", physical_dimension="DS", filter_class="C"))
                             if channel is not None:
-                                return calculate_vc(channel)[1]
+                                return self.calculate_cached(calculate_vc, channel)[1]
                         else:
                             channel = self.get_channel(code_pattern.set(main_location="ABDO", physical_dimension="DS"))
                             if channel is not None:
-                                return calculate_vc(channel)[0]
+                                return self.calculate_cached(calculate_vc, channel)[0]
                             channel = self.get_channel(code_pattern.set(main_location="ABRI", physical_dimension="DS"))
                             if channel is not None:
-                                return calculate_vc(channel)[0]
+                                return self.calculate_cached(calculate_vc, channel)[0]
 
                         if code_pattern.fine_location_2 == "00":
                             if code_pattern.filter_class == "X":
@@ -1176,15 +1372,12 @@ class Isomme:
         channel_list = []
         for code_pattern in code_patterns:
             # 1. Channel does exist already
-            for channel in self.channels:
-                if fnmatch.fnmatch(channel.code, code_pattern):
-                    channel_list.append(channel)
+            channel_list += self.find_channels(code_pattern)
             # 2. Filter Channel
             if filter:
-                for channel in self.channels:
-                    if channel in channel_list:
-                        continue
-                    if fnmatch.fnmatch(channel.code, code_pattern[:-1] + "?"):
+                found_ids = {id(channel) for channel in channel_list}
+                for channel in self.find_channels(code_pattern[:-1] + "?"):
+                    if id(channel) not in found_ids:
                         channel_list.append(channel.cfc(code_pattern[-1]))
 
             try:
@@ -1239,8 +1432,7 @@ class Isomme:
         return self
 
     def cfc(self, *args, **kwargs) -> Isomme:
-        for channel in self.channels:
-            channel.cfc(*args, **kwargs, return_copy=False)
+        cfc_channels(self.channels, *args, **kwargs, return_copy=False)
         return self
 
     def scale_y(self, *args, **kwargs) -> Isomme:
@@ -1274,21 +1466,128 @@ class Isomme:
         return self
 
 
-def read(*paths, channel_code_patterns: list = None, recursive: bool = True, merge: bool = True) -> list[Isomme]:
+class ChannelLoader:
+    path: Path
+    xxx_path: str | None
+    archive: str | None
+    offset: int | None
+    size: int | None
+    content: bytes | None
+
+    def __init__(self, path: str | Path, xxx_path: str = None, archive: str = None, isomme: Isomme = None,
+                 offset: int = None, size: int = None, content: bytes = None):
+        """
+        Data loader of lazy loaded channel (see Isomme.read()).
+        Only the location of the channel file is stored, therefore channels can be pickled and copied.
+        The Isomme-object is referenced weakly and is not pickled.
+        Channel files and members of uncompressed tar files are memory-mapped, only the pages of the channel are read.
+        Members of compressed archives can not be accessed randomly, their content is kept (compressed with zlib).
+        :param path: path of channel file (.001/.002/...) or of archive
+        :param xxx_path: (only archive) path of channel file inside of archive
+        :param archive: None, "zip" or mode of tarfile (e.g. "r", "r:gz")
+        :param isomme: Isomme-object to resolve explicit reference channels and to limit number of loaded channels
+        :param offset: (only uncompressed tar) position of channel file inside of archive
+        :param size: (only uncompressed tar) size of channel file
+        :param content: content of channel file to keep in memory instead of reading it again
+        """
+        self.path = Path(path)
+        self.xxx_path = xxx_path
+        self.archive = archive
+        self.offset = offset
+        self.size = size
+        self.content = zlib.compress(content, 1) if content is not None else None
+        self.isomme_ref = weakref.ref(isomme) if isomme is not None else None
+
+    def get_isomme(self) -> Isomme | None:
+        """
+        :return: Isomme-object or None if not available (e.g. after pickling)
+        """
+        return self.isomme_ref() if self.isomme_ref is not None else None
+
+    def read(self) -> bytes:
+        """
+        Read content of channel file.
+        :return: content
+        """
+        if self.content is not None:
+            return zlib.decompress(self.content)
+        elif self.archive == "zip":
+            with zipfile.ZipFile(self.path, "r") as archive:
+                return archive.read(self.xxx_path)
+        elif self.archive is not None and self.offset is None:
+            with tarfile.open(self.path, self.archive) as tar_file:
+                return tar_file.extractfile(self.xxx_path).read()
+
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return b""
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                start = 0 if self.offset is None else self.offset
+                return mapped_file[start:len(mapped_file) if self.size is None else start + self.size]
+
+    def __call__(self, channel: Channel) -> pd.DataFrame:
+        """
+        Read data of channel.
+        :param channel: Channel-object
+        :return: data
+        """
+        logger.debug(f"Load data of {channel.code} from {self.path}")
+        isomme = self.get_isomme()
+        _, xxx_data = split_xxx(self.read())
+        data = parse_xxx_data(parse_xxx_values(xxx_data), channel.info, isomme=isomme)
+        if isomme is not None:
+            isomme.add_loaded_channel(channel)
+        return data
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["isomme_ref"] = None
+        return state
+
+    def __deepcopy__(self, memo):
+        # Keep reference only if Isomme-object is copied as well
+        loader = copy.copy(self)
+        loader.isomme_ref = None
+        isomme = memo.get(id(self.get_isomme()))
+        if isomme is not None:
+            loader.isomme_ref = weakref.ref(isomme)
+        return loader
+
+
+def read(*paths, channel_code_patterns: list = None, recursive: bool = True, merge: bool = True,
+         workers: int = None, max_in_flight: int = None, errors: dict = None, **kwargs) -> list[Isomme]:
+    """
+    Read multiple tests (see Isomme.read()).
+    :param paths: paths or glob patterns of tests
+    :param channel_code_patterns: only read channels matching any of the patterns
+    :param recursive: glob recursive
+    :param merge: merge tests with same test number and delete duplicate channels
+    :param workers: number of processes to read tests in parallel. None to read sequentially.
+    Also possible with lazy=True, data of channels is then loaded in this process on first access.
+    :param max_in_flight: (only workers) maximum number of tests submitted but not yet returned. Limits memory usage.
+    Default is 2 * workers.
+    :param errors: optional dict. Paths that could not be read are added as keys with the exception as value.
+    :param kwargs: passed to Isomme.read() (e.g. cache_dir)
+    :return: list of Isomme-objects in order of sorted paths
+    """
     all_paths = []
     for path in paths:
         all_paths += glob.glob(path, recursive=recursive)
-    all_paths = set(all_paths)
+    all_paths = sorted(set(all_paths))
 
     channel_code_patterns = [] if channel_code_patterns is None else channel_code_patterns
 
     iso_list = []
     with logging_redirect_tqdm():
-        for path in tqdm(all_paths, desc="Reading"):
-            try:
-                iso_list.append(Isomme().read(path, *channel_code_patterns))
-            except Exception as e:
-                logger.critical(e)
+        for path, result in tqdm(zip(all_paths, read_isommes(all_paths, channel_code_patterns, workers, max_in_flight, **kwargs)),
+                                 total=len(all_paths),
+                                 desc="Reading"):
+            if isinstance(result, Exception):
+                logger.critical(f"Could not read '{path}': {result!r}")
+                if errors is not None:
+                    errors[path] = result
+            else:
+                iso_list.append(result)
 
     if merge:
         iso_list = merge_duplicate_isommes(iso_list)
@@ -1297,6 +1596,52 @@ def read(*paths, channel_code_patterns: list = None, recursive: bool = True, mer
     return iso_list
 
 
+def read_isomme(path: str, channel_code_patterns: list, **kwargs) -> Isomme | Exception:
+    """
+    Read a single test. Exceptions are returned instead of raised.
+    :param path: path of test (see Isomme.read())
+    :param channel_code_patterns: only read channels matching any of the patterns
+    :param kwargs: passed to Isomme.read()
+    :return: Isomme-object or exception
+    """
+    try:
+        return Isomme().read(path, *channel_code_patterns, **kwargs)
+    except Exception as e:
+        return e
+
+
+def read_isommes(paths: list, channel_code_patterns: list, workers: int = None, max_in_flight: int = None, **kwargs):
+    """
+    Generator reading tests sequentially or in a process pool (see read()).
+    :param paths: paths of tests
+    :param channel_code_patterns: only read channels matching any of the patterns
+    :param workers: number of processes. None to read sequentially.
+    :param max_in_flight: maximum number of tests submitted but not yet returned. Default is 2 * workers.
+    :param kwargs: passed to Isomme.read()
+    :return: Isomme-object or exception for each path in order of paths
+    """
+    if workers is None:
+        for path in paths:
+            yield read_isomme(path, channel_code_patterns, **kwargs)
+        return
+
+    max_in_flight = 2 * workers if max_in_flight is None else max(max_in_flight, 1)
+    paths = iter(paths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = collections.deque()
+        for path in itertools.islice(paths, max_in_flight):
+            futures.append(executor.submit(read_isomme, path, channel_code_patterns, **kwargs))
+        while len(futures) > 0:
+            future = futures.popleft()
+            try:
+                result = future.result()
+            except Exception as e:  # e.g. worker crashed or result could not be pickled
+                result = e
+            for path in itertools.islice(paths, 1):
+                futures.append(executor.submit(read_isomme, path, channel_code_patterns, **kwargs))
+            yield result
+
+
 def merge_duplicate_isommes(isommes: list[Isomme]) -> list:
     isommes_dict = {}
     for isomme in isommes:
@@ -1305,3 +1650,13 @@ def merge_duplicate_isommes(isommes: list[Isomme]) -> list:
         else:
             isommes_dict[isomme.test_number] = isomme
     return isommes
+
+
+def get_output_versions(result) -> list:
+    """
+    Versions of channels returned by calculation function (see Isomme.calculate_cached()).
+    :param result: Channel or tuple/list of Channels (and other values)
+    :return: list of versions, None for other values
+    """
+    outputs = result if isinstance(result, (tuple, list)) else (result,)
+    return [output.version if isinstance(output, Channel) else None for output in outputs]
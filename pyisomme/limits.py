@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import fnmatch
+import functools
+import os
 import re
 from collections.abc import Iterable
 import logging
@@ -8,7 +9,8 @@ from typing import Callable
 import numpy as np
 
 from pyisomme import Channel, Code
-from pyisomme.unit import Unit
+from pyisomme.code import compile_code_pattern
+from pyisomme.unit import Unit, convert
 
 
 logger = logging.getLogger(__name__)
@@ -19,20 +21,30 @@ class Limit:
     rating: float
     color: str = "black"
     code_patterns: list[str]
-    func: Callable
+    limit_func: Callable
+    vectorized: bool | None
     x_unit: str | Unit
     y_unit: str | Unit
     lower: bool
     upper: bool
     rating: float
 
-    def __init__(self, code_patterns: list, func, color: str = None, linestyle: str = "-", name: str = None, rating: float = None, lower: bool = None, upper: bool = None, x_unit="s", y_unit=None):
+    def __init__(self, code_patterns: list, func, color: str = None, linestyle: str = "-", name: str = None, rating: float = None, lower: bool = None, upper: bool = None, x_unit="s", y_unit=None, vectorized: bool = None):
+        """
+        :param code_patterns: channel code patterns (fnmatch or regex)
+        :param func: limit function of x or constant value
+        :param vectorized: True if func can be evaluated for whole arrays at once (e.g. constants or np.interp corridors),
+        False to evaluate element by element. None to detect on first evaluation (see is_vectorized()).
+        """
         self.code_patterns: list = code_patterns
 
         if isinstance(func, int) or isinstance(func, float):
-            func = lambda x: func
+            constant = float(func)
+            func = lambda x: constant
+            vectorized = True
         assert func.__code__.co_argcount == 1
-        self.func = lambda x: float(func(x)) if not isinstance(x, Iterable) else np.array([func(x_i) for x_i in x], dtype=float)  # if x is scalar --> return scalar, if is array --> return array
+        self.limit_func = func
+        self.vectorized = vectorized
 
         if color is not None:
             self.color = color
@@ -46,11 +58,27 @@ class Limit:
         self.x_unit = x_unit
         self.y_unit = y_unit
 
+    def func(self, x) -> float | np.ndarray:
+        """
+        Evaluate limit function.
+        :param x: scalar or array
+        :return: float if x is scalar, array of same shape if x is array
+        """
+        if not isinstance(x, Iterable):
+            return float(self.limit_func(x))
+
+        x = np.asarray(x, dtype=float)
+        if self.vectorized is None and x.size > 0:
+            self.vectorized = is_vectorized(self.limit_func, x)
+        if self.vectorized:
+            return np.broadcast_to(np.asarray(self.limit_func(x), dtype=float), x.shape).copy()
+        return np.array([self.limit_func(x_i) for x_i in x], dtype=float)
+
     def get_data(self, x, x_unit, y_unit) -> float | np.ndarray:
         # Convert x
         if x_unit is not None:
             if self.x_unit is not None:
-                x = x * Unit(x_unit).to(Unit(self.x_unit))
+                x = convert(x, x_unit, self.x_unit)
             else:
                 logger.warning(f"Could not convert unit of {self}. Attribute x_unit missing.")
 
@@ -60,7 +88,7 @@ class Limit:
         # Convert y
         if y_unit is not None:
             if self.y_unit is not None:
-                y *= Unit(self.y_unit).to(Unit(y_unit))
+                y = convert(y, self.y_unit, y_unit)
             else:
                 logger.warning(f"Could not convert unit of {self}. Attribute y_unit missing.")
         return y
@@ -82,48 +110,59 @@ class Limits:
     def __init__(self, name: str = None, limit_list: list = None):
         self.name = name
         self.limit_list = [] if limit_list is None else limit_list
+        self.limit_index = LimitIndex()
 
     def find_limits(self, *codes: Code | str) -> list:
         """
         Returns list of limits matching given code.
         :param codes: Channel code (pattern not allowed)
-        :return:
+        :return: list of limits (each limit only once, in order of limit_list)
         """
-        output = []
-        for limit in self.limit_list:
-            for code in codes:
-                if code is None:
-                    continue
-                for code_pattern in limit.code_patterns:
-                    if fnmatch.fnmatch(code, code_pattern):
-                        output.append(limit)
-                    try:
-                        if re.match(code_pattern, code):
-                            output.append(limit)
-                    except re.error:
-                        continue
-        return output
+        self.limit_index.update(self.limit_list)
+        indices = set()
+        for code in codes:
+            if code is None:
+                continue
+            indices.update(self.limit_index.find(code))
+        return [self.limit_list[idx] for idx in sorted(indices)]
 
-    def get_limits(self, channel: Channel) -> list[Limit]:
-        limits = limit_list_sort(self.find_limits(channel.code))
-        assert len(limits) > 0, "No limits found."
+    def get_limit_data(self, channel: Channel, limits: list[Limit]) -> np.ndarray:
+        """
+        Evaluate limits over the whole time array of the channel.
+        :param channel: Channel-object
+        :param limits: list of limits
+        :return: array with shape (number of limits, number of samples) in unit of channel
+        """
+        channel_times = channel.get_time()
+        limit_data = np.empty((len(limits), len(channel_times)))
+        for idx, limit in enumerate(limits):
+            limit_data[idx] = limit.get_data(channel_times, x_unit="s", y_unit=channel.unit)
+        return limit_data
 
-        channel_times = channel.data.index
+    def get_limit_indices(self, channel: Channel, limits: list[Limit], limit_data: np.ndarray) -> np.ndarray:
+        """
+        Index of the closest limit in direction of its bound (upper/lower) for each sample.
+        :param channel: Channel-object
+        :param limits: list of limits
+        :param limit_data: see get_limit_data()
+        :return: array of indices into limits
+        """
         channel_values = channel.get_data()
-
-        limit_data = np.array([limit.get_data(channel_times, x_unit="s", y_unit=channel.unit) for limit in limits])
-        limit_matching = np.zeros_like(limit_data, dtype=bool)
-
-        for idx, (limit, data) in enumerate(zip(limits, limit_data)):
-            limit_matching[idx, :] = (channel_values == data) + ((limit.upper is True) * (channel_values < data)) + ((limit.lower is True) * (channel_values > data))
+        upper = np.array([limit.upper is True for limit in limits])[:, np.newaxis]
+        lower = np.array([limit.lower is True for limit in limits])[:, np.newaxis]
+        limit_matching = (channel_values == limit_data) | (upper & (channel_values < limit_data)) | (lower & (channel_values > limit_data))
 
         diff = np.abs(limit_data - channel_values)
         diff[~limit_matching] = np.inf
+        return np.argmin(diff, axis=0)
 
-        limit_idx = np.argmin(diff, axis=0)
-        limit_list = list(np.array(limits)[limit_idx])
+    def get_limits(self, channel: Channel) -> list[Limit]:
+        limits = limit_list_sort(self.find_limits(channel.code))
+        assert len(limits) > 0, "No limits found."
 
-        return limit_list
+        limit_data = self.get_limit_data(channel, limits)
+        limit_idx = self.get_limit_indices(channel, limits, limit_data)
+        return [limits[idx] for idx in limit_idx]
 
     def get_limit_max(self, channel: Channel) -> Limit:
         limits = self.get_limits(channel)
@@ -135,31 +174,29 @@ class Limits:
         limit_ratings = self.get_limit_max_rating(channel, interpolate=True)
         return limits[np.nanargmin(limit_ratings)]
 
-    def get_limit_ratings(self, channel: Channel, interpolate=True) -> list:
+    def get_limit_ratings(self, channel: Channel, interpolate=True) -> np.ndarray:
+        """
+        Rating for each sample of the channel.
+        :param channel: Channel-object
+        :param interpolate: interpolate linearly between ratings of neighbouring limits.
+        Otherwise, use rating of first limit (sorted) which is not exceeded. Samples without such limit are omitted.
+        :return: array of ratings
+        """
         limits = limit_list_sort(self.find_limits(channel.code))
         assert len(limits) > 0, "No limits found."
         assert None not in [limit.rating for limit in limits], "All limits must have a value defined."
 
-        channel_times = channel.data.index
         channel_values = channel.get_data()
+        limit_data = self.get_limit_data(channel, limits)
+        ratings = np.array([limit.rating for limit in limits], dtype=float)
 
         if interpolate:
-            limit_ratings = []
-            limit_data = {limit: limit.get_data(channel_times, x_unit="s", y_unit=channel.unit) for limit in limits}
-            for idx, (channel_time, channel_value) in enumerate(zip(channel_times, channel_values)):
-                limit_ratings.append(np.interp(channel_value, [limit_data[limit][idx] for limit in limits], [limit.rating for limit in limits]))
+            return interp_columns(channel_values, limit_data, ratings)
         else:
-            limit_ratings = []
-            limit_data = {limit: limit.get_data(channel_times, x_unit="s", y_unit=channel.unit) for limit in limits}
-            for idx, (channel_time, channel_value) in enumerate(zip(channel_times, channel_values)):
-                for limit, data in limit_data.items():
-                    if limit.upper and channel_value < data[idx]:
-                        limit_ratings.append(limit.rating)
-                        break
-                    if limit.lower and channel_value >= data[idx]:
-                        limit_ratings.append(limit.rating)
-                        break
-        return limit_ratings
+            upper = np.array([bool(limit.upper) for limit in limits])[:, np.newaxis]
+            lower = np.array([bool(limit.lower) for limit in limits])[:, np.newaxis]
+            limit_matching = (upper & (channel_values < limit_data)) | (lower & (channel_values >= limit_data))
+            return ratings[np.argmax(limit_matching, axis=0)[np.any(limit_matching, axis=0)]]
 
     def get_limit_max_rating(self, channel: Channel, interpolate=True) -> float:
         return np.nanmax(self.get_limit_ratings(channel, interpolate))
@@ -181,30 +218,28 @@ class Limits:
         return limit_colors[np.nanargmax(limit_ratings)]
 
     def get_limit_min_idx(self, channel: Channel) -> int:
-        limit_ratings = np.array(self.get_limit_ratings(channel, interpolate=True))
+        limit_ratings = self.get_limit_ratings(channel, interpolate=True)
         idx_candidates = np.nonzero(np.min(limit_ratings) == limit_ratings)[0]
+        return idx_candidates[np.argmin(self.get_limit_diff(channel)[idx_candidates])]
 
-        limits = self.get_limits(channel)
-        limit_values = np.array([limit.get_data(x=t, x_unit="s", y_unit=channel.unit) for t, limit in zip(channel.data.index, limits)])
-
-        diff = np.abs(channel.get_data() - limit_values)
-        return idx_candidates[np.argmin(diff[idx_candidates])]
-
-    def get_limit_max_idx(self, channel: Channel):
-        limit_ratings = np.array(self.get_limit_ratings(channel, interpolate=True))
+    def get_limit_max_idx(self, channel: Channel) -> int:
+        limit_ratings = self.get_limit_ratings(channel, interpolate=True)
         idx_candidates = np.nonzero(np.max(limit_ratings) == limit_ratings)[0]
+        return idx_candidates[np.argmin(self.get_limit_diff(channel)[idx_candidates])]
 
-        limits = self.get_limits(channel)
-        limit_values = np.array([limit.get_data(x=t, x_unit="s", y_unit=channel.unit) for t, limit in zip(channel.data.index, limits)])
-
-        diff = np.abs(channel.get_data() - limit_values)
-        return idx_candidates[np.argmin(diff[idx_candidates])]
+    def get_limit_diff(self, channel: Channel) -> np.ndarray:
+        """
+        Absolute distance of each sample to its limit (see get_limits()).
+        :param channel: Channel-object
+        :return: array of distances in unit of channel
+        """
+        limits = limit_list_sort(self.find_limits(channel.code))
+        assert len(limits) > 0, "No limits found."
 
-        idx1 = np.nanargmin([diff_limits_higher_rating_min_max, diff_limits_lower_rating_min_min])
-        if idx1 == 0:
-            return idx_candidates[np.nanargmin(diff_limits_higher_rating_min[idx_candidates])]
-        else:
-            return idx_candidates[np.nanargmax(diff_limits_lower_rating_min[idx_candidates])]
+        limit_data = self.get_limit_data(channel, limits)
+        limit_idx = self.get_limit_indices(channel, limits, limit_data)
+        limit_values = limit_data[limit_idx, np.arange(limit_data.shape[1])]
+        return np.abs(channel.get_data() - limit_values)
 
     def get_limit_min_y(self, channel: Channel, unit=None) -> float:
         idx = self.get_limit_min_idx(channel)
@@ -216,16 +251,81 @@ class Limits:
 
     def get_limit_min_x(self, channel: Channel) -> float:
         idx = self.get_limit_min_idx(channel)
-        return channel.data.index[idx]
+        return channel.get_time()[idx]
 
     def get_limit_max_x(self, channel: Channel) -> float:
         idx = self.get_limit_max_idx(channel)
-        return channel.data.index[idx]
+        return channel.get_time()[idx]
 
     def __repr__(self):
         return f"Limits({self.name})"
 
 
+class LimitIndex:
+    """
+    Index of a list of limits to find the limits matching a channel code.
+    The code patterns of each limit are compiled once (as fnmatch-pattern and as regular expression). Results are
+    memoized per code until the list of limits changes.
+    """
+    def __init__(self, limit_list: list = None):
+        self.limit_list = []
+        self.patterns = []
+        self.results = {}
+        self.extend([] if limit_list is None else limit_list)
+
+    def extend(self, limit_list: list) -> LimitIndex:
+        """
+        Append limits to index.
+        :param limit_list: list of limits
+        :return: self
+        """
+        for limit in limit_list:
+            self.limit_list.append(limit)
+            self.patterns.append([compile_limit_pattern(code_pattern) for code_pattern in limit.code_patterns])
+        self.results.clear()
+        return self
+
+    def update(self, limit_list: list) -> LimitIndex:
+        """
+        Update index to given list of limits. Index is extended if limits were only appended, otherwise rebuilt.
+        :param limit_list: list of limits
+        :return: self
+        """
+        n = len(self.limit_list)
+        if limit_list[:n] == self.limit_list:
+            if len(limit_list) > n:
+                self.extend(limit_list[n:])
+        else:
+            self.__init__(limit_list)
+        return self
+
+    def find(self, code: str) -> tuple:
+        """
+        Find limits with any code pattern matching the code (fnmatch or regular expression).
+        :param code: channel code
+        :return: tuple of indices (ascending) of matching limits
+        """
+        if code not in self.results:
+            normcase_code = os.path.normcase(code)
+            self.results[code] = tuple(idx for idx, patterns in enumerate(self.patterns)
+                                       if any(fnmatch_match(normcase_code) is not None or (re_match is not None and re_match(code) is not None)
+                                              for fnmatch_match, re_match in patterns))
+        return self.results[code]
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_limit_pattern(code_pattern: str) -> tuple:
+    """
+    :param code_pattern: code pattern of limit
+    :return: match-functions of pattern as fnmatch-pattern (for normcased codes) and as regular expression (None if invalid)
+    """
+    try:
+        re_match = re.compile(code_pattern).match
+    except re.error:
+        re_match = None
+    return compile_code_pattern(os.path.normcase(code_pattern)), re_match
+
+
 def limit_list_sort(limit_list: list[Limit], sym=False) -> list:
     if sym:
         return sorted(limit_list, key=lambda limit: (np.abs(limit.func(0)), -1 if limit.upper and limit.func(0) >= 0 else 1 if limit.lower and limit.func(0) >= 0 else 1 if limit.upper and limit.func(0) < 0 else -1 if limit.lower and limit.func(0) < 0 else 0))
@@ -233,6 +333,53 @@ def limit_list_sort(limit_list: list[Limit], sym=False) -> list:
         return sorted(limit_list, key=lambda limit: (limit.func(0), -1 if limit.upper else 1 if limit.lower else 0))
 
 
+def is_vectorized(func: Callable, x: np.ndarray) -> bool:
+    """
+    Check if function can be evaluated for a whole array at once (e.g. constants or np.interp corridors).
+    The result must be a scalar or an array of the same shape and match the element-wise evaluation at the first and last element.
+    :param func: function of one argument
+    :param x: non-empty array
+    :return: True if vectorizable
+    """
+    try:
+        y = np.broadcast_to(np.asarray(func(x), dtype=float), x.shape)
+        return all(np.array_equal(y.flat[idx], float(func(x.flat[idx])), equal_nan=True) for idx in (0, -1))
+    except (TypeError, ValueError):
+        return False
+
+
+def interp_columns(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    Same as np.interp(x[i], xp[:, i], fp) for each column i, but evaluated for all columns at once.
+    Falls back to np.interp per column if a column of xp is not sorted in ascending order.
+    :param x: array with shape (n,)
+    :param xp: array with shape (m, n)
+    :param fp: array with shape (m,)
+    :return: array with shape (n,)
+    """
+    x = np.asarray(x, dtype=float)
+    if xp.shape[0] == 1:
+        return np.full(x.shape, fp[0], dtype=float)
+    if not np.all(xp[1:] >= xp[:-1]):
+        return np.array([np.interp(x_i, xp_i, fp) for x_i, xp_i in zip(x, xp.T)], dtype=float)
+
+    columns = np.arange(len(x))
+    j = np.sum(xp <= x, axis=0) - 1
+    j_left = np.clip(j, 0, len(fp) - 2)
+    xp_left, xp_right = xp[j_left, columns], xp[j_left + 1, columns]
+    fp_left, fp_right = fp[j_left], fp[j_left + 1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (fp_right - fp_left) / (xp_right - xp_left)
+        y = slope * (x - xp_left) + fp_left
+        y = np.where(np.isnan(y), slope * (x - xp_right) + fp_right, y)
+    y = np.where(np.isnan(y) & (fp_left == fp_right), fp_left, y)
+    y = np.where(xp_left == x, fp_left, y)
+    y = np.where(j == len(fp) - 1, fp[-1], y)
+    y = np.where(j == -1, fp[0], y)
+    return np.where(np.isnan(x), x, y)
+
+
 def limit_list_unique(limit_list: list[Limit],
                       x,
                       x_unit,
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from pyisomme.channel import Channel
 from pyisomme.info import Info
 
@@ -6,10 +8,13 @@ from datetime import datetime
 import numpy as np
 import pandas as pd
 import re
+from typing import IO
 
 
 logger = logging.getLogger(__name__)
 
+LINE_BREAK = re.compile(rb"\r\n|\r|\n")  # line boundaries of str.splitlines() used in channel files
+
 
 def parse_mme(text: str) -> Info:
     lines = text.splitlines()
@@ -33,8 +38,51 @@ def parse_chn(text: str) -> Info:
     return parse_mme(text)
 
 
-def parse_xxx(text: str, isomme) -> Channel:
-    lines = text.splitlines()
+def parse_xxx(content: str | bytes, isomme) -> Channel:
+    info, array = parse_xxx_content(content)
+    return Channel(info.get("Channel code"),
+                   parse_xxx_data(array, info, isomme),
+                   unit=info.get("Unit"),
+                   info=info)
+
+
+def parse_xxx_content(content: str | bytes) -> tuple[Info, np.ndarray]:
+    """
+    Parse channel file (.001/.002/...) into info and values without creating the time index.
+    Does not depend on other channels, therefore suitable for parallel parsing.
+    :param content: content of channel file
+    :return: channel info and values
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    header, data = split_xxx(content)
+    info, _ = parse_xxx_info(decode(header).splitlines())
+    return info, parse_xxx_values(data)
+
+
+def split_xxx(content: bytes) -> tuple[bytes, bytes]:
+    """
+    Split content of channel file (.001/.002/...) into header and data section without decoding the data.
+    :param content: content of channel file
+    :return: header and data section
+    """
+    pos = 0
+    while pos < len(content):
+        line_break = LINE_BREAK.search(content, pos)
+        end = len(content) if line_break is None else line_break.end()
+        line = content[pos:end].strip()
+        if line != b"" and re.fullmatch(rb"([^:]*\S+)\s*:(.*)", line) is None:
+            break
+        pos = end
+    return content[:pos], content[pos:]
+
+
+def parse_xxx_info(lines: list) -> tuple[Info, int]:
+    """
+    Parse header of channel file (.001/.002/...).
+    :param lines: lines of channel file
+    :return: channel info and index of first data line
+    """
     info = Info([])
     start_data_idx = 0
     for idx, line in enumerate(lines):
@@ -49,14 +97,60 @@ def parse_xxx(text: str, isomme) -> Channel:
         else:
             name, value = match.groups()
             info[name] = get_value(value)
+    return info, start_data_idx
 
-    code = info.get("Channel code")
-    unit = info.get("Unit")
 
-    # data
-    array_str = np.array(lines[start_data_idx:])
+def read_xxx_info(xxx_file: IO[bytes]) -> Info:
+    """
+    Read only the header of a channel file. Data lines are not read.
+    :param xxx_file: channel file opened in binary mode
+    :return: channel info
+    """
+    header = b""
+    for line in xxx_file:
+        if b"\r" in line.rstrip(b"\r\n"):  # CR-only line endings, file is not split into lines
+            return parse_xxx_info(decode(header + split_xxx(line + xxx_file.read())[0]).splitlines())[0]
+        if line.strip() != b"" and re.fullmatch(rb"([^:]*\S+)\s*:(.*)", line.strip()) is None:
+            break
+        header += line
+    return parse_xxx_info(decode(header).splitlines())[0]
+
+
+def parse_xxx_values(data: bytes) -> np.ndarray:
+    """
+    Convert data section of channel file (one value per line) to float array. "NOVALUE" is converted to NaN.
+    The values are parsed directly from bytes. Only if this fails, the data is parsed line by line.
+    :param data: data section of channel file (see split_xxx())
+    :return: array
+    """
+    values = data.replace(b"NOVALUE", b"nan").strip()
+    if values == b"":
+        return np.array([], dtype=float)
+
+    # Parsing stops at first invalid value --> check number of values and last value
+    array = np.fromstring(values, sep=" ")
+    try:
+        last_value = float(values.rsplit(maxsplit=1)[-1])
+    except ValueError:
+        last_value = None
+    if last_value is not None and len(array) != 0 and (array[-1] == last_value or np.isnan(array[-1]) and np.isnan(last_value)):
+        if len(array) == values.count(b"\n") + 1 or len(array) == len(values.split()):
+            return array
+
+    array_str = np.array(decode(data).splitlines())
     array_str[array_str == "NOVALUE"] = np.nan
-    array = np.array(array_str, dtype=float)
+    return np.array(array_str, dtype=float)
+
+
+def parse_xxx_data(array: np.ndarray, info: Info, isomme) -> pd.DataFrame:
+    """
+    Create DataFrame with time as index from values of channel file (.001/.002/...).
+    :param array: values of channel file (see parse_xxx_values())
+    :param info: channel info (see parse_xxx_info())
+    :param isomme: Isomme-object to find explicit reference channel
+    :return: DataFrame with time as index
+    """
+    code = info.get("Channel code")
 
     reference_channel_code = info.get("Reference channel name")
     time_of_first_sample = info.get("Time of first sample")
@@ -70,52 +164,69 @@ def parse_xxx(text: str, isomme) -> Channel:
         else:
             n = len(array)
             time_array = np.linspace(time_of_first_sample, time_of_first_sample + (n-1) * sampling_interval, n)
-            return Channel(code, pd.DataFrame(array, index=time_array), unit=unit, info=info)
+            return pd.DataFrame(array, index=time_array)
 
     elif info.get("Reference channel") == "explicit":
         if reference_channel_code is None:
             logger.error(f"[{code}] Reference channel name not found.")
         else:
-            reference_channel = isomme.get_channel(reference_channel_code)
+            reference_channel = isomme.get_channel(reference_channel_code) if isomme is not None else None
             if reference_channel is None:
                 logger.error(f"[{code}] Reference channel {reference_channel_code} not found.")
             else:
-                return Channel(code=code,
-                               data=pd.DataFrame(array, index=reference_channel.get_data()),
-                               unit=unit,
-                               info=info)
+                return pd.DataFrame(array, index=reference_channel.get_data())
 
     elif time_of_first_sample is not None and sampling_interval is not None:
         logger.info(f"[{code}] Assume 'Reference channel' = 'implicit'")
 
         n = len(array)
         time_array = np.linspace(time_of_first_sample, n * sampling_interval, n)
-        return Channel(code, pd.DataFrame(array, index=time_array), unit=unit, info=info)
+        return pd.DataFrame(array, index=time_array)
 
     elif sampling_interval is not None:
         logger.info(f"[{code}] Assume 'Time of first sample' = 0")
 
         n = len(array)
         time_array = np.linspace(0, n * sampling_interval, n)
-        return Channel(code, pd.DataFrame(array, index=time_array), unit=unit, info=info)
+        return pd.DataFrame(array, index=time_array)
 
     elif reference_channel_code is not None:
         logger.info(f"[{code}] Assume 'Reference channel' = 'explicit'")
 
-        reference_channel = isomme.get_channel(reference_channel_code)
+        reference_channel = isomme.get_channel(reference_channel_code) if isomme is not None else None
         if reference_channel is None:
             logger.error(f"[{code}] Reference channel not found.")
         else:
-            return Channel(code=code,
-                           data=pd.DataFrame(array, index=reference_channel.get_data()),
-                           unit=unit,
-                           info=info)
+            return pd.DataFrame(array, index=reference_channel.get_data())
     if code[2:6] != "TIRS":
         logger.warning(f"[{code}] Reference channel type [implicit/explicit] unknown. Could not set index.")
 
     data = pd.DataFrame(array)
     data = data[~data.index.duplicated(keep='first')].sort_index()
-    return Channel(code, data, unit=unit, info=info)
+    return data
+
+
+def is_explicit_reference(info: Info) -> bool:
+    """
+    Check if time array of channel is given by another channel (see parse_xxx_data()).
+    :param info: channel info
+    :return: True if reference channel is needed
+    """
+    if info.get("Reference channel") in ("implicit", "explicit"):
+        return info.get("Reference channel") == "explicit"
+    return info.get("Sampling interval") is None and info.get("Reference channel name") is not None
+
+
+def decode(content: bytes) -> str:
+    """
+    Decode file content. UTF-8 with fallback to ISO-8859-1.
+    :param content: bytes
+    :return: str
+    """
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content.decode("iso-8859-1")
 
 
 def get_value(text: str):
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from pyisomme.limits import Limits, limit_list_unique, limit_list_sort
+from pyisomme.limits import Limit, Limits, limit_list_unique, limit_list_sort
 from pyisomme.channel import Channel
 from pyisomme.code import combine_codes
 from pyisomme.isomme import Isomme
 
-import copy
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import numpy as np
+import pandas as pd
 import logging
+import io
+import hashlib
+import collections
 
 
 logger = logging.getLogger(__name__)
@@ -35,6 +38,22 @@ class Plot:
         plt.show(*args, **kwargs)
         return self
 
+    def render(self, close: bool = True) -> bytes:
+        """
+        Render figure to PNG (see render_figure()).
+        :param close: close figure afterwards, it can not be shown or rendered again
+        :return: PNG image
+        """
+        return render_figure(self.fig, close=close)
+
+    def close(self):
+        """
+        Close figure. Figures are kept by pyplot until they are closed.
+        :return: self
+        """
+        plt.close(self.fig)
+        return self
+
 
 class Plot_Line(Plot):
     isomme_list: list[Isomme]
@@ -43,6 +62,7 @@ class Plot_Line(Plot):
     sharey: bool | str
     limits: dict[Isomme, Limits] | None = None
     legend: bool = True
+    max_points: int | None = None
 
     def __init__(self,
                  channels: dict[Isomme, list[list[Channel | str]]],
@@ -54,7 +74,12 @@ class Plot_Line(Plot):
                  sharey: bool = False,
                  figsize: tuple = (10, 10),
                  legend: bool = None,
-                 limits: Limits | dict[Isomme, Limits] = None):
+                 limits: Limits | dict[Isomme, Limits] = None,
+                 max_points: int = None):
+        """
+        :param max_points: maximum number of points per line. Longer channels are reduced while preserving their
+        envelope and peaks (see decimate_min_max()). None to plot all samples.
+        """
         super().__init__(figsize=figsize, nrows=nrows, ncols=ncols)
 
         self.isomme_list = list(channels.keys())
@@ -82,6 +107,9 @@ class Plot_Line(Plot):
         if legend is not None:
             self.legend = legend
 
+        if max_points is not None:
+            self.max_points = max_points
+
         self.fig = self.plot()
 
     def plot(self) -> plt.Figure:
@@ -154,11 +182,17 @@ class Plot_Line(Plot):
 
                     logger.debug(f"Plotting {isomme} {channel}")
 
-                    data = copy.deepcopy(channel.convert_unit(y_units[ax]).data)
-                    data.index *= 1000  # convert to ms
-                    data = data.truncate(before=self.xlim[0] if self.xlim is not None else None,
-                                         after=self.xlim[1] if self.xlim is not None else None)
-                    ax.plot(data,
+                    # Crop and decimate arrays first, channel is not modified
+                    time_array = channel.get_time() * 1000  # convert to ms
+                    value_array = channel.get_data(unit=y_units[ax])
+                    if self.xlim is not None:
+                        start = np.searchsorted(time_array, self.xlim[0], side="left") if self.xlim[0] is not None else 0
+                        end = np.searchsorted(time_array, self.xlim[1], side="right") if self.xlim[1] is not None else len(time_array)
+                        time_array, value_array = time_array[start:end], value_array[start:end]
+                    if self.max_points is not None:
+                        indices = get_min_max_indices(value_array, self.max_points)
+                        time_array, value_array = time_array[indices], value_array[indices]
+                    ax.plot(time_array, value_array,
                             c=self.colors[idx_isomme % len(self.colors)],
                             label=isomme.test_number if len(channels) <= 1 else f"{isomme.test_number} {channel.code}",
                             ls=self.linestyles[idx2 % len(self.linestyles)])
@@ -356,7 +390,8 @@ class Plot_Line_Table(Plot_Line, Plot_Table):
                  col_labels_fontweight: str = None,
                  nrows: int = None,
                  ncols: int = None,
-                 figsize: tuple = (10, 10)):
+                 figsize: tuple = (10, 10),
+                 max_points: int = None):
         Plot.__init__(self, figsize=figsize, nrows=nrows, ncols=ncols)
 
         # Line
@@ -382,6 +417,9 @@ class Plot_Line_Table(Plot_Line, Plot_Table):
         elif isinstance(limits, Limits):
             self.limits = {isomme: limits for isomme in self.isomme_list}
 
+        if max_points is not None:
+            self.max_points = max_points
+
         # Table
         self.cell_texts = cell_texts
         self.row_labels = row_labels
@@ -424,3 +462,141 @@ class Plot_Line_Table(Plot_Line, Plot_Table):
         self.plot_tables(axs_tables)
 
         return fig
+
+
+def decimate_min_max(data: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    Reduce number of samples for plotting while preserving the envelope. Samples are divided into max_points // 2
+    buckets of consecutive samples. Of each bucket the samples with minimum and maximum value are kept, therefore peaks
+    are plotted exactly as long as each bucket is at most one pixel wide.
+    :param data: DataFrame with time as index (one column per line)
+    :param max_points: maximum number of samples (first and last sample are kept additionally)
+    :return: DataFrame with subset of samples in original order or data if it has max_points samples or fewer
+    """
+    if len(data) <= max_points:
+        return data
+    return data.iloc[get_min_max_indices(data.to_numpy(), max_points)]
+
+
+def get_min_max_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Indices of samples kept by decimate_min_max().
+    :param values: samples (one column per line if 2-dimensional)
+    :param max_points: maximum number of samples (first and last sample are kept additionally)
+    :return: sorted indices, all indices if values has max_points samples or fewer
+    """
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    n_buckets = max(max_points // 2, 1)
+    bucket_size = -(-n // n_buckets)
+    values = np.asarray(values).reshape(n, -1)
+    values = np.pad(values, ((0, n_buckets * bucket_size - n), (0, 0)), mode="edge")
+    values = values.reshape(n_buckets, bucket_size, -1)
+    offsets = np.arange(n_buckets)[:, np.newaxis] * bucket_size
+    indices = np.concatenate([[0, n - 1],
+                              (np.argmin(values, axis=1) + offsets).ravel(),
+                              (np.argmax(values, axis=1) + offsets).ravel()])
+    return np.unique(np.minimum(indices, n - 1))
+
+
+def render_figure(fig: plt.Figure, close: bool = True) -> bytes:
+    """
+    Render figure to PNG with transparent background and tight bounding box.
+    :param fig: Figure-object
+    :param close: close figure afterwards. Figures created by pyplot are kept (memory) until they are closed.
+    :return: PNG image
+    """
+    image_steam = io.BytesIO()
+    fig.savefig(image_steam, transparent=True, bbox_inches='tight')
+    if close:
+        plt.close(fig)
+    return image_steam.getvalue()
+
+
+def get_plot_channels(channels: dict[Isomme, list[list[Channel | str]]]) -> dict[Isomme, list[list[Channel]]]:
+    """
+    Replace channel codes with channels (see Isomme.get_channel()) like Plot_Line does, without modifying channels.
+    :param channels: channels or channel codes per test and axis
+    :return: channels per test and axis
+    """
+    return {isomme: [[isomme.get_channel(channel) if isinstance(channel, str) else channel for channel in channel_ax_list]
+                     for channel_ax_list in channel_list]
+            for isomme, channel_list in channels.items()}
+
+
+def get_content_key(obj):
+    """
+    Hashable key describing the content of plot parameters (see Image_Cache).
+    Channels are described by code, unit, info and a digest of their data, tests by their test number, limits by their
+    attributes and limit function (by identity). Other objects are used as they are, e.g. numbers and strings.
+    :param obj: plot parameter, e.g. Channel, dict[Isomme, list[list[Channel]]], Limits, ...
+    :return: nested tuple
+    """
+    if isinstance(obj, Channel):
+        data_hash = hashlib.sha1(np.ascontiguousarray(obj.data.index.values).tobytes())
+        data_hash.update(np.ascontiguousarray(obj.data.values).tobytes())
+        return "Channel", str(obj.code), str(obj.unit), get_content_key(list(obj.info)), data_hash.hexdigest()
+    if isinstance(obj, Isomme):
+        return "Isomme", obj.test_number
+    if isinstance(obj, Limits):
+        return "Limits", get_content_key(obj.limit_list)
+    if isinstance(obj, Limit):
+        return ("Limit", obj.name, obj.color, obj.linestyle, getattr(obj, "rating", None), obj.lower, obj.upper,
+                str(obj.x_unit), str(obj.y_unit), get_content_key(obj.code_patterns), obj.limit_func)
+    if isinstance(obj, dict):
+        return "dict", tuple((get_content_key(key), get_content_key(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return tuple(get_content_key(value) for value in obj)
+    if isinstance(obj, np.ndarray):
+        return "ndarray", obj.dtype.str, obj.shape, hashlib.sha1(np.ascontiguousarray(obj).tobytes()).hexdigest()
+    if isinstance(obj, float):
+        return "float", repr(obj)  # nan != nan
+    return obj
+
+
+class Image_Cache:
+    """
+    Least recently used cache of rendered images (e.g. pages of reports, see Report.export_pptx()).
+    Keys should describe the content of the image (see get_content_key()).
+    """
+    max_size: int
+    size: int
+
+    def __init__(self, max_size: int = 256 * 2**20):
+        """
+        :param max_size: maximum size of all images in bytes
+        """
+        self.max_size = max_size
+        self.size = 0
+        self.images = collections.OrderedDict()
+
+    def get(self, key) -> bytes | None:
+        """
+        :param key: hashable key
+        :return: image or None if not cached
+        """
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+        return image
+
+    def set(self, key, image: bytes) -> None:
+        """
+        Add image and remove least recently used images if maximum size is exceeded.
+        :param key: hashable key
+        :param image: image
+        """
+        if key in self.images:
+            self.size -= len(self.images.pop(key))
+        self.images[key] = image
+        self.size += len(image)
+        while self.size > self.max_size and len(self.images) > 0:
+            self.size -= len(self.images.popitem(last=False)[1])
+
+    def clear(self) -> None:
+        self.images.clear()
+        self.size = 0
+
+    def __len__(self):
+        return len(self.images)
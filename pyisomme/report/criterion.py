@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pyisomme.isomme import Isomme
 from pyisomme.channel import Channel
+from pyisomme.unit import Unit
 from pyisomme.limits import Limit, Limits
 
 import numpy as np
@@ -43,6 +44,40 @@ class Criterion:
     def calculation(self) -> None:
         pass
 
+    def get_results(self) -> dict:
+        """
+        Attributes of this criterion and its subcriteria except report, isomme and limits (e.g. value, rating, color,
+        status). Used to transfer results of calculation from other processes (see Report.calculate()).
+        Channels of the test are transferred by code and unit, derived channels with their data (see Channel_Reference).
+        :return: dict with attribute names as keys, results of subcriteria as nested dicts
+        """
+        results = {}
+        for key, value in self.__dict__.items():
+            if key in ("report", "isomme", "limits"):
+                continue
+            if isinstance(value, Criterion):
+                results[key] = value.get_results()
+            elif isinstance(value, Channel):
+                results[key] = Channel_Reference(value, self.isomme)
+            else:
+                results[key] = value
+        return results
+
+    def set_results(self, results: dict) -> None:
+        """
+        Set attributes of this criterion and its subcriteria (see get_results()).
+        Channels are taken from the test of this criterion or added to its derived channels (see
+        Channel_Reference.get_channel()).
+        :param results: dict with attribute names as keys, results of subcriteria as nested dicts
+        """
+        for key, value in results.items():
+            if isinstance(getattr(self, key, None), Criterion):
+                getattr(self, key).set_results(value)
+            elif isinstance(value, Channel_Reference):
+                setattr(self, key, value.get_channel(self.isomme))
+            else:
+                setattr(self, key, value)
+
     def __repr__(self):
         return f"Criterion({self.name})"
 
@@ -70,3 +105,41 @@ class Criterion:
                     subcriteria.append(subcriterion)
                 subcriteria += subcriterion.get_subcriteria(criterion_type)
         return subcriteria
+
+
+class Channel_Reference:
+    code: str
+    unit: Unit
+    channel: Channel | None = None
+    entries: list | None = None
+
+    def __init__(self, channel: Channel, isomme: Isomme = None):
+        """
+        Code and unit of a channel used by a criterion. Transferred instead of the channel from other processes (see
+        Criterion.get_results()). Channels not contained in the test (filtered or calculated by Isomme.get_channel())
+        are transferred with their data and cache entries, so that they are not created again.
+        :param channel: Channel-object
+        :param isomme: Isomme-object the channel was taken from
+        """
+        self.code = str(channel.code)
+        self.unit = channel.unit
+        if isomme is not None and not any(channel is c for c in isomme.channels):
+            self.channel = channel
+            self.entries = isomme.get_derived_channel_entries(channel)
+
+    def get_channel(self, isomme: Isomme) -> Channel | None:
+        """
+        Get channel from test (including filtering and calculation, see Isomme.get_channel()) in unit of criterion.
+        Transferred derived channels are added to the derived channels of the test instead (see
+        Isomme.add_derived_channel()).
+        :param isomme: Isomme-object
+        :return: Channel-object or None if not found
+        """
+        if self.channel is not None:
+            isomme.add_derived_channel(self.channel, self.entries)
+            return self.channel
+        channel = isomme.get_channel(self.code)
+        if channel is None:
+            logger.warning(f"Channel {self.code} of criterion results not found in {isomme}.")
+            return None
+        return channel.convert_unit(self.unit)
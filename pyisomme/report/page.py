@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from pyisomme import Channel, Isomme
 from pyisomme.limits import limit_list_sort
-from pyisomme.plotting import Plot_Line, Plot, Plot_Table, Plot_Line_Table
+from pyisomme.plotting import Plot_Line, Plot, Plot_Table, Plot_Line_Table, render_figure, get_content_key, get_plot_channels
 from pyisomme.report.criterion import Criterion
 from pyisomme.unit import Unit, g0
 
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.colors import to_rgb
 import numpy as np
 import io
@@ -23,8 +24,33 @@ class Page:
     def __init__(self, report):
         self.report = report
 
+    def get_figsize(self, presentation) -> tuple[float, float] | None:
+        """
+        Size of figure of this page (see render()).
+        :param presentation: pptx Presentation-object
+        :return: figure size (width, height) in inches or None if page has no figure
+        """
+        return None
+
+    def get_image_key(self, figsize: tuple[float, float]) -> tuple | None:
+        """
+        Key describing the content of the figure of this page, used to cache rendered images (see Image_Cache).
+        :param figsize: see get_figsize()
+        :return: hashable key or None if page has no figure or figure can not be cached
+        """
+        return None
+
+    def render(self, figsize: tuple[float, float]) -> bytes | None:
+        """
+        Render figure of this page to PNG. Independent of the presentation, therefore it can be done in other processes
+        (see Report.export_pptx()).
+        :param figsize: see get_figsize()
+        :return: PNG image or None if page has no figure
+        """
+        return None
+
     @abstractmethod
-    def construct(self, presentation) -> None:
+    def construct(self, presentation, image: bytes = None) -> None:
         pass
 
     def __repr__(self):
@@ -41,7 +67,7 @@ class Page_Cover(Page):
         self.title = report.title
         self.subtitle = f'{report.name}\n{" | ".join([isomme.test_number for isomme in report.isomme_list])}'
 
-    def construct(self, presentation):
+    def construct(self, presentation, image: bytes = None):
         title_slide_layout = presentation.slide_layouts[0]
         slide = presentation.slides.add_slide(title_slide_layout)
         slide.shapes.title.text = self.title
@@ -52,7 +78,7 @@ class Page_Content(Page):
     title: str = None
     footer: str = f"{datetime.now().strftime('%d.%m.%Y')} | {os.getlogin()}"
 
-    def construct(self, presentation) -> None:
+    def construct(self, presentation, image: bytes = None) -> None:
         title_slide_layout = presentation.slide_layouts[1]
         slide = presentation.slides.add_slide(title_slide_layout)
         slide.shapes.title.text = self.title
@@ -71,30 +97,69 @@ class Page_Content(Page):
         p.font.size = Inches(0.2)
 
 
-class Page_Criterion_Table(Page_Content):
-    criteria: dict[Isomme, list[Criterion]]
-    row_label: Callable
-    cell_text: Callable
+class Page_Figure(Page_Content):
+    figsize_y: float = 8
 
-    def __init__(self, report):
-        super().__init__(report)
-        self.criteria = {}
+    def get_figsize(self, presentation) -> tuple[float, float]:
+        placeholder = presentation.slide_layouts[1].placeholders[1]
+        return self.figsize_y * float(placeholder.width) / float(placeholder.height), self.figsize_y
+
+    @abstractmethod
+    def get_figure(self, figsize: tuple[float, float]) -> Figure:
+        pass
+
+    def get_figure_key(self) -> tuple | None:
+        """
+        Content of figure (channels, limits, texts, ...) independent of figure size (see get_content_key()).
+        :return: hashable key or None if figure can not be cached
+        """
+        return None
+
+    def get_image_key(self, figsize: tuple[float, float]) -> tuple | None:
+        figure_key = self.get_figure_key()
+        if figure_key is None:
+            return None
+        return type(self), tuple(figsize), figure_key
+
+    def render(self, figsize: tuple[float, float]) -> bytes:
+        return render_figure(self.get_figure(figsize), close=True)
+
+    def construct(self, presentation, image: bytes = None):
+        """
+        Add slide with figure in place of the content placeholder.
+        :param presentation: pptx Presentation-object
+        :param image: PNG image rendered in advance (see render()). None to render it now.
+        """
+        if image is None:
+            image = self.render(self.get_figsize(presentation))
 
-    def construct(self, presentation):
         super().construct(presentation)
         slide = presentation.slides[-1]
 
         top = slide.placeholders[1].top
         left = slide.placeholders[1].left
         height = slide.placeholders[1].height
-        width = slide.placeholders[1].width
 
         sp = slide.placeholders[1].element
         sp.getparent().remove(sp)
 
-        figsize_y = 8
-        figsize_x = figsize_y * float(width) / float(height)
+        slide.shapes.add_picture(io.BytesIO(image), left=left, top=top, height=height)
 
+
+class Page_Criterion_Table(Page_Figure):
+    criteria: dict[Isomme, list[Criterion]]
+    row_label: Callable
+    cell_text: Callable
+
+    def __init__(self, report):
+        super().__init__(report)
+        self.criteria = {}
+
+    def get_figure_key(self) -> tuple:
+        return get_content_key({isomme: [(self.row_label(criterion), self.cell_text(criterion), criterion.color) for criterion in criteria]
+                                for isomme, criteria in self.criteria.items()})
+
+    def get_figure(self, figsize: tuple[float, float]) -> Figure:
         cell_text = np.full((len(list(self.criteria.values())[0]), len(list(self.criteria.keys()))), np.nan).tolist()
         cell_colors = np.zeros_like(cell_text).tolist()
         for idx_isomme, isomme in enumerate(self.criteria.keys()):
@@ -107,19 +172,15 @@ class Page_Criterion_Table(Page_Content):
         col_labels = [isomme.test_number for isomme in self.criteria.keys()]
         col_colors = [mcolor for mcolor in list(Plot.colors)[:len(self.criteria.keys())]]
 
-        fig = Plot_Table(cell_texts=[cell_text],
-                         cell_colors=[cell_colors],
-                         row_labels=[row_labels],
-                         col_labels=[col_labels],
-                         col_labels_colors=[col_colors],
-                         col_labels_fontweight="bold",
-                         nrows=1,
-                         ncols=1,
-                         figsize=(figsize_x, figsize_y)).fig
-
-        image_steam = io.BytesIO()
-        fig.savefig(image_steam, transparent=True, bbox_inches='tight')
-        slide.shapes.add_picture(image_steam, left=left, top=top, height=height)
+        return Plot_Table(cell_texts=[cell_text],
+                          cell_colors=[cell_colors],
+                          row_labels=[row_labels],
+                          col_labels=[col_labels],
+                          col_labels_colors=[col_colors],
+                          col_labels_fontweight="bold",
+                          nrows=1,
+                          ncols=1,
+                          figsize=figsize).fig
 
 
 class Page_Criterion_Values_Table(Page_Criterion_Table):
@@ -132,29 +193,19 @@ class Page_Criterion_Rating_Table(Page_Criterion_Table):
     cell_text = staticmethod(lambda criterion: f"{criterion.rating:.1f}")
 
 
-class Page_Criterion_Values_Chart(Page_Content):
+class Page_Criterion_Values_Chart(Page_Figure):
     criteria: dict[Isomme, list[Criterion]]
 
     def __init__(self, report):
         super().__init__(report)
         self.criteria = {}
 
-    def construct(self, presentation):
-        super().construct(presentation)
-        slide = presentation.slides[-1]
+    def get_figure_key(self) -> tuple:
+        return get_content_key(({isomme: [(criterion.name, criterion.value, criterion.channel, criterion.limits) for criterion in criteria]
+                                 for isomme, criteria in self.criteria.items()}, self.report.isomme_list))
 
-        top = slide.placeholders[1].top
-        left = slide.placeholders[1].left
-        height = slide.placeholders[1].height
-        width = slide.placeholders[1].width
-
-        sp = slide.placeholders[1].element
-        sp.getparent().remove(sp)
-
-        figsize_y = 8
-        figsize_x = figsize_y * float(width) / float(height)
-
-        fig, ax = plt.subplots(figsize=(figsize_x, figsize_y), layout="constrained")
+    def get_figure(self, figsize: tuple[float, float]) -> Figure:
+        fig, ax = plt.subplots(figsize=figsize, layout="constrained")
 
         bar_width = 0.8 / len(self.criteria)
         x_labels = [c.name for c in list(self.criteria.values())[0]]
@@ -246,12 +297,10 @@ class Page_Criterion_Values_Chart(Page_Content):
         by_label = dict(zip(labels, handles))
         ax.legend(by_label.values(), by_label.keys(), bbox_to_anchor=(1, 1), loc='upper left')
 
-        image_steam = io.BytesIO()
-        fig.savefig(image_steam, transparent=True, bbox_inches='tight')
-        slide.shapes.add_picture(image_steam, left=left, top=top, height=height)
+        return fig
 
 
-class Page_Plot_nxn(Page_Content):
+class Page_Plot_nxn(Page_Figure):
     channels: dict[Isomme, list[list[Channel | str]]]
     nrows: int = 1
     ncols: int = 1
@@ -259,43 +308,30 @@ class Page_Plot_nxn(Page_Content):
     sharey: bool = False
     xlim: tuple[float | int, float | int] = None
     ylim: tuple[float | int, float | int] = None
+    max_points: int | None = 4000  # per line, more than 2 points per pixel (see decimate_min_max())
 
     def __init__(self, report):
         super().__init__(report)
         if self.title is None:
             self.title = self.name
 
-    def construct(self, presentation):
-        super().construct(presentation)
-        slide = presentation.slides[-1]
-
-        top = slide.placeholders[1].top
-        left = slide.placeholders[1].left
-        height = slide.placeholders[1].height
-        width = slide.placeholders[1].width
-
-        sp = slide.placeholders[1].element
-        sp.getparent().remove(sp)
-
-        figsize_y = 8
-        figsize_x = figsize_y * float(width) / float(height)
+    def get_figure_key(self) -> tuple:
+        return get_content_key((get_plot_channels(self.channels), self.nrows, self.ncols, self.sharex, self.sharey, self.xlim, self.ylim, self.report.limits, self.max_points))
 
-        fig = Plot_Line(self.channels,
-                        nrows=self.nrows,
-                        ncols=self.ncols,
-                        sharex=self.sharex,
-                        sharey=self.sharey,
-                        xlim=self.xlim,
-                        ylim=self.ylim,
-                        limits=self.report.limits,
-                        figsize=(figsize_x, figsize_y)).fig
+    def get_figure(self, figsize: tuple[float, float]) -> Figure:
+        return Plot_Line(self.channels,
+                         nrows=self.nrows,
+                         ncols=self.ncols,
+                         sharex=self.sharex,
+                         sharey=self.sharey,
+                         xlim=self.xlim,
+                         ylim=self.ylim,
+                         limits=self.report.limits,
+                         max_points=self.max_points,
+                         figsize=figsize).fig
 
-        image_steam = io.BytesIO()
-        fig.savefig(image_steam, transparent=True, bbox_inches='tight')
-        slide.shapes.add_picture(image_steam, left=left, top=top, height=height)
 
-
-class Page_Line_Table(Page_Content):
+class Page_Line_Table(Page_Figure):
     channels: dict[Isomme, list[list[Channel | str]]]
     cell_texts: list[np.ndarray | list[list, ...]]
     row_labels: list[np.ndarray | list]
@@ -309,41 +345,29 @@ class Page_Line_Table(Page_Content):
     sharey: bool = False
     xlim: tuple[float | int, float | int] = None
     ylim: tuple[float | int, float | int] = None
+    max_points: int | None = 4000
 
     def __init__(self, report):
         super().__init__(report)
 
-    def construct(self, presentation):
-        super().construct(presentation)
-        slide = presentation.slides[-1]
-
-        top = slide.placeholders[1].top
-        left = slide.placeholders[1].left
-        height = slide.placeholders[1].height
-        width = slide.placeholders[1].width
-
-        sp = slide.placeholders[1].element
-        sp.getparent().remove(sp)
-
-        figsize_y = 8
-        figsize_x = figsize_y * float(width) / float(height)
-
-        fig = Plot_Line_Table(channels=self.channels,
-                              cell_texts=self.cell_texts,
-                              row_labels=self.row_labels,
-                              col_labels=self.col_labels,
-                              nrows=self.nrows,
-                              ncols=self.ncols,
-                              sharex=self.sharex,
-                              sharey=self.sharey,
-                              xlim=self.xlim,
-                              ylim=self.ylim,
-                              limits=self.report.limits,
-                              figsize=(figsize_x, figsize_y)).fig
-
-        image_steam = io.BytesIO()
-        fig.savefig(image_steam, transparent=True, bbox_inches='tight')
-        slide.shapes.add_picture(image_steam, left=left, top=top, height=height)
+    def get_figure_key(self) -> tuple:
+        return get_content_key((get_plot_channels(self.channels), self.cell_texts, self.row_labels, self.col_labels, self.nrows, self.ncols,
+                                self.sharex, self.sharey, self.xlim, self.ylim, self.report.limits, self.max_points))
+
+    def get_figure(self, figsize: tuple[float, float]) -> Figure:
+        return Plot_Line_Table(channels=self.channels,
+                               cell_texts=self.cell_texts,
+                               row_labels=self.row_labels,
+                               col_labels=self.col_labels,
+                               nrows=self.nrows,
+                               ncols=self.ncols,
+                               sharex=self.sharex,
+                               sharey=self.sharey,
+                               xlim=self.xlim,
+                               ylim=self.ylim,
+                               limits=self.report.limits,
+                               max_points=self.max_points,
+                               figsize=figsize).fig
 
 
 class Page_OLC(Page_Line_Table):
@@ -1,10 +1,17 @@
-from pyisomme.report.page import Page_Cover
+from __future__ import annotations
+
+from pyisomme.report.page import Page, Page_Cover
+from pyisomme.plotting import Image_Cache
 from pyisomme.limits import Limits
 from pyisomme.report.criterion import Criterion
 
 from pptx import Presentation
 from tqdm.auto import tqdm
 from tqdm.contrib.logging import logging_redirect_tqdm
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import itertools
+import sys
 import time
 import logging
 
@@ -41,11 +48,31 @@ class Report:
             Page_Cover(self),
         ]
 
-    def calculate(self):
+    def calculate(self, workers: int = None):
+        """
+        Calculate criteria of all tests.
+        :param workers: number of processes to calculate the tests in parallel. None to calculate sequentially.
+        The criteria of each test are calculated in one process and their results (value, rating, color, ...) are
+        transferred back (see Criterion.get_results()), as well as unit conversions of the channels of the test.
+        Channels of the criteria contained in the test are transferred by code and unit and are taken from the test
+        again in this process. Filtered and calculated channels are transferred with their data and added to the
+        derived channels of the test, so that they are not created again (see Channel_Reference).
+        Limits are not transferred, they are defined when the criteria are created. On Linux, processes are forked and
+        inherit the report including the channel data. Otherwise, the report is created again for each test inside the
+        process (see calculate_report_isomme()), changes made to the report after its creation are not considered.
+        :return: self
+        """
         with logging_redirect_tqdm():
-            for isomme in tqdm(self.isomme_list, desc="Calculate Report"):
-                logger.info(f"Calculate Criteria for {isomme}")
-                self.criterion_overall[isomme].calculate()
+            if workers is None or len(self.isomme_list) < 2:
+                for isomme in tqdm(self.isomme_list, desc="Calculate Report"):
+                    logger.info(f"Calculate Criteria for {isomme}")
+                    self.criterion_overall[isomme].calculate()
+            else:
+                for isomme, (results, units) in tqdm(zip(self.isomme_list, calculate_report(self, workers)), total=len(self.isomme_list), desc="Calculate Report"):
+                    for channel, unit in zip(isomme.channels, units):
+                        if channel.unit != unit:
+                            channel.convert_unit(unit)
+                    self.criterion_overall[isomme].set_results(results)
         return self
 
     def print_results(self):
@@ -69,14 +96,34 @@ class Report:
     class Criterion_Overall(Criterion):
         pass
 
-    def export_pptx(self, path, template: str = None):
+    def export_pptx(self, path, template: str = None, workers: int = None, image_cache: Image_Cache = None):
+        """
+        Export pages to pptx.
+        :param path: path of pptx file
+        :param template: path of pptx template
+        :param workers: number of processes to render the figures of the pages in parallel (see Page.render()).
+        None to render them sequentially. The slides are constructed in order in this process, the output is identical.
+        Requires processes to be forked (only on Linux, see use_fork()), otherwise the figures are rendered sequentially.
+        :param image_cache: cache of rendered figures, e.g. to export reports repeatedly. Figures with same content
+        (channel data, limits, texts, see Page.get_image_key()) and size are not rendered again. None to render all.
+        :return: self
+        """
         presentation = Presentation(template)
 
         with logging_redirect_tqdm():
-            for page_number, page in enumerate(tqdm(self.pages, desc="Construct Pages")):
+            if workers is None:
+                images = itertools.repeat(None)
+            else:
+                for page in self.pages:
+                    page.__init__(page.report)  # update. report could be changed since init
+                images = render_pages(self.pages, [page.get_figsize(presentation) for page in self.pages], workers, image_cache)
+
+            for page_number, (page, image) in enumerate(tqdm(zip(self.pages, images), total=len(self.pages), desc="Construct Pages")):
                 logger.info(f"{page_number}:{page.name}")
-                page.__init__(page.report)  # update. report could be changed since init  # TODO: TEST!
-                page.construct(presentation)
+                if workers is None:
+                    page.__init__(page.report)  # update. report could be changed since init  # TODO: TEST!
+                    image = render_page(page, page.get_figsize(presentation), image_cache)
+                page.construct(presentation, image)
 
         while True:
             try:
@@ -88,13 +135,162 @@ class Report:
         logger.info(f"pptx successfully exported: {path}")
         return self
 
+
 class MetaReport(Report):
     reports: list[Report]
 
-    def calculate(self):
+    def calculate(self, workers: int = None):
         for report in self.reports:
-            report.calculate()
+            report.calculate(workers=workers)
 
     def print_results(self):
         for report in self.reports:
             report.print_results()
+
+
+worker_report: Report | None = None
+
+
+def use_fork() -> bool:
+    """
+    Worker processes are only forked on Linux. On macOS, forking is not safe (system frameworks are not fork-safe),
+    therefore spawn is the default start method there, as on Windows.
+    :return: True if worker processes inherit the report by forking
+    """
+    return sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods()
+
+
+def init_worker_report(report: Report) -> None:
+    """
+    Set report of forked worker process (see calculate_report()).
+    """
+    global worker_report
+    worker_report = report
+
+
+def get_calculation_results(report: Report, isomme) -> tuple[dict, list]:
+    """
+    :param report: Report-object
+    :param isomme: Isomme-object of report
+    :return: results of overall criterion (see Criterion.get_results()) and units of the channels of the test
+    (criteria can convert channels in place)
+    """
+    return report.criterion_overall[isomme].get_results(), [channel.unit for channel in isomme.channels]
+
+
+def calculate_worker_isomme(idx: int) -> tuple[dict, list]:
+    """
+    Calculate criteria of one test of the report inherited by the forked worker process.
+    :param idx: index of test in isomme_list
+    :return: see get_calculation_results()
+    """
+    isomme = worker_report.isomme_list[idx]
+    logger.info(f"Calculate Criteria for {isomme}")
+    worker_report.criterion_overall[isomme].calculate()
+    return get_calculation_results(worker_report, isomme)
+
+
+def calculate_report_isomme(report_class: type, kwargs: dict, isomme) -> tuple[dict, list]:
+    """
+    Create report for one test and calculate its criteria. Used if processes can not be forked.
+    :param report_class: class of report
+    :param kwargs: title and protocol of report
+    :param isomme: Isomme-object
+    :return: see get_calculation_results()
+    """
+    report = report_class([isomme], **kwargs)
+    logger.info(f"Calculate Criteria for {isomme}")
+    report.criterion_overall[isomme].calculate()
+    return get_calculation_results(report, isomme)
+
+
+def calculate_report(report: Report, workers: int):
+    """
+    Generator calculating the criteria of all tests of the report in a process pool (see Report.calculate()).
+    :param report: Report-object
+    :param workers: number of processes
+    :return: see get_calculation_results() for each test in order of isomme_list
+    """
+    if use_fork():
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                 initializer=init_worker_report, initargs=(report,)) as executor:
+            yield from executor.map(calculate_worker_isomme, range(len(report.isomme_list)))
+    else:
+        kwargs = {"title": report.title, "protocol": getattr(report, "protocol", None)}
+        n = len(report.isomme_list)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(calculate_report_isomme, [type(report)] * n, [kwargs] * n, report.isomme_list)
+
+
+worker_pages: list | None = None
+
+
+def init_worker_pages(pages: list) -> None:
+    """
+    Set pages of forked worker process (see render_pages()).
+    """
+    global worker_pages
+    worker_pages = pages
+
+
+def render_worker_page(idx: int, figsize: tuple[float, float]) -> bytes | None:
+    """
+    Render figure of one page inherited by the forked worker process.
+    :param idx: index of page
+    :param figsize: see Page.get_figsize()
+    :return: see Page.render()
+    """
+    return worker_pages[idx].render(figsize)
+
+
+def render_page(page: Page, figsize: tuple[float, float] | None, image_cache: Image_Cache = None) -> bytes | None:
+    """
+    Render figure of page or take it from cache.
+    :param page: Page-object
+    :param figsize: see Page.get_figsize()
+    :param image_cache: Image_Cache-object or None
+    :return: PNG image or None for pages without figure
+    """
+    if figsize is None:
+        return None
+    key = page.get_image_key(figsize) if image_cache is not None else None
+    if key is not None:
+        image = image_cache.get(key)
+        if image is not None:
+            return image
+    image = page.render(figsize)
+    if key is not None:
+        image_cache.set(key, image)
+    return image
+
+
+def render_pages(pages: list, figsizes: list, workers: int, image_cache: Image_Cache = None):
+    """
+    Generator rendering the figures of the pages in a process pool (see Report.export_pptx()).
+    Cached images are taken from image_cache in this process, rendered images are added to it.
+    :param pages: list of Page-objects
+    :param figsizes: figure size of each page (see Page.get_figsize())
+    :param workers: number of processes
+    :param image_cache: Image_Cache-object or None
+    :return: PNG image of each page in order of pages, None for pages without figure
+    """
+    if not use_fork():
+        logger.warning("Processes are only forked on Linux. Render figures sequentially.")
+        for page, figsize in zip(pages, figsizes):
+            yield render_page(page, figsize, image_cache)
+        return
+
+    keys = [page.get_image_key(figsize) if image_cache is not None and figsize is not None else None
+            for page, figsize in zip(pages, figsizes)]
+    images = [image_cache.get(key) if key is not None else None for key in keys]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                             initializer=init_worker_pages, initargs=(pages,)) as executor:
+        futures = [None if figsize is None or image is not None else executor.submit(render_worker_page, idx, figsize)
+                   for idx, (figsize, image) in enumerate(zip(figsizes, images))]
+        for key, image, future in zip(keys, images, futures):
+            if future is not None:
+                image = future.result()
+                if key is not None:
+                    image_cache.set(key, image)
+            yield image
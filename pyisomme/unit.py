@@ -1,5 +1,7 @@
 import astropy.units as u
 from astropy.constants import g0
+import functools
+import numpy as np
 
 
 u.set_enabled_aliases({"Nm": u.Unit("N*m"),
@@ -11,7 +13,62 @@ g0 = g0
 class Unit:
     def __new__(cls, unit):
         if isinstance(unit, str):
-            unit = unit.replace("°C", "deg_C").replace("°", "deg")
-        if unit == "-":
-            unit = "1"
+            return parse_unit(unit)
+        if isinstance(unit, u.Quantity):  # e.g. g0
+            return quantity_to_unit(unit.value, unit.unit)
         return u.Unit(unit)
+
+
+@functools.lru_cache(maxsize=None)
+def parse_unit(unit: str) -> u.UnitBase:
+    """
+    Parse unit string. Parsing is slow (especially for aliases like "Nm"), therefore each string is parsed only once.
+    :param unit: unit string
+    :return: astropy unit
+    """
+    unit = unit.replace("°C", "deg_C").replace("°", "deg")
+    if unit == "-":
+        unit = "1"
+    return u.Unit(unit)
+
+
+@functools.lru_cache(maxsize=None)
+def quantity_to_unit(value: float, unit: u.UnitBase) -> u.UnitBase:
+    return u.Unit(value * unit)
+
+
+@functools.lru_cache(maxsize=1024)
+def get_conversion(old_unit, new_unit) -> tuple[float, float]:
+    """
+    Scale and offset to convert values from old unit to new unit: new_value = scale * old_value + offset.
+    Offsets only occur for temperatures (e.g. deg_C to K). Astropy resolves each pair of units only once.
+    :param old_unit: Unit-object or str
+    :param new_unit: Unit-object or str
+    :return: (scale, offset)
+    """
+    old_unit, new_unit = Unit(old_unit), Unit(new_unit)
+    try:
+        return old_unit.to(new_unit), 0.0
+    except u.UnitConversionError:
+        offset = old_unit.to(new_unit, 0.0, equivalencies=u.temperature())
+        return old_unit.to(new_unit, 1.0, equivalencies=u.temperature()) - offset, offset
+
+
+def convert(values, old_unit, new_unit, out: np.ndarray = None):
+    """
+    Convert values from old unit to new unit (see get_conversion()).
+    :param values: scalar or array
+    :param old_unit: Unit-object or str
+    :param new_unit: Unit-object or str
+    :param out: array to write result to, e.g. values for in place conversion. None to return new array.
+    :return: converted values
+    """
+    if isinstance(old_unit, u.Quantity):
+        old_unit = Unit(old_unit)
+    if isinstance(new_unit, u.Quantity):
+        new_unit = Unit(new_unit)
+    scale, offset = get_conversion(old_unit, new_unit)
+    values = np.multiply(values, scale, out=out)
+    if offset != 0:
+        values = np.add(values, offset, out=out)
+    return values
@@ -0,0 +1,890 @@
+"""
+Regression benchmarks: compare optimized implementations against the previous reference implementations.
+Run with: python -m unittest tests/benchmark.py
+"""
+import pyisomme
+import astropy.units
+from pyisomme.filtering import filter_iso_6487, filter_sae_j211_1, get_cfc_coefficients
+
+import unittest
+import unittest.mock
+import logging
+import time
+import numpy as np
+import pandas as pd
+import copy
+import fnmatch
+import re
+import xml.etree.ElementTree
+import os
+import tempfile
+import io
+import contextlib
+import zipfile
+import gc
+import tracemalloc
+import pptx
+import matplotlib.pyplot
+
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(format='%(module)-12s %(levelname)-8s %(message)s',
+                    datefmt='%m/%d/%Y %I:%M:%S', level=logging.INFO)
+
+
+def timeit(func, *args, repeat: int = 1, **kwargs):
+    """
+    Return result and best runtime (s) of repeated function calls.
+    """
+    runtime = np.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = func(*args, **kwargs)
+        runtime = min(runtime, time.perf_counter() - t0)
+    return result, runtime
+
+
+def reference_filter_iso_6487(samples, cfc, sample_rate):
+    """Previous per-sample implementation of Channel.cfc(method="ISO-6487")."""
+    samples = np.array(samples, dtype=float)
+    number_of_samples = len(samples)
+    number_of_add_points = 0.01 * sample_rate
+    number_of_add_points = min([max([number_of_add_points, 100]), number_of_samples - 1])
+    index_last_point = number_of_samples + 2 * number_of_add_points - 1
+
+    filter_tab = np.zeros(index_last_point + 1)
+    for i in range(number_of_add_points, number_of_add_points + number_of_samples):
+        filter_tab[i] = samples[i - number_of_add_points]
+    for i in range(0, number_of_add_points):
+        filter_tab[number_of_add_points - i - 1] = 2 * samples[0] - samples[i+1]
+        filter_tab[number_of_samples + number_of_add_points + i] = 2 * samples[number_of_samples-1] - samples[number_of_samples - i - 2]
+
+    b0, b1, b2, a1, a2 = get_cfc_coefficients(cfc, sample_rate)
+
+    y1 = 0
+    for i in range(0, 10):
+        y1 = y1 + filter_tab[i]
+    y1 = y1/10
+    x1 = filter_tab[0]
+    x0 = filter_tab[1]
+    filter_tab[0] = y1
+    filter_tab[1] = y1
+    for i in range(2, index_last_point+1):
+        x2 = x1
+        x1 = x0
+        x0 = filter_tab[i]
+        filter_tab[i] = b0 * x0 + b1 * x1 + b2 * x2 + a1 * filter_tab[i - 1] + a2 * filter_tab[i - 2]
+
+    y1 = 0
+    for i in range(index_last_point, index_last_point-9-1, -1):
+        y1 = y1 + filter_tab[i]
+    y1 = y1/10
+    x1 = filter_tab[index_last_point]
+    x0 = filter_tab[index_last_point-1]
+    filter_tab[index_last_point] = y1
+    filter_tab[index_last_point-1] = y1
+    for i in range(index_last_point-2, 0-1, -1):
+        x2 = x1
+        x1 = x0
+        x0 = filter_tab[i]
+        filter_tab[i] = b0 * x0 + b1 * x1 + b2 * x2 + a1 * filter_tab[i + 1] + a2 * filter_tab[i + 2]
+
+    for i in range(number_of_add_points, number_of_add_points + number_of_samples):
+        samples[i - number_of_add_points] = filter_tab[i]
+    return samples
+
+
+def reference_filter_sae_j211_1(input_values, cfc, sample_interval):
+    """Previous per-sample implementation of Channel.cfc(method="SAE-J211-1")."""
+    a0, a1, a2, b1, b2 = get_cfc_coefficients(cfc, sample_interval)
+
+    output_values = np.zeros(len(input_values))
+    for i in range(2, len(input_values)):
+        output_values[i] = a0 * input_values[i] + a1 * input_values[i - 1] + a2 * input_values[i - 2] + b1 * output_values[i - 1] + b2 * output_values[i - 2]
+
+    input_values = output_values
+    output_values = np.zeros(len(input_values))
+    for i in range(len(input_values)-3, 0, -1):
+        output_values[i] = a0 * input_values[i] + a1 * input_values[i + 1] + a2 * input_values[i + 2] + b1 * output_values[i + 1] + b2 * output_values[i + 2]
+    return output_values
+
+
+def random_signal(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 1, n)
+    return 50 * np.sin(2 * np.pi * 5 * t) + 20 * np.exp(-((t - 0.4) / 0.02) ** 2) + rng.normal(0, 2, n)
+
+
+class BenchmarkFilter(unittest.TestCase):
+    n = 20000  # 100 kHz, 200 ms
+    dt = 1e-5
+
+    def test_iso_6487(self):
+        samples = random_signal(self.n)
+        for cfc in (60, 180, 600, 1000):
+            ref, t_ref = timeit(reference_filter_iso_6487, samples, cfc, self.dt)
+            new, t_new = timeit(filter_iso_6487, samples, cfc, self.dt, repeat=5)
+            np.testing.assert_allclose(new, ref, rtol=1e-9, atol=1e-9 * np.max(np.abs(ref)))
+            logger.info(f"ISO-6487 CFC{cfc}: reference {t_ref*1e3:.1f} ms, lfilter {t_new*1e3:.2f} ms ({t_ref/t_new:.0f}x)")
+
+    def test_sae_j211_1(self):
+        samples = random_signal(self.n)
+        for cfc in (60, 180, 600, 1000):
+            ref, t_ref = timeit(reference_filter_sae_j211_1, samples, cfc, self.dt)
+            new, t_new = timeit(filter_sae_j211_1, samples, cfc, self.dt, repeat=5)
+            np.testing.assert_allclose(new, ref, rtol=1e-9, atol=1e-9 * np.max(np.abs(ref)))
+            logger.info(f"SAE-J211-1 CFC{cfc}: reference {t_ref*1e3:.1f} ms, lfilter {t_new*1e3:.2f} ms ({t_ref/t_new:.0f}x)")
+
+    def test_short_channels(self):
+        for n in (4, 11, 50, 101, 102, 250):
+            samples = random_signal(n, seed=n)
+            np.testing.assert_allclose(filter_iso_6487(samples, 180, self.dt), reference_filter_iso_6487(samples, 180, self.dt), rtol=1e-9, atol=1e-9)
+            np.testing.assert_allclose(filter_sae_j211_1(samples, 180, self.dt), reference_filter_sae_j211_1(samples, 180, self.dt), rtol=1e-9, atol=1e-9)
+
+    def test_channel_cfc(self):
+        channel = pyisomme.create_sample(t_range=(0, 0.2, self.n), y_range=(-10, 10))
+        original = channel.get_data().copy()
+        _, t_new = timeit(channel.cfc, 180, repeat=5)
+        np.testing.assert_array_equal(channel.get_data(), original)
+        logger.info(f"Channel.cfc(180): {t_new*1e3:.2f} ms")
+
+    def test_isomme_cfc(self):
+        channels = [pyisomme.Channel(f"11HEAD0000H3AC{'XYZ'[idx % 3]}P",
+                                     pd.DataFrame(random_signal(self.n, seed=idx), index=np.arange(self.n) * self.dt),
+                                     info=[("Sampling interval", self.dt)]) for idx in range(300)]
+
+        ref, t_ref = timeit(lambda: [reference_filter_iso_6487(channel.get_data(), 180, self.dt) for channel in channels])
+        isomme = pyisomme.Isomme(channels=[copy.deepcopy(channel) for channel in channels])
+        _, t_new = timeit(isomme.cfc, 180)
+        for channel, ref_samples in zip(isomme.channels, ref):
+            np.testing.assert_allclose(channel.get_data(), ref_samples, rtol=1e-9, atol=1e-9 * np.max(np.abs(ref_samples)))
+        logger.info(f"Isomme.cfc(180) 300 channels: reference {t_ref:.2f} s, batched {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x)")
+
+
+def reference_scalar_operations(data: pd.DataFrame) -> pd.DataFrame:
+    """Previous DataFrame based data handling of Channel operators with scalars."""
+    return abs(-((data + 1) * 2 - 1) / 2) ** 2
+
+
+def reference_channel_operation(data_1: pd.DataFrame, data_2: pd.DataFrame) -> pd.DataFrame:
+    """Previous DataFrame based data handling of Channel operators with other channel."""
+    t = np.intersect1d(data_1.index, data_2.index)
+    return pd.DataFrame(np.interp(t, data_1.index.to_numpy(), data_1.iloc[:, 0].to_numpy()) + np.interp(t, data_2.index.to_numpy(), data_2.iloc[:, 0].to_numpy()), index=t)
+
+
+class BenchmarkChannel(unittest.TestCase):
+    def test_memory(self):
+        t = np.linspace(-0.05, 0.25, 30001)  # 100 kHz
+        data_frames = [pd.DataFrame(random_signal(len(t), seed=idx), index=t.copy()) for idx in range(400)]
+        channels = [pyisomme.Channel("11HEAD0000H3ACXA", data, unit=pyisomme.g0) for data in data_frames]
+        ref = sum(data.memory_usage(index=True, deep=True).sum() for data in data_frames)
+        new = sum(channel.values.nbytes + (channel.time.nbytes if channel.time is not None else 0) for channel in channels)
+        self.assertLessEqual(new, 0.55 * ref)
+        for channel, data in zip(channels, data_frames):
+            self.assertTrue(channel.data.equals(data))
+        logger.info(f"Memory of 400 channels: DataFrames {ref/2**20:.0f} MiB, arrays {new/2**20:.0f} MiB ({new/ref:.0%})")
+
+    def test_operations(self):
+        t = np.linspace(0, 0.2, 4001)
+        channel_1 = pyisomme.Channel("11HEAD0000H3ACXA", pd.DataFrame(random_signal(len(t), seed=1), index=t), unit=pyisomme.g0)
+        channel_2 = pyisomme.Channel("11HEAD0000H3ACYA", pd.DataFrame(random_signal(len(t), seed=2), index=t), unit=pyisomme.g0)
+        data_1, data_2 = channel_1.data.copy(), channel_2.data.copy()
+
+        ref, t_ref = timeit(reference_scalar_operations, data_1, repeat=100)
+        new, t_new = timeit(lambda: np.abs(-((channel_1.get_data() + 1) * 2 - 1) / 2) ** 2, repeat=100)
+        np.testing.assert_array_equal(ref.iloc[:, 0].to_numpy(), new)
+        np.testing.assert_array_equal(ref.iloc[:, 0].to_numpy(), (abs(-((channel_1 + 1) * 2 - 1) / 2) ** 2).get_data())
+        logger.info(f"6 scalar operations (data only): DataFrame {t_ref*1e6:.0f} us, array {t_new*1e6:.0f} us ({t_ref/t_new:.0f}x)")
+
+        ref, t_ref = timeit(reference_channel_operation, data_1, data_2, repeat=100)
+        def channel_operation(channel_1, channel_2):
+            t = pyisomme.channel.time_intersect(channel_1, channel_2)
+            return channel_1.get_data(t) + channel_2.get_data(t)
+
+        new, t_new = timeit(channel_operation, channel_1, channel_2, repeat=100)
+        np.testing.assert_array_equal(ref.iloc[:, 0].to_numpy(), new)
+        np.testing.assert_array_equal(ref.iloc[:, 0].to_numpy(), (channel_1 + channel_2).get_data())
+        logger.info(f"Channel + Channel, same time grid (data only): DataFrame {t_ref*1e6:.0f} us, array {t_new*1e6:.0f} us ({t_ref/t_new:.1f}x)")
+
+        t_3 = np.linspace(0, 0.2, 2001)
+        channel_3 = pyisomme.Channel("11HEAD0000H3ACZA", pd.DataFrame(random_signal(len(t_3), seed=3), index=t_3), unit=pyisomme.g0)
+        ref, t_ref = timeit(reference_channel_operation, data_1, channel_3.data.copy(), repeat=100)
+        new, t_new = timeit(channel_operation, channel_1, channel_3, repeat=100)
+        np.testing.assert_array_equal(ref.iloc[:, 0].to_numpy(), new)
+        logger.info(f"Channel + Channel, other sampling rate (data only): DataFrame {t_ref*1e6:.0f} us, array {t_new*1e6:.0f} us ({t_ref/t_new:.1f}x)")
+
+    def test_unit_conversion(self):
+        t = np.linspace(0, 0.2, 4001)
+        channel = pyisomme.Channel("11NECKUP00H3MOYA", pd.DataFrame(random_signal(len(t), seed=1), index=t), unit="N*m")
+        for unit in ("Nm", pyisomme.g0 * pyisomme.Unit("kg*m"), pyisomme.Unit("N*mm")):
+            ref, t_ref = timeit(reference_get_data_unit, channel, unit, repeat=10)
+            new, t_new = timeit(channel.get_data, unit=unit, repeat=100)
+            np.testing.assert_array_equal(new, ref)
+            logger.info(f"get_data(unit={unit!r:.20}): astropy {t_ref*1e6:.0f} us, cached conversion {t_new*1e6:.0f} us ({t_ref/t_new:.0f}x)")
+
+    def test_channel_codes(self):
+        codes = [f"1{position}{main_location}0000H3{dimension}{xyz}A" for position in "13" for main_location in ("HEAD", "CHST", "PELV")
+                 for dimension in ("AC", "DS") for xyz in "XYZ"]
+        ref, t_ref = timeit(lambda: [(reference_is_valid(code), reference_get_default_unit(code)) for code in codes])
+        pyisomme.code.match_channel_codes.cache_clear()
+        new, t_new = timeit(lambda: [(pyisomme.Code(code).is_valid(), pyisomme.Code(code).get_default_unit()) for code in codes])
+        self.assertEqual(ref, new)
+        logger.info(f"Validate {len(codes)} codes: XML scan {t_ref*1e3:.0f} ms, lookup tables {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x)")
+
+        t = np.linspace(0, 0.2, 4001)
+        data = pd.DataFrame(random_signal(len(t)), index=t)
+        _, t_new = timeit(lambda: [pyisomme.Channel(code, data) for code in codes], repeat=3)
+        logger.info(f"Create {len(codes)} channels: {t_new*1e3:.1f} ms (XML scan alone {t_ref*1e3:.0f} ms)")
+
+
+def reference_is_valid(code):
+    """Previous implementation of Code.is_valid()."""
+    root = xml.etree.ElementTree.parse(os.path.join(os.path.dirname(pyisomme.__file__), "channel_codes.xml")).getroot()
+    for element in root.findall("Codification/Element"):
+        if not any(fnmatch.fnmatch(code, channel.get("code")) for channel in element.findall(".//Channel")):
+            return False
+    return True
+
+
+def reference_get_default_unit(code):
+    """Previous implementation of Code.get_default_unit()."""
+    root = xml.etree.ElementTree.parse(os.path.join(os.path.dirname(pyisomme.__file__), "channel_codes.xml")).getroot()
+    for element in root.findall("Codification/Element[@name='Physical Dimension']"):
+        for channel in element.findall(".//Channel"):
+            if fnmatch.fnmatch(code, channel.get("code")) and channel.get("default_unit") is not None:
+                return pyisomme.Unit(channel.get("default_unit"))
+    return None
+
+
+def reference_get_data_unit(channel, unit):
+    """Previous unit conversion of Channel.get_data()."""
+    return (channel.get_data() * channel.unit).to(astropy.units.Unit(unit)).to_value()
+
+
+def reference_calculate_hic(channel, max_delta_t):
+    """Previous implementation of calculate_hic(). Returns (HIC, t1, t2)."""
+    max_delta_t *= 1e-3
+    time_array = np.array(channel.data.index)
+    res = 0
+    res_t1 = None
+    res_t2 = None
+
+    if np.all(channel.get_data() >= 0):
+        for idx_1, t1 in enumerate(time_array[:-1]):
+            upper_limit_idx = (t1 + max_delta_t <= time_array).argmax()
+            idx_2 = upper_limit_idx - 1
+            t2 = time_array[idx_2]
+            a_int = np.trapz(channel.get_data(time_array[idx_1:idx_2+1]), time_array[idx_1:idx_2+1])
+            new_res = (t2 - t1) * (1 / (t2 - t1) * a_int) ** 2.5
+            if new_res > res:
+                res = new_res
+                res_t1 = t1
+                res_t2 = t2
+    else:
+        for idx_1, t1 in enumerate(time_array[:-1]):
+            upper_limit_idx = (t1 + max_delta_t <= time_array).argmax()
+            for idx2_offset, t2 in enumerate(time_array[idx_1+1:upper_limit_idx]):
+                idx_2 = idx_1 + 1 + idx2_offset
+                a_int = np.trapz(channel.get_data(time_array[idx_1:idx_2+1]), time_array[idx_1:idx_2+1])
+                if a_int < 0:
+                    continue
+                new_res = (t2 - t1) * (1 / (t2 - t1) * a_int) ** 2.5
+                if new_res > res:
+                    res = new_res
+                    res_t1 = t1
+                    res_t2 = t2
+    return res, res_t1, res_t2
+
+
+def reference_calculate_xms(channel, min_delta_t, method):
+    """Previous implementation of calculate_xms(). Returns (value, t1, t2)."""
+    min_delta_t *= 1e-3
+    time_array = channel.data.index
+    value_array = channel.get_data()
+    res = 0
+    res_t1 = None
+    res_t2 = None
+
+    if method == "S":
+        for t1 in time_array:
+            t2_pts = time_array[time_array >= t1 + min_delta_t]
+            if len(t2_pts) == 0:
+                break
+            t2 = t2_pts[0]
+            indices = np.where((t1 <= time_array)*(time_array <= t2))
+            new_res = np.min(value_array[indices])
+            if new_res > res:
+                res = new_res
+                res_t1 = t1
+                res_t2 = t2
+
+    elif method == "C":
+        dt = np.append(np.diff(time_array), 0)
+        for value in np.sort(value_array)[::-1]:
+            greater_indices = np.nonzero(value_array >= value)[0]
+            greater_indices_left = np.array([greater_idx for greater_idx in greater_indices if (greater_idx+1) in greater_indices], dtype=int)
+            if np.sum(dt[greater_indices_left]) >= min_delta_t:
+                res = value
+                res_t1 = time_array[greater_indices_left[0]]
+                res_t2 = time_array[greater_indices_left[-1] + 1]
+                break
+    return res, res_t1, res_t2
+
+
+def reference_calculate_vc(channel, scaling_factor=1.3, defo_constant=0.229):
+    """Previous implementation of calculate_vc(). Returns VC channel."""
+    channel = copy.deepcopy(channel).convert_unit("m")
+    c_t = channel.get_data() / defo_constant
+    v = channel.get_data()
+    t = channel.data.index
+    n = len(v)
+    v_t = np.zeros(n)
+    for i in range(n):
+        if 2 <= i < (n - 2):
+            v_t[i] = (8 * (v[i+1] - v[i-1]) - (v[i+2] - v[i-2])) / (12 * (t[i] - t[i-1]))
+    return pyisomme.Channel(channel.code, pd.DataFrame(scaling_factor * v_t * c_t, index=t), unit=channel.unit / pyisomme.Unit("s"))
+
+
+def reference_calculate_olc(c_v, free_flight_phase_displacement=0.065, restraining_phase_displacement=0.235):
+    """Previous implementation of t_2 search in calculate_olc(). Returns (OLC in m/s^2, t_1, t_2)."""
+    c_v = c_v.convert_unit("m/s")
+    v_0 = c_v.get_data(t=0)
+    c_s_rel = (-c_v + v_0).integrate()
+    is_not_free_flight_phase = c_s_rel.data.iloc[:, 0] >= free_flight_phase_displacement
+    t_1 = is_not_free_flight_phase.idxmax()
+    for i_2, t_2 in enumerate(c_s_rel.data.index):
+        if t_2 <= t_1:
+            continue
+        v_2 = c_v.get_data(t=t_2)
+        olc = float((v_0 - v_2)/(t_2 - t_1))
+        if c_s_rel.data.iloc[i_2, 0] - olc * (1/2*t_2**2 + 1/2*t_1**2 - t_1*t_2) >= free_flight_phase_displacement + restraining_phase_displacement:
+            break
+    return olc, t_1, t_2
+
+
+def head_acceleration(n: int, dt: float, resultant: bool = True, seed: int = 0) -> pyisomme.Channel:
+    t = np.arange(n) * dt
+    values = random_signal(n, seed=seed) + 40 * np.exp(-((t - 0.6 * n * dt) / (0.05 * n * dt)) ** 2)
+    if resultant:
+        values = np.abs(values)
+    return pyisomme.Channel("11HEAD0000H3ACRA" if resultant else "11HEAD0000H3ACXA", pd.DataFrame(values, index=t), unit=pyisomme.g0,
+                            info=[("Sampling interval", dt)])
+
+
+class BenchmarkCalculate(unittest.TestCase):
+    def test_hic_resultant(self):
+        channel = head_acceleration(n=4000, dt=5e-5)  # 20 kHz, 200 ms
+        for max_delta_t in (15, 36):
+            ref, t_ref = timeit(reference_calculate_hic, channel, max_delta_t)
+            new, t_new = timeit(pyisomme.calculate_hic, channel, max_delta_t, repeat=3)
+            self.assertEqual(new.get_data()[0], ref[0])
+            self.assertEqual(new.get_info(".Start time"), ref[1])
+            self.assertEqual(new.get_info(".End time"), ref[2])
+            logger.info(f"HIC{max_delta_t} resultant: reference {t_ref*1e3:.0f} ms, prefix sum {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x)")
+
+    def test_hic_non_resultant(self):
+        channel = head_acceleration(n=500, dt=2e-4, resultant=False)  # 5 kHz, 100 ms
+        for max_delta_t in (15, 36):
+            ref, t_ref = timeit(reference_calculate_hic, channel, max_delta_t)
+            new, t_new = timeit(pyisomme.calculate_hic, channel, max_delta_t, repeat=3)
+            self.assertEqual(new.get_data()[0], ref[0])
+            self.assertEqual(new.get_info(".Start time"), ref[1])
+            self.assertEqual(new.get_info(".End time"), ref[2])
+            logger.info(f"HIC{max_delta_t} non-resultant: reference {t_ref:.1f} s, prefix sum {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x)")
+
+
+    def test_xms(self):
+        for n, dt, resultant in ((4000, 5e-5, True), (2000, 1e-4, False), (400, 1e-4, False)):
+            channel = head_acceleration(n=n, dt=dt, resultant=resultant)
+            for method in ("S", "C"):
+                ref, t_ref = timeit(reference_calculate_xms, channel, 3, method)
+                new, t_new = timeit(pyisomme.calculate_xms, channel, 3, method, repeat=3)
+                self.assertEqual(new.get_data()[0], ref[0])
+                if method == "S":
+                    self.assertEqual(new.get_info(".Start time"), ref[1])
+                    self.assertEqual(new.get_info(".End time"), ref[2])
+                logger.info(f"a3ms ({method}, n={n}): reference {t_ref*1e3:.0f} ms, new {t_new*1e3:.2f} ms ({t_ref/t_new:.0f}x)")
+
+    def test_damage(self):
+        t = np.arange(2000) * 1e-4  # 10 kHz, 200 ms
+        channels = [pyisomme.Channel(f"11HEAD0000H3AA{xyz}A", pd.DataFrame(amplitude * np.sin(2 * np.pi * t / 0.05) * np.exp(-((t - 0.05) / 0.02)**2), index=t), unit="rad/s^2")
+                    for xyz, amplitude in zip("XYZ", (8e3, 5e3, 3e3))]
+        ref, t_ref = timeit(pyisomme.calculate_damage, *channels, method="solve_ivp")
+        new, t_new = timeit(pyisomme.calculate_damage, *channels, method="expm", repeat=3)
+        for channel_ref, channel_new in zip(ref[:4], new[:4]):
+            deviation = np.max(np.abs(channel_new.get_data() - channel_ref.get_data())) / np.max(channel_ref.get_data())
+            self.assertLess(deviation, 0.03)
+            logger.info(f"{channel_new.code}: max. {channel_new.get_data().max():.5f} (solve_ivp {channel_ref.get_data().max():.5f}), max. deviation {deviation:.1e}")
+        logger.info(f"Damage: solve_ivp {t_ref*1e3:.0f} ms, expm {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x)")
+
+    def test_vc(self):
+        t = np.arange(4000) * 5e-5  # 20 kHz, 200 ms
+        channels = [pyisomme.Channel(code, pd.DataFrame(-40 * np.sin(np.pi * t / 0.2) + random_signal(len(t), seed=seed) * 0.1, index=t), unit="mm")
+                    for seed, code in enumerate(("11CHSTLEUPH3DSXC", "11CHSTRIUPH3DSXC", "11CHSTLELOH3DSXC", "11CHSTRILOH3DSXC", "11ABDOLE00H3DSXC", "11ABDORI00H3DSXC"))]
+        ref, t_ref = timeit(lambda: [reference_calculate_vc(channel) for channel in channels])
+        new, t_new = timeit(lambda: [pyisomme.calculate_vc(channel) for channel in channels], repeat=3)
+        batch, t_batch = timeit(pyisomme.calculate_vc_channels, channels, repeat=3)
+        for channel_ref, (channel_vc, _), (channel_batch, _) in zip(ref, new, batch):
+            self.assertTrue(np.allclose(channel_vc.get_data(), channel_ref.get_data(), rtol=1e-12, atol=0))
+            self.assertTrue(np.array_equal(channel_batch.get_data(), channel_vc.get_data()))
+        logger.info(f"VC 6 channels: reference {t_ref*1e3:.0f} ms, vectorized {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x), batch {t_batch*1e3:.1f} ms ({t_ref/t_batch:.0f}x)")
+
+    def test_olc(self):
+        t = np.arange(-0.01, 0.3, 1e-4)  # 10 kHz
+        for decel in (30, 20, 5):
+            channel = pyisomme.Channel("10VEHCCG0000VEXA", pd.DataFrame(np.where(t < 0, 15.6, np.maximum(15.6 - decel * 9.81 * t, 0)), index=t), unit="m/s")
+            ref, t_ref = timeit(reference_calculate_olc, copy.deepcopy(channel))
+            new, t_new = timeit(pyisomme.calculate_olc, channel, repeat=3)
+            self.assertEqual(new[0].get_data()[0], ref[0] / 9.81)
+            self.assertEqual(new[0].info.get("t_1 [s]"), ref[1])
+            self.assertEqual(new[0].info.get("t_2 [s]"), ref[2])
+            logger.info(f"OLC ({decel} g sled): reference {t_ref*1e3:.0f} ms, array search {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x)")
+
+    def test_xms_plateau(self):
+        # Plateaus and ties: several windows/values with same exceedance
+        time_array = np.arange(200) * 1e-4
+        for values in (np.r_[np.zeros(50), np.full(100, 5.0), np.zeros(50)],
+                       np.r_[np.full(40, 3.0), np.zeros(20), np.full(40, 3.0), np.zeros(100)],
+                       np.round(random_signal(200, seed=3)),
+                       np.full(200, -1.0)):
+            channel = pyisomme.Channel("11HEAD0000H3ACXA", pd.DataFrame(values, index=time_array), unit=pyisomme.g0)
+            for method in ("S", "C"):
+                ref = reference_calculate_xms(channel, 3, method)
+                new = pyisomme.calculate_xms(channel, 3, method)
+                self.assertEqual(new.get_data()[0], ref[0])
+                if method == "S":
+                    self.assertEqual(new.get_info(".Start time"), ref[1])
+                    self.assertEqual(new.get_info(".End time"), ref[2])
+
+
+def reference_find_channels(isomme, code_pattern):
+    return [channel for channel in isomme.channels if fnmatch.fnmatch(channel.code, code_pattern)]
+
+
+def reference_delete_duplicates(isomme):
+    for code in {channel.code for channel in isomme.channels}:
+        channels = [channel for channel in isomme.channels if fnmatch.fnmatch(channel.code, code)]
+        for channel in channels[1:]:
+            isomme.channels.remove(channel)
+    return isomme
+
+
+def many_channels_isomme(n_duplicates: int = 1) -> pyisomme.Isomme:
+    channels = []
+    for _ in range(n_duplicates):
+        for position in "0123456789":
+            for main_location in ("HEAD", "NECK", "CHST", "PELV", "FEMR", "TIBI"):
+                for xyz in "XYZ":
+                    channels.append(pyisomme.Channel(f"1{position}{main_location}0000H3AC{xyz}A", pd.DataFrame([float(len(channels))])))
+    return pyisomme.Isomme(test_number="benchmark", channels=channels)
+
+
+class BenchmarkIsomme(unittest.TestCase):
+    def test_find_channels(self):
+        isomme = many_channels_isomme()
+        patterns = [f"?{position}{main_location}??????AC{xyz}?" for position in "0123456789" for main_location in ("HEAD", "CHST", "PELV") for xyz in "XYZ"]
+
+        def find_all(find_func):
+            return [find_func(isomme, pattern) for pattern in patterns]
+
+        ref, t_ref = timeit(find_all, reference_find_channels, repeat=3)
+        new, t_new = timeit(find_all, pyisomme.Isomme.find_channels, repeat=3)
+        self.assertEqual(ref, new)
+        logger.info(f"Find {len(patterns)} patterns in {len(isomme.channels)} channels: reference {t_ref*1e3:.1f} ms, new {t_new*1e3:.1f} ms ({t_ref/t_new:.1f}x)")
+
+    def test_get_channel_cache(self):
+        isomme = pyisomme.Isomme(test_number="benchmark")
+        isomme.add_sample_channel(code="11HEAD0000THAAXP", unit="rad/s^2", y_range=[0, 8e5], t_range=(0, 0.1, 2000))
+        isomme.add_sample_channel(code="11HEAD0000THAAYP", unit="rad/s^2", y_range=[0, 5e5], t_range=(0, 0.1, 2000))
+        isomme.add_sample_channel(code="11HEAD0000THAAZP", unit="rad/s^2", y_range=[0, 3e5], t_range=(0, 0.1, 2000))
+        codes = [f"?1HEADDAMA??AA{xyzr}?" for xyzr in "XYZR"] * 3
+
+        def get_all(clear: bool):
+            channels = []
+            for code in codes:
+                if clear:
+                    isomme.clear_derived_channels()
+                channels.append(isomme.get_channel(code))
+            return channels
+
+        ref, t_ref = timeit(get_all, True)
+        isomme.clear_derived_channels()
+        new, t_new = timeit(get_all, False)
+        for channel, channel_new in zip(ref, new):
+            self.assertTrue(channel.data.equals(channel_new.data))
+        logger.info(f"Get {len(codes)} damage channels: without cache {t_ref*1e3:.0f} ms, with cache {t_new*1e3:.0f} ms ({t_ref/t_new:.1f}x)")
+
+    def test_get_channel_patterns(self):
+        isomme = pyisomme.Isomme(test_number="benchmark")
+        for xyz, y_max in zip("XYZ", (300, 200, 100)):
+            isomme.add_sample_channel(code=f"11HEAD0000H3AC{xyz}P", unit="m/s^2", y_range=[0, y_max], t_range=(0, 0.1, 10000))
+        # Same channels requested by differently spelled patterns (as done by different criteria of a report)
+        codes = [code.replace("H3", fine_location_3) for code in ("11HEAD0000H3ACRA", "11HICR0015H3ACRX", "11HEAD003SH3ACRX")
+                 for fine_location_3 in ("H3", "??")]
+
+        def get_all(clear: bool):
+            isomme.clear_derived_channels()
+            channels = []
+            for code in codes:
+                if clear:
+                    isomme.calculation_results = {}
+                channels.append(isomme.get_channel(code))
+            return channels
+
+        ref, t_ref = timeit(get_all, True)
+        new, t_new = timeit(get_all, False)
+        for channel, channel_new in zip(ref, new):  # criteria like HIC convert their input channel in place
+            np.testing.assert_allclose(channel.get_data(unit=channel_new.unit), channel_new.get_data())
+        logger.info(f"Get {len(codes)} channels by differently spelled patterns: without shared calculations {t_ref*1e3:.0f} ms, with shared calculations {t_new*1e3:.0f} ms ({t_ref/t_new:.1f}x)")
+
+    def test_delete_duplicates(self):
+        n = len(many_channels_isomme(n_duplicates=2).channels)
+        ref, t_ref = timeit(reference_delete_duplicates, many_channels_isomme(n_duplicates=2))
+        new, t_new = timeit(pyisomme.Isomme.delete_duplicates, many_channels_isomme(n_duplicates=2))
+        self.assertEqual(sorted(channel.code for channel in ref.channels), sorted(channel.code for channel in new.channels))
+        logger.info(f"Delete duplicates of {n} channels: reference {t_ref*1e3:.0f} ms, new {t_new*1e3:.0f} ms ({t_ref/t_new:.1f}x)")
+
+
+def reference_limit_data(limit, x, x_unit, y_unit):
+    """Previous element-wise evaluation of Limit.get_data()."""
+    x = pyisomme.unit.convert(x, x_unit, limit.x_unit)
+    y = np.array([limit.limit_func(x_i) for x_i in x], dtype=float)
+    return pyisomme.unit.convert(y, limit.y_unit, y_unit)
+
+
+def reference_get_limit_ratings(limits, channel, interpolate=True):
+    """Previous per-sample implementation of Limits.get_limit_ratings()."""
+    limits = pyisomme.limits.limit_list_sort(limits.find_limits(channel.code))
+    channel_times = channel.get_time()
+    channel_values = channel.get_data()
+    limit_data = {limit: reference_limit_data(limit, channel_times, x_unit="s", y_unit=channel.unit) for limit in limits}
+    limit_ratings = []
+    for idx, (channel_time, channel_value) in enumerate(zip(channel_times, channel_values)):
+        if interpolate:
+            limit_ratings.append(np.interp(channel_value, [limit_data[limit][idx] for limit in limits], [limit.rating for limit in limits]))
+        else:
+            for limit, data in limit_data.items():
+                if limit.upper and channel_value < data[idx]:
+                    limit_ratings.append(limit.rating)
+                    break
+                if limit.lower and channel_value >= data[idx]:
+                    limit_ratings.append(limit.rating)
+                    break
+    return limit_ratings
+
+
+def neck_shear_limits() -> pyisomme.Limits:
+    corridor = lambda fx: (lambda x: np.interp(x, [0, 25, 35, 45], fx))
+    return pyisomme.Limits(limit_list=[
+        pyisomme.Limit(["?1NECKUP00??FOX?"], func=corridor([1.9, 1.2, 1.2, 1.1]), y_unit="kN", x_unit="ms", upper=True, rating=4),
+        pyisomme.Limit(["?1NECKUP00??FOX?"], func=corridor([1.9, 1.2, 1.2, 1.1]), y_unit="kN", x_unit="ms", lower=True, rating=4),
+        pyisomme.Limit(["?1NECKUP00??FOX?"], func=corridor([2.3, 1.3, 1.3, 1.1]), y_unit="kN", x_unit="ms", lower=True, rating=2.669),
+        pyisomme.Limit(["?1NECKUP00??FOX?"], func=corridor([2.7, 1.4, 1.4, 1.1]), y_unit="kN", x_unit="ms", lower=True, rating=1.329),
+        pyisomme.Limit(["?1NECKUP00??FOX?"], func=corridor([3.1, 1.5, 1.5, 1.1]), y_unit="kN", x_unit="ms", lower=True, rating=0),
+        pyisomme.Limit(["?1NECKUP00??FOX?"], func=3.5, y_unit="kN", x_unit="ms", lower=True, rating=-np.inf),
+    ])
+
+
+def reference_find_limits(limits, *codes):
+    """Previous implementation of Limits.find_limits() (without removing duplicates)."""
+    output = []
+    for limit in limits.limit_list:
+        for code in codes:
+            for code_pattern in limit.code_patterns:
+                if fnmatch.fnmatch(code, code_pattern):
+                    output.append(limit)
+                try:
+                    if re.match(code_pattern, code):
+                        output.append(limit)
+                except re.error:
+                    continue
+    return output
+
+
+class BenchmarkLimits(unittest.TestCase):
+    def test_find_limits(self):
+        locations = ["HEAD0000H3ACR", "NECKUP00H3FOX", "NECKUP00H3FOZ", "NECKUP00H3MOY", "CHST0000H3DSX", "FEMRLE00H3FOZ", "FEMRRI00H3FOZ", "TIBILEUPH3MOX"]
+        limits = pyisomme.Limits(limit_list=[pyisomme.Limit([f"?{position}{location}?"], func=idx) for position in "0123" for location in locations for idx in range(10)]
+                                 + [pyisomme.Limit([f"1{position}{location}A"], func=0) for position in "13" for location in locations])
+        codes = [f"1{position}{location}{filter_class}" for position in "13" for location in locations for filter_class in "ABCX"]
+        ref, t_ref = timeit(lambda: [list(dict.fromkeys(reference_find_limits(limits, code))) for code in codes])
+        new, t_new = timeit(lambda: [limits.find_limits(code) for code in codes])
+        self.assertEqual(ref, new)
+        _, t_memo = timeit(lambda: [limits.find_limits(code) for code in codes], repeat=3)
+        logger.info(f"Find limits of {len(codes)} codes in {len(limits.limit_list)} limits: fnmatch+re {t_ref*1e3:.0f} ms, "
+                    f"compiled {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x), memoized {t_memo*1e3:.2f} ms ({t_ref/t_memo:.0f}x)")
+
+    def test_limit_ratings(self):
+        t = np.linspace(0, 0.2, 2001)
+        channel = pyisomme.Channel("11NECKUP00H3FOXA", pd.DataFrame(1500 + 20 * random_signal(len(t)), index=t), unit="N")
+        limits = neck_shear_limits()
+        for interpolate in (True, False):
+            ref, t_ref = timeit(reference_get_limit_ratings, limits, channel, interpolate=interpolate)
+            new, t_new = timeit(limits.get_limit_ratings, channel, interpolate=interpolate, repeat=10)
+            np.testing.assert_array_equal(new, ref)
+            logger.info(f"Rate {len(t)} samples against {len(limits.limit_list)} limits (interpolate={interpolate}): "
+                        f"per sample {t_ref*1e3:.0f} ms, vectorized {t_new*1e3:.1f} ms ({t_ref/t_new:.0f}x)")
+
+        _, t_new = timeit(lambda: (limits.get_limit_min_y(channel), limits.get_limit_min_color(channel)), repeat=10)
+        logger.info(f"get_limit_min_y() + get_limit_min_color(): {t_new*1e3:.1f} ms")
+
+
+def reference_parse_xxx_values(text):
+    """Previous implementation of data parsing in parse_xxx()."""
+    array_str = np.array(text.splitlines())
+    array_str[array_str == "NOVALUE"] = np.nan
+    return np.array(array_str, dtype=float)
+
+
+class BenchmarkParsing(unittest.TestCase):
+    def get_channel_file_content(self, n: int) -> bytes:
+        channel = pyisomme.Channel("11HEAD0000H3ACXA", pd.DataFrame(random_signal(n), index=np.arange(n) * 1e-5),
+                                   info=[("Reference channel", "implicit"), ("Time of first sample", 0), ("Sampling interval", 1e-5)])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            channel.write(os.path.join(tmp_dir, "test.001"))
+            with open(os.path.join(tmp_dir, "test.001"), "rb") as xxx_file:
+                content = xxx_file.read()
+        return content.replace(b"\n0.0\n", b"\nNOVALUE\n")
+
+    def test_parse_xxx_values(self):
+        content = self.get_channel_file_content(200000)
+        _, data = pyisomme.parsing.split_xxx(content)
+        megabytes = len(data) / 1e6
+
+        ref, t_ref = timeit(reference_parse_xxx_values, data.decode("utf-8"), repeat=3)
+        new, t_new = timeit(pyisomme.parsing.parse_xxx_values, data, repeat=3)
+        np.testing.assert_array_equal(new, ref)
+        logger.info(f"Parse values ({megabytes:.1f} MB): reference {megabytes/t_ref:.0f} MB/s, new {megabytes/t_new:.0f} MB/s ({t_ref/t_new:.1f}x)")
+
+    def test_parse_xxx(self):
+        content = self.get_channel_file_content(20000)
+        megabytes = len(content) / 1e6
+        isomme = pyisomme.Isomme()
+
+        _, t_new = timeit(pyisomme.parsing.parse_xxx, content, isomme=isomme, repeat=5)
+        logger.info(f"parse_xxx ({megabytes:.2f} MB): {megabytes/t_new:.0f} MB/s")
+
+    def test_read_workers(self):
+        isomme = pyisomme.Isomme(test_number="benchmark", channels=[
+            pyisomme.Channel(f"11HEAD0000H3AC{xyz}A", pd.DataFrame(random_signal(50000, seed), index=np.arange(50000) * 1e-5),
+                             info=[("Reference channel", "implicit"), ("Time of first sample", 0), ("Sampling interval", 1e-5)])
+            for seed in range(10) for xyz in "XYZ"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            isomme.write(os.path.join(tmp_dir, "benchmark.mme"))
+            ref, t_ref = timeit(pyisomme.Isomme().read, os.path.join(tmp_dir, "benchmark.mme"))
+            log = f"Read {len(ref.channels)} channels: sequential {t_ref*1e3:.0f} ms"
+            for workers in (2, 4):
+                new, t_new = timeit(pyisomme.Isomme().read, os.path.join(tmp_dir, "benchmark.mme"), workers=workers)
+                for channel, channel_new in zip(ref.channels, new.channels):
+                    self.assertTrue(channel.data.equals(channel_new.data))
+                log += f", {workers} workers {t_new*1e3:.0f} ms ({t_ref/t_new:.1f}x)"
+        logger.info(log + f" on {os.cpu_count()} CPUs")
+
+    def test_read_multiple(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for test_idx in range(8):
+                isomme = pyisomme.Isomme(test_number=f"benchmark{test_idx}", channels=[
+                    pyisomme.Channel(f"11HEAD0000H3AC{xyz}A", pd.DataFrame(random_signal(20000, test_idx), index=np.arange(20000) * 1e-5),
+                                     info=[("Reference channel", "implicit"), ("Time of first sample", 0), ("Sampling interval", 1e-5)])
+                    for xyz in "XYZ"])
+                isomme.write(os.path.join(tmp_dir, f"benchmark{test_idx}.zip"))
+            ref, t_ref = timeit(pyisomme.read, os.path.join(tmp_dir, "*.zip"), merge=False)
+            new, t_new = timeit(pyisomme.read, os.path.join(tmp_dir, "*.zip"), merge=False, workers=4)
+        self.assertEqual([isomme.test_number for isomme in ref], [isomme.test_number for isomme in new])
+        logger.info(f"Read {len(ref)} tests: sequential {t_ref*1e3:.0f} ms, 4 workers {t_new*1e3:.0f} ms ({t_ref/t_new:.1f}x) on {os.cpu_count()} CPUs")
+
+    def test_read_cache(self):
+        isomme = pyisomme.Isomme(test_number="benchmark", channels=[
+            pyisomme.Channel(f"11HEAD0000H3AC{xyz}A", pd.DataFrame(random_signal(50000, seed), index=np.arange(50000) * 1e-5),
+                             info=[("Reference channel", "implicit"), ("Time of first sample", 0), ("Sampling interval", 1e-5)])
+            for seed in range(10) for xyz in "XYZ"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            isomme.write(os.path.join(tmp_dir, "benchmark.zip"))
+            ref, t_ref = timeit(pyisomme.Isomme().read, os.path.join(tmp_dir, "benchmark.zip"))
+            pyisomme.Isomme().read(os.path.join(tmp_dir, "benchmark.zip"), cache_dir=os.path.join(tmp_dir, "cache"))
+            new, t_new = timeit(pyisomme.Isomme().read, os.path.join(tmp_dir, "benchmark.zip"), cache_dir=os.path.join(tmp_dir, "cache"), repeat=3)
+        for channel, channel_new in zip(ref.channels, new.channels):
+            self.assertTrue(channel.data.equals(channel_new.data))
+        logger.info(f"Read {len(ref.channels)} channels: text {t_ref*1e3:.0f} ms, cache {t_new*1e3:.0f} ms ({t_ref/t_new:.1f}x)")
+
+    def test_parse_xxx_values_fallback(self):
+        np.testing.assert_array_equal(pyisomme.parsing.parse_xxx_values(b"1.5\nNOVALUE\n-2e-3\n"), [1.5, np.nan, -2e-3])
+        self.assertEqual(len(pyisomme.parsing.parse_xxx_values(b"\n")), 0)
+        with self.assertRaises(ValueError):
+            pyisomme.parsing.parse_xxx_values(b"1.5\nabc\n")
+
+
+
+class BenchmarkPlotting(unittest.TestCase):
+    def test_decimate_min_max(self):
+        rng = np.random.default_rng(0)
+        channels = {}
+        for test_number in ("1", "2"):
+            isomme = pyisomme.Isomme(test_number=test_number)
+            for xyzr in "XYZR":
+                channel = pyisomme.create_sample(f"11HEAD0000H3AC{xyzr}A", t_range=(0, 2, 200001), y_range=(0, 500), unit="m/s^2")  # 100 kHz
+                channel.data.iloc[:, 0] += rng.normal(0, 20, len(channel.data))
+                isomme.channels.append(channel)
+            channels[isomme] = [[channel] for channel in isomme.channels]
+
+        results = {}
+        for max_points in (None, 4000):
+            t0 = time.perf_counter()
+            plot = pyisomme.Plot_Line(copy.copy(channels), nrows=2, ncols=2, max_points=max_points, figsize=(10.7, 8))
+            ylims = [ax.get_ylim() for ax in plot.fig.axes]
+            image = plot.render()
+            results[max_points] = (time.perf_counter() - t0, len(image), ylims)
+        self.assertEqual(results[None][2], results[4000][2])  # envelope preserved
+        logger.info(f"Plot 2x2 axes with 2 lines of 200001 samples: all samples {results[None][0]:.2f} s {results[None][1] / 2**10:.0f} KiB, "
+                    f"max_points=4000 {results[4000][0]:.2f} s {results[4000][1] / 2**10:.0f} KiB ({results[None][0] / results[4000][0]:.1f}x)")
+
+
+def reference_render_page(page, figsize):
+    fig = page.get_figure(figsize)
+    image_steam = io.BytesIO()
+    fig.savefig(image_steam, transparent=True, bbox_inches='tight')
+    return image_steam.getvalue()
+
+
+def r137_report():
+    isomme_list = [pyisomme.Isomme().read(os.path.join(os.path.dirname(__file__), "..", "data", "nhtsa", test_number), "[!B][013]*") for test_number in ("11391", "14084")]
+    for isomme in isomme_list:
+        for channel in isomme.channels:
+            if channel.code.position == "1":
+                channel.set_code(fine_location_3="H3")
+            if channel.code.position == "3":
+                channel.set_code(fine_location_3="HF")
+    return pyisomme.report.un.frontal_50kmh_r137.UN_Frontal_50kmh_R137(isomme_list).calculate()
+
+
+def euro_ncap_reports() -> list:
+    data_dir = os.path.join(os.path.dirname(__file__), "..", "data", "nhtsa")
+    v1, v2, v3 = [pyisomme.Isomme().read(os.path.join(data_dir, test_number), "[!B][013]*") for test_number in ("11391", "14084", "09203")]
+    for channel in v1.channels + v2.channels:
+        if channel.code.main_location == "NECK" and channel.code.fine_location_3 in ("00", "??"):
+            channel.set_code(fine_location_3="H3")
+    for channel in v3.channels:
+        if channel.code.main_location == "TIBI" and channel.code.fine_location_3 in ("00", "??"):
+            channel.set_code(fine_location_3="TH")
+    return [pyisomme.report.euro_ncap.frontal_50kmh.EuroNCAP_Frontal_50kmh([v1, v2]),
+            pyisomme.report.euro_ncap.frontal_mpdb.EuroNCAP_Frontal_MPDB([v3, v2, v1])]
+
+
+def reference_calculate_cached(isomme, func, *channels, **kwargs):
+    """Previous Isomme.calculate_cached(): filtering, resultants, BrIC, HIC and xms were not shared."""
+    if func in (pyisomme.Channel.cfc, pyisomme.calculate.calculate_resultant, pyisomme.calculate.calculate_bric,
+                pyisomme.calculate.calculate_hic, pyisomme.calculate.calculate_xms):
+        return func(*channels, **kwargs)
+    return calculate_cached(isomme, func, *channels, **kwargs)
+
+
+calculate_cached = pyisomme.Isomme.calculate_cached
+
+
+class BenchmarkReport(unittest.TestCase):
+    def test_calculate_shared(self):
+        def calculate(report, func):
+            # Fresh copy of the tests, derived channels are cached after the first calculation
+            report = type(report)(copy.deepcopy(report.isomme_list))
+            with unittest.mock.patch.object(pyisomme.Isomme, "calculate_cached", func):
+                with unittest.mock.patch.object(pyisomme.Channel, "cfc", autospec=True, side_effect=pyisomme.Channel.cfc) as cfc:
+                    t0 = time.perf_counter()
+                    report.calculate()
+                    t = time.perf_counter() - t0
+            with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                report.print_results()
+            return stdout.getvalue(), cfc.call_count, t
+
+        log = "Calculate report:"
+        for report in euro_ncap_reports():
+            (ref, n_ref, _), t_ref = timeit(calculate, report, reference_calculate_cached, repeat=3)
+            (new, n_new, _), t_new = timeit(calculate, report, calculate_cached, repeat=3)
+            self.assertEqual(ref, new)
+            log += f" {type(report).__name__} reference {t_ref*1e3:.0f} ms ({n_ref} filter calls), new {t_new*1e3:.0f} ms ({n_new} filter calls) ({t_ref/t_new:.1f}x);"
+        logger.info(log)
+
+    def test_calculate_workers(self):
+        isomme_list = []
+        for idx in range(8):
+            isomme = pyisomme.Isomme().read(os.path.join(os.path.dirname(__file__), "..", "data", "nhtsa", ("11391", "14084")[idx % 2]), "[!B][013]*")
+            isomme.test_number = f"{isomme.test_number}-{idx}"
+            for channel in isomme.channels:
+                if channel.code.position == "1":
+                    channel.set_code(fine_location_3="H3")
+                if channel.code.position == "3":
+                    channel.set_code(fine_location_3="HF")
+            isomme_list.append(isomme)
+
+        log = f"Calculate UN R137 report with {len(isomme_list)} tests:"
+        output = []
+        for workers in (None, 2, 4):
+            report = pyisomme.report.un.frontal_50kmh_r137.UN_Frontal_50kmh_R137(copy.deepcopy(isomme_list))
+            _, t = timeit(report.calculate, workers=workers)
+            with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                report.print_results()
+            output.append(stdout.getvalue())
+            log += f" sequential {t*1e3:.0f} ms" if workers is None else f", {workers} workers {t*1e3:.0f} ms"
+        self.assertEqual(output[0], output[1])
+        self.assertEqual(output[0], output[2])
+        logger.info(log + f" on {os.cpu_count()} CPUs")
+
+    def test_export_pptx_workers(self):
+        report = r137_report()
+
+        log = f"Export UN R137 report with {len(report.pages)} pages:"
+        output = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for workers in (None, 2, 4):
+                path = os.path.join(tmp_dir, f"report_{workers}.pptx")
+                _, t = timeit(report.export_pptx, path, workers=workers)
+                with zipfile.ZipFile(path) as file:
+                    output.append({name: file.read(name) for name in file.namelist() if fnmatch.fnmatch(name, "ppt/*/*.*")})
+                log += f" sequential {t:.1f} s" if workers is None else f", {workers} workers {t:.1f} s"
+        self.assertEqual(output[0], output[1])
+        self.assertEqual(output[0], output[2])
+        logger.info(log + f" on {os.cpu_count()} CPUs")
+
+    def test_export_pptx_memory(self):
+        report = r137_report()
+        presentation = pptx.Presentation()
+        n = 3
+
+        def render_all(render_func):
+            memory = []
+            for _ in range(n):
+                for page in report.pages:
+                    page.__init__(report)
+                    figsize = page.get_figsize(presentation)
+                    if figsize is not None:
+                        render_func(page, figsize)
+                gc.collect()
+                memory.append(tracemalloc.get_traced_memory()[0])
+            return memory
+
+        log = f"Render UN R137 report {n} times:"
+        for name, render_func in (("reference", reference_render_page), ("new", pyisomme.report.page.Page.render)):
+            tracemalloc.start()
+            n_figures = len(matplotlib.pyplot.get_fignums())
+            memory = render_all(render_func)
+            tracemalloc.stop()
+            n_figures = len(matplotlib.pyplot.get_fignums()) - n_figures
+            log += f" {name} {n_figures} open figures, memory growth {(memory[-1] - memory[0]) / 2**20:.1f} MiB per {n - 1} exports;"
+            matplotlib.pyplot.close("all")
+        self.assertEqual(len(matplotlib.pyplot.get_fignums()), 0)
+        logger.info(log)
+
+        image_cache = pyisomme.Image_Cache()
+        output = []
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for idx in range(2):
+                path = os.path.join(tmp_dir, f"report_{idx}.pptx")
+                _, t = timeit(report.export_pptx, path, image_cache=image_cache)
+                with zipfile.ZipFile(path) as file:
+                    output.append({name: file.read(name) for name in file.namelist() if fnmatch.fnmatch(name, "ppt/*/*.*")})
+                log = f"Export UN R137 report with image cache: first {t:.2f} s" if idx == 0 else log + f", repeated {t:.2f} s ({len(image_cache)} images, {image_cache.size / 2**20:.1f} MiB)"
+        self.assertEqual(output[0], output[1])
+        self.assertEqual(len(matplotlib.pyplot.get_fignums()), 0)
+        logger.info(log)
+
+if __name__ == '__main__':
+    unittest.main()
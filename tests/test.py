@@ -1,11 +1,21 @@
 import pyisomme
 
 import unittest
+import unittest.mock
+import fnmatch
+import xml.etree.ElementTree
 import os
 import logging
 import pandas as pd
 import numpy as np
+from scipy.integrate import cumulative_trapezoid
 import shutil
+import io
+import contextlib
+import pickle
+import copy
+import zipfile
+import matplotlib.pyplot
 
 
 logger = logging.getLogger(__name__)
@@ -26,6 +36,18 @@ class TestUnit(unittest.TestCase):
         assert pyisomme.Unit("°/s") == pyisomme.Unit("deg/s")
         assert pyisomme.Unit(pyisomme.Unit("m")) == pyisomme.Unit("m")
 
+    def test_convert(self):
+        values = np.array([0.0, 1.0, -2.5])
+        for old_unit, new_unit in (("kN", "N"), ("Nm", "N*mm"), ("m/s", "km/h"), (pyisomme.g0, "m/s^2"), ("deg", "rad")):
+            np.testing.assert_array_equal(pyisomme.unit.convert(values, old_unit, new_unit),
+                                          (values * pyisomme.Unit(old_unit)).to(pyisomme.Unit(new_unit)).to_value())
+        np.testing.assert_allclose(pyisomme.unit.convert(values, "°C", "K"), [273.15, 274.15, 270.65])
+        np.testing.assert_allclose(pyisomme.unit.convert(np.array([273.15, 373.15]), "K", "°C"), [0, 100], atol=1e-12)
+
+        channel = pyisomme.Channel("11HEAD0000H3TEMP", pd.DataFrame([20.0, 25.0]), unit="°C")
+        np.testing.assert_allclose(channel.get_data(unit="K"), [293.15, 298.15])
+        np.testing.assert_allclose(channel.convert_unit("K").convert_unit("°C").get_data(), [20, 25])
+
 
 class TestParsing(unittest.TestCase):
     def check_if_isomme_not_empty(self, isomme):
@@ -70,6 +92,17 @@ class TestParsing(unittest.TestCase):
         isomme = pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "tests", "iso-8859-1.zip"))
         self.check_if_isomme_not_empty(isomme)
 
+    def test_line_endings(self):
+        with open(os.path.join(__file__, "..", "..", "data", "nhtsa", "11391", "Channel", "11391.001"), "rb") as xxx_file:
+            content = xxx_file.read().replace(b"\r\n", b"\n")
+        info, values = pyisomme.parsing.parse_xxx_content(content)
+        assert len(values) > 0
+        for line_break in (b"\r\n", b"\r"):
+            info_2, values_2 = pyisomme.parsing.parse_xxx_content(content.replace(b"\n", line_break))
+            assert info_2 == info
+            assert pyisomme.parsing.read_xxx_info(io.BytesIO(content.replace(b"\n", line_break))) == info
+            np.testing.assert_array_equal(values_2, values)
+
 
 class TestIsomme(unittest.TestCase):
     def test_init(self):
@@ -85,6 +118,212 @@ class TestIsomme(unittest.TestCase):
         pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", "11391.tar"), "11HEAD??????ACX?")
         pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", "11391.tar.gz"), "11HEAD??????ACX?")
 
+    def test_read_lazy(self):
+        for path in (os.path.join(__file__, "..", "..", "data", "nhtsa", "11391"),
+                     os.path.join(__file__, "..", "..", "data", "nhtsa", "v11391ISO.zip"),
+                     os.path.join(__file__, "..", "..", "data", "nhtsa", "11391.tar"),
+                     os.path.join(__file__, "..", "..", "data", "nhtsa", "11391.tar.gz")):
+            isomme = pyisomme.Isomme().read(path, "11HEAD*")
+            isomme_lazy = pyisomme.Isomme().read(path, "11HEAD*", lazy=True, max_loaded_channels=2)
+            assert not any(channel.is_loaded() for channel in isomme_lazy.channels)
+            for channel, channel_lazy in zip(isomme.channels, isomme_lazy.channels):
+                assert channel.code == channel_lazy.code
+                assert channel.data.equals(channel_lazy.data)
+            assert sum(channel.is_loaded() for channel in isomme_lazy.channels) == 2
+            # Random access (memory-mapped) except for compressed archives
+            data_loader = isomme_lazy.channels[0].data_loader
+            assert (data_loader.content is not None) == path.endswith(".gz")
+            assert (data_loader.offset is not None) == path.endswith(".tar")
+
+            # Modified channels are not unloaded
+            isomme_lazy.channels[0].scale_y(2)
+            isomme_lazy.channels[0].unload()
+            assert isomme_lazy.channels[0].is_loaded()
+            isomme_lazy.channels[1].data.iloc[0, 0] = 1e6
+            isomme_lazy.channels[1].unload()
+            assert isomme_lazy.channels[1].get_data()[0] == 1e6
+            isomme_lazy.channels[2].data = isomme_lazy.channels[2].data * 2
+            assert isomme_lazy.channels[2].data_loader is None
+
+    def test_read_lazy_pickle_copy(self):
+        for path in (os.path.join(__file__, "..", "..", "data", "nhtsa", "11391"),
+                     os.path.join(__file__, "..", "..", "data", "nhtsa", "v11391ISO.zip"),
+                     os.path.join(__file__, "..", "..", "data", "nhtsa", "11391.tar.gz")):
+            isomme = pyisomme.Isomme().read(path, "11HEAD*")
+            isomme_lazy = pyisomme.Isomme().read(path, "11HEAD*", lazy=True)
+            for channel, channel_lazy in zip(isomme.channels, isomme_lazy.channels):
+                for loaded in (False, True):
+                    if loaded:
+                        channel_lazy.load()
+                    channel_pickle = pickle.loads(pickle.dumps(channel_lazy))
+                    channel_copy = copy.deepcopy(channel_lazy)
+                    assert channel_pickle.is_loaded() == channel_copy.is_loaded() == loaded
+                    assert channel.data.equals(channel_pickle.data)
+                    assert channel.data.equals(channel_copy.data)
+                    # Isomme-object is not copied along with channel
+                    assert channel_copy.data_loader.get_isomme() is None
+
+            isomme_copy = copy.deepcopy(isomme_lazy)
+            assert all(channel.data_loader.get_isomme() is isomme_copy for channel in isomme_copy.channels)
+            isomme_pickle = pickle.loads(pickle.dumps(isomme_lazy))
+            assert all(channel.data_loader.get_isomme() is isomme_pickle for channel in isomme_pickle.channels)
+            for channel, channel_pickle in zip(isomme.channels, isomme_pickle.channels):
+                assert channel.data.equals(channel_pickle.data)
+
+    def test_read_workers(self):
+        for path in (os.path.join(__file__, "..", "..", "data", "nhtsa", "11391"),
+                     os.path.join(__file__, "..", "..", "data", "nhtsa", "v11391ISO.zip")):
+            isomme = pyisomme.Isomme().read(path, "11HEAD*")
+            for use_threads in (False, True):
+                isomme_parallel = pyisomme.Isomme().read(path, "11HEAD*", workers=2, use_threads=use_threads)
+                assert [channel.code for channel in isomme.channels] == [channel.code for channel in isomme_parallel.channels]
+                for channel, channel_parallel in zip(isomme.channels, isomme_parallel.channels):
+                    assert channel.data.equals(channel_parallel.data)
+                    assert channel.info == channel_parallel.info
+
+    def test_is_explicit_reference(self):
+        for info, explicit in (([("Reference channel", "explicit"), ("Reference channel name", "11TIRS0000000000")], True),
+                               ([("Reference channel", "implicit"), ("Sampling interval", 1e-4)], False),
+                               ([("Reference channel name", "11TIRS0000000000")], True),
+                               ([("Reference channel name", "11TIRS0000000000"), ("Sampling interval", 1e-4)], False),
+                               ([("Sampling interval", 1e-4)], False)):
+            assert pyisomme.parsing.is_explicit_reference(pyisomme.Info(info)) == explicit
+
+    def test_read_multiple(self):
+        paths = (os.path.join(__file__, "..", "..", "data", "nhtsa", "v11391ISO.zip"),
+                 os.path.join(__file__, "..", "..", "data", "nhtsa", "11391.tar"),
+                 os.path.join(__file__, "..", "..", "data", "nhtsa", "missing.zip"),
+                 os.path.join(__file__, "..", "..", "data", "nhtsa", "11391", "11391.mme"))
+        errors = {}
+        isommes = pyisomme.read(*paths, channel_code_patterns=["11HEAD??????ACX?"], merge=False)
+        isommes_parallel = pyisomme.read(*paths, channel_code_patterns=["11HEAD??????ACX?"], merge=False, workers=2, max_in_flight=1, errors=errors)
+        assert len(isommes) == len(isommes_parallel) == 3
+        for isomme, isomme_parallel in zip(isommes, isommes_parallel):
+            assert isomme.test_number == isomme_parallel.test_number
+            assert isomme.channels[0].data.equals(isomme_parallel.channels[0].data)
+        assert len(errors) == 0
+
+        isommes_lazy = pyisomme.read(*paths, channel_code_patterns=["11HEAD??????ACX?"], merge=False, workers=2, lazy=True, errors=errors)
+        assert len(isommes_lazy) == 3
+        for isomme, isomme_lazy in zip(isommes, isommes_lazy):
+            assert not isomme_lazy.channels[0].is_loaded()
+            assert isomme.channels[0].data.equals(isomme_lazy.channels[0].data)
+        assert len(errors) == 0
+
+        with open("out/invalid.zip", "w") as f:
+            f.write("invalid")
+        isommes_parallel = pyisomme.read(paths[0], "out/invalid.zip", channel_code_patterns=["11HEAD??????ACX?"], workers=2, errors=errors)
+        assert len(isommes_parallel) == 1
+        assert list(errors.keys()) == ["out/invalid.zip"]
+
+    def test_read_cache(self):
+        path = os.path.join(__file__, "..", "..", "data", "nhtsa", "v11391ISO.zip")
+        cache_dir = "out/cache"
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+        isomme = pyisomme.Isomme().read(path, "11HEAD*")
+        isomme_1 = pyisomme.Isomme().read(path, "11HEAD*", cache_dir=cache_dir)
+        isomme_2 = pyisomme.Isomme().read(path, "11HEAD*", cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 2
+        for isomme_cached in (isomme_1, isomme_2):
+            assert isomme.test_number == isomme_cached.test_number
+            assert isomme.test_info == isomme_cached.test_info
+            assert isomme.channel_info == isomme_cached.channel_info
+            for channel, channel_cached in zip(isomme.channels, isomme_cached.channels):
+                assert channel.code == channel_cached.code
+                assert channel.unit == channel_cached.unit
+                assert channel.info == channel_cached.info
+                assert channel.data.equals(channel_cached.data)
+
+        # Truncated data file is read again from source
+        npz_path = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(".npz")][0]
+        with open(npz_path, "rb") as npz_file:
+            content = npz_file.read()
+        for truncated_content in (content[:len(content) // 2], b""):
+            with open(npz_path, "wb") as npz_file:
+                npz_file.write(truncated_content)
+            isomme_3 = pyisomme.Isomme().read(path, "11HEAD*", cache_dir=cache_dir)
+            assert isomme.channels[0].data.equals(isomme_3.channels[0].data)
+            assert len(os.listdir(cache_dir)) == 2
+
+        # Entries of other channel code patterns are kept
+        pyisomme.Isomme().read(path, "11HEAD??????ACX?", cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 4
+        sidecar_paths = sorted(os.listdir(cache_dir))
+        pyisomme.Isomme().read(path, "11HEAD*", cache_dir=cache_dir)
+        assert sorted(os.listdir(cache_dir)) == sidecar_paths
+
+        # Outdated entries of same source are removed
+        source_path = "out/cache_source.zip"
+        shutil.copy(path, source_path)
+        pyisomme.Isomme().read(source_path, "11HEAD*", cache_dir=cache_dir)
+        pyisomme.Isomme().read(source_path, "11HEAD??????ACX?", cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 8
+        stat = os.stat(source_path)
+        os.utime(source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        pyisomme.Isomme().read(source_path, "11HEAD*", cache_dir=cache_dir)
+        assert len(os.listdir(cache_dir)) == 6
+
+        # Eviction
+        pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", "11391.tar"), "11HEAD*", cache_dir=cache_dir, cache_max_size=1)
+        assert len(os.listdir(cache_dir)) == 0
+
+    def test_get_channel_cache(self):
+        isomme = pyisomme.Isomme(test_number="1234")
+        isomme.add_sample_channel(code="11HEAD0000H3ACXP", unit="m/s^2", y_range=[0, 300])
+        isomme.add_sample_channel(code="11HEAD0000H3ACYP", unit="m/s^2", y_range=[0, 200])
+        isomme.add_sample_channel(code="11HEAD0000H3ACZP", unit="m/s^2", y_range=[0, 100])
+
+        channel_r = isomme.get_channel("11HEAD0000H3ACRA")
+        assert isomme.get_channel("11HEAD0000H3ACRA") is channel_r
+
+        # Modified source channel
+        isomme.get_channel("11HEAD0000H3ACXP").scale_y(2)
+        channel_r_scaled = isomme.get_channel("11HEAD0000H3ACRA")
+        assert channel_r_scaled is not channel_r
+        assert channel_r_scaled.get_data().max() > channel_r.get_data().max()
+
+        # Modified derived channel
+        channel_r_scaled.crop(0, 0.05)
+        assert isomme.get_channel("11HEAD0000H3ACRA") is not channel_r_scaled
+
+        # Modified intermediate channel
+        channel_r = isomme.get_channel("11HEAD0000H3ACRA")
+        channel_xa = isomme.get_channel("11HEAD0000H3ACXA")
+        channel_xa.data = channel_xa.data * 0
+        channel_r_new = isomme.get_channel("11HEAD0000H3ACRA")
+        assert channel_r_new is not channel_r
+        assert isomme.get_channel("11HEAD0000H3ACXA") is not channel_xa
+        np.testing.assert_allclose(channel_r_new.get_data(), channel_r.get_data())
+
+        # Unit conversion of cached channel
+        channel_r_new.convert_unit(pyisomme.unit.g0)
+        assert isomme.get_channel("11HEAD0000H3ACRA") is not channel_r_new
+        assert isomme.get_channel("11HEAD0000H3ACRA").unit == pyisomme.Unit("m/s^2")
+
+        # Added channel
+        isomme.add_sample_channel(code="11HEAD0000H3ACRA", unit="m/s^2")
+        assert isomme.get_channel("11HEAD0000H3ACRA") is isomme.channels[-1]
+
+        # Multi-output calculation only once
+        isomme.add_sample_channel(code="11HEAD0000THAAXP", unit="rad/s^2", y_range=[0, 8e5])
+        isomme.add_sample_channel(code="11HEAD0000THAAYP", unit="rad/s^2", y_range=[0, 5e5])
+        isomme.add_sample_channel(code="11HEAD0000THAAZP", unit="rad/s^2", y_range=[0, 3e5])
+        for xyzr in "XYZR":
+            assert isomme.get_channel(f"?1HEADDAMA??AA{xyzr}?") is not None
+        assert len([key for key in isomme.calculation_results if key[0] is pyisomme.calculate.calculate_damage]) == 1
+
+        # Differently spelled code patterns filter and calculate only once
+        channel_xa = isomme.get_channel("11HEAD0000H3ACXA")
+        assert isomme.get_channel("?1HEAD0000H3ACXA") is channel_xa
+        assert isomme.get_channel("11HEAD0000??ACXA") is channel_xa
+        channel_hic = isomme.get_channel("11HICR0015H3ACRX")
+        assert isomme.get_channel("?1HICR0015??ACRX") is channel_hic
+
+        # Modified result of shared calculation
+        channel_xa.scale_y(2)
+        assert isomme.get_channel("?1HEAD0000??ACXA") is not channel_xa
+
     def test_write(self):
         isomme = pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", "11391"), "11HEAD*")
         shutil.rmtree("out/write")
@@ -130,6 +369,25 @@ class TestIsomme(unittest.TestCase):
         assert len(isomme.channels) == 5
         isomme.delete_duplicates(filter_class_duplicates=True)
         assert len(isomme.channels) == 3 and "11HEAD0000H3ACX0" in [c.code for c in isomme.channels]
+        assert [c.data.iloc[0, 0] for c in isomme.channels] == [2, 3, 5]
+
+    def test_find_channels(self):
+        isomme = pyisomme.Isomme(channels=[
+            pyisomme.Channel(code="11HEAD0000H3ACXA", data=pd.DataFrame([1])),
+            pyisomme.Channel(code="11HEAD0000H3ACYA", data=pd.DataFrame([2])),
+            pyisomme.Channel(code="11HEAD????H3ACZA", data=pd.DataFrame([3])),
+        ])
+        assert [c.code for c in isomme.find_channels("11HEAD0000H3AC?A")] == ["11HEAD0000H3ACXA", "11HEAD0000H3ACYA"]
+        assert [c.code for c in isomme.find_channels("11HEAD[?][?]*")] == ["11HEAD????H3ACZA"]
+        assert [c.code for c in isomme.find_channels("11HEAD0000H3AC[!X]A")] == ["11HEAD0000H3ACYA"]
+
+        # Index is updated if channels or codes change
+        isomme.extend(pyisomme.Channel(code="11HEAD0000H3ACZA", data=pd.DataFrame([4])))
+        assert len(isomme.find_channels("11HEAD0000H3AC?A")) == 3
+        isomme.channels[0].set_code(position="3")
+        assert len(isomme.find_channels("11HEAD0000H3AC?A")) == 2
+        isomme.channels.remove(isomme.channels[1])
+        assert [c.code for c in isomme.find_channels("1?HEAD0000H3AC?A")] == ["13HEAD0000H3ACXA", "11HEAD0000H3ACZA"]
 
 
 class TestCode(unittest.TestCase):
@@ -146,6 +404,29 @@ class TestCode(unittest.TestCase):
         with self.assertRaises(AssertionError):
             pyisomme.Code("11HEAD0000H3ACX*")
 
+    def test_code_index(self):
+        codes = ["11HEAD0000H3ACXA", "11HEAD0000H3ACYA", "13HEAD0000H3AC?A", "11NECKUP00H3FOZB", "11HEAD????H3ACXA"]
+        code_index = pyisomme.code.CodeIndex(codes)
+        for code_pattern in ("11HEAD0000H3ACXA", "11HEAD??????AC?A", "1[13]HEAD*", "??HEAD0000H3AC[?]A", "11[!H]???????????",
+                             "11HEAD0000H3ACXA?", "*", "11HEAD0000H3ACX[", "11HEAD0000H3AC[]]A"):
+            assert code_index.find(code_pattern) == [idx for idx, code in enumerate(codes) if fnmatch.fnmatch(code, code_pattern)]
+
+    def test_channel_codes(self):
+        root = xml.etree.ElementTree.parse(os.path.join(os.path.dirname(pyisomme.__file__), "channel_codes.xml")).getroot()
+        for code in ("11HEAD0000H3ACXA", "11NECKUP00H3FOZB", "10VEHCCG0000VEXA", "11CHST0000H3DSXC", "11HEAD??00H3ACXA", "X1HEAD0000H3ACXA", "11HEAD0000H3ZZXA"):
+            code = pyisomme.Code(code)
+            info = {}
+            for element in root.findall("Codification/Element"):
+                for channel in element.findall(".//Channel"):
+                    if fnmatch.fnmatch(code, channel.get("code")):
+                        info[element.get("name")] = channel.get("description")
+                        break
+            assert code.get_info() == info
+            assert code.is_valid() == (len(info) == 9)
+        assert pyisomme.Code("11HEAD0000H3ACXA").get_default_unit() == pyisomme.Unit("m/s^2")
+        assert pyisomme.Code("11NECKUP00H3MOYB").get_default_unit() == pyisomme.Unit("Nm")
+        assert pyisomme.Code("11HEAD0000H3??XA").get_default_unit() is None
+
     def test_combine_codes(self):
         assert pyisomme.code.combine_codes("11HEAD0000H3ACXA", "11HEAD0000H3ACXB") == "11HEAD0000H3ACX?"
         assert pyisomme.code.combine_codes("11HEAD0000H3ACXA", "11HEAD0000H3ACXB", "11HEAD0000H3DSXB", "11HEAD0000H3ACXA") == "11HEAD0000H3??X?"
@@ -194,6 +475,62 @@ class TestChannel(unittest.TestCase):
         self.assertEqual((c_1 - c_2).get_data(unit="m"), 0)
         self.assertEqual((c_1 - 1).get_data(unit="m"), 0)
 
+    def test_data(self):
+        channel = pyisomme.create_sample("11HEAD0000H3ACXP", t_range=(0, 0.1, 1001), y_range=(-10, 10))
+        self.assertIsNone(channel.time)
+        self.assertEqual(channel.time_grid, (0, 0.1, 1001))
+        np.testing.assert_array_equal(channel.data.index, np.linspace(0, 0.1, 1001))
+        self.assertEqual(list(channel.data.columns), ["SAMPLE"])
+
+        # DataFrame is a view on values
+        channel.data.iloc[0, 0] = 5
+        self.assertEqual(channel.get_data()[0], 5)
+        channel.data = pd.DataFrame([1.0, 2.0], index=[0.0, 0.3])
+        np.testing.assert_array_equal(channel.get_time(), [0.0, 0.3])
+        np.testing.assert_array_equal(channel.data.to_numpy(), [[1.0], [2.0]])
+
+        # Non-uniform time array is stored explicitly
+        channel = pyisomme.Channel("11HEAD0000H3ACXP", pd.DataFrame([1.0, 2.0, 3.0], index=[0.0, 0.1, 0.3]))
+        self.assertIsNone(channel.time_grid)
+        self.assertEqual((channel + channel).get_data(t=0.2), 5)
+
+    def test_time_intersect(self):
+        c_1 = pyisomme.create_sample("11HEAD0000H3ACXP", t_range=(0, 0.1, 1001), y_range=(-10, 10))
+        c_2 = pyisomme.create_sample("11HEAD0000H3ACYP", t_range=(0, 0.1, 1001), y_range=(0, 10))
+        # Same time grid: no intersection and interpolation
+        t = pyisomme.channel.time_intersect(c_1, c_2)
+        self.assertIs(t, c_1.get_time())
+        self.assertIs(t, c_2.get_time())
+        np.testing.assert_array_equal((c_1 + c_2).get_data(), c_1.get_data() + c_2.get_data())
+        self.assertEqual((c_1 + c_2).time_grid, c_1.time_grid)
+
+        # Lower sampling rate: common samples
+        c_3 = pyisomme.create_sample("11HEAD0000H3ACZP", t_range=(0, 0.1, 501), y_range=(0, 10))
+        np.testing.assert_array_equal(pyisomme.channel.time_intersect(c_1, c_3), c_3.get_time())
+
+        # Shifted time array: resample to overlapping range
+        c_4 = pyisomme.create_sample("11HEAD0000H3ACZP", t_range=(0.05 + 1e-9, 0.15 + 1e-9, 1001), y_range=(0, 10))
+        t = pyisomme.channel.time_intersect(c_1, c_4)
+        self.assertEqual(len(t), 500)
+        self.assertTrue(np.all((t >= 0.05) & (t <= 0.1)))
+
+    def test_cfc(self):
+        channel = pyisomme.create_sample("11HEAD0000H3ACXP", t_range=(0, 0.1, 1001), y_range=(-10, 10))
+        original = channel.get_data().copy()
+
+        for method in ("ISO-6487", "SAE-J211-1"):
+            filtered = channel.cfc(180, method=method)
+            self.assertEqual(filtered.code.filter_class, "C")
+            self.assertEqual(filtered.info.get("Channel frequency class"), 180)
+            self.assertEqual(len(filtered.get_data()), len(original))
+            np.testing.assert_array_equal(channel.get_data(), original)
+            self.assertIsNone(channel.info.get("Channel frequency class"))
+
+        # 2D input gives same result as each row separately
+        samples = np.vstack([original, 2 * original])
+        np.testing.assert_allclose(pyisomme.filtering.filter_iso_6487(samples, 180, 1e-4)[1],
+                                   pyisomme.filtering.filter_iso_6487(2 * original, 180, 1e-4))
+
 
 class TestLimits(unittest.TestCase):
     def test_get_limits(self):
@@ -202,6 +539,36 @@ class TestLimits(unittest.TestCase):
                                              pyisomme.Limit(code_patterns=["11NECKUP????FOY?"], func=lambda x: 750 - 7.5*x, name="da", color="red", linestyle="-"), ])
         assert len(limits.find_limits("11NECKUP00H3FOXA")) == 2
 
+        # Limits are returned once, even if several patterns or codes match
+        limits.limit_list.append(pyisomme.Limit(code_patterns=["11NECKUP00H3FOYA", "11NECKUP????FOY?"], func=lambda x: 500))
+        assert limits.find_limits("11NECKUP00H3FOYA", "11NECKUP00H3FOYB") == [limits.limit_list[2], limits.limit_list[3]]
+        limits.limit_list.pop(2)
+        assert limits.find_limits("11NECKUP00H3FOYA") == [limits.limit_list[2]]
+
+    def test_limit_ratings(self):
+        limits = pyisomme.Limits(limit_list=[pyisomme.Limit(code_patterns=["11NECKUP00H3FOXA"], func=1, y_unit="kN", upper=True, rating=4),
+                                             pyisomme.Limit(code_patterns=["11NECKUP00H3FOXA"], func=lambda x: np.interp(x, [0, 100], [2, 3]), x_unit="ms", y_unit="kN", lower=True, rating=2),
+                                             pyisomme.Limit(code_patterns=["11NECKUP00H3FOXA"], func=lambda x: 4, y_unit="kN", lower=True, rating=0)])
+        t = np.array([0, 0.05, 0.1, 0.15])
+        channel = pyisomme.Channel("11NECKUP00H3FOXA", pd.DataFrame([500, 2500, 3000, 5000], index=t), unit="N")
+
+        np.testing.assert_array_equal(limits.get_limit_ratings(channel, interpolate=True), [4, 2, 2, 0])
+        np.testing.assert_array_equal(limits.get_limit_ratings(channel, interpolate=False), [4, 2, 2, 2])  # first limit not exceeded
+        assert limits.get_limit_min_rating(channel) == 0
+        assert limits.get_limit_min_y(channel) == 5000
+        assert limits.get_limit_min_x(channel) == 0.15
+        assert limits.get_limits(channel)[0] is limits.limit_list[0]
+        assert [limit.vectorized for limit in limits.limit_list] == [True, True, True]
+
+        # Functions that cannot be evaluated for whole arrays are evaluated element-wise
+        limit = pyisomme.Limit(code_patterns=[], func=lambda x: max(x, 0.5))
+        np.testing.assert_array_equal(limit.func(t), [0.5, 0.5, 0.5, 0.5])
+        assert limit.vectorized is False
+        limit = pyisomme.Limit(code_patterns=[], func=lambda x: np.max([x, 0.1]))
+        np.testing.assert_array_equal(limit.func(t), [0.1, 0.1, 0.1, 0.15])
+        assert limit.vectorized is False
+        assert limit.func(0.2) == 0.2
+
 
 class TestCalculate(unittest.TestCase):
     v1 = pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", "11391"), "??TIBI*", "??FEMR*")
@@ -216,6 +583,11 @@ class TestCalculate(unittest.TestCase):
         assert iso.get_channel(f"?1HEADDAMA??AAZ?") is not None
         assert iso.get_channel(f"?1HEADDAMA??AAR?") is not None
 
+        damage_expm = pyisomme.calculate.calculate_damage(*iso.get_channels("?1HEAD0000THAA??"), method="expm")
+        damage_solve_ivp = pyisomme.calculate.calculate_damage(*iso.get_channels("?1HEAD0000THAA??"), method="solve_ivp")
+        for channel_expm, channel_solve_ivp in zip(damage_expm, damage_solve_ivp):
+            assert np.allclose(channel_expm.get_data(), channel_solve_ivp.get_data(), rtol=0.03, atol=0.03 * np.max(channel_solve_ivp.get_data()))
+
     def test_calculate_neck_MOCx(self):
         v1 = pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", "11391"), "??NECK*")
         for channel in v1:
@@ -242,6 +614,47 @@ class TestCalculate(unittest.TestCase):
         assert channel is not None
         assert channel.code == "11CHST00PCTHDSRA"
 
+    def test_calculate_vc(self):
+        iso = pyisomme.Isomme(test_number="1234")
+        iso.add_sample_channel(code="11CHSTLEUPH3DSXA", unit="mm", y_range=[0, -20])
+        iso.add_sample_channel(code="11ABDOLE00H3DSXA", unit="mm", y_range=[0, -30])
+        channels = iso.get_channels("11CHSTLEUPH3DSXA", "11ABDOLE00H3DSXA")
+        unit = channels[0].unit
+
+        vc_channels = pyisomme.calculate.calculate_vc_channels(channels)
+        for channel, (channel_vc, channel_vc_x) in zip(channels, vc_channels):
+            v = channel.get_data(unit="m")
+            t = channel.data.index
+            v_t = np.zeros(len(v))
+            for i in range(2, len(v) - 2):
+                v_t[i] = (8 * (v[i+1] - v[i-1]) - (v[i+2] - v[i-2])) / (12 * (t[i] - t[i-1]))
+            assert np.allclose(channel_vc.get_data(), 1.3 * v_t * v / 0.229)
+            assert channel_vc_x.get_data()[0] == np.max(np.abs(channel_vc.get_data()))
+
+            channel_vc_single, _ = pyisomme.calculate.calculate_vc(channel)
+            assert np.array_equal(channel_vc_single.get_data(), channel_vc.get_data())
+        assert [channel_vc.code for channel_vc, _ in vc_channels] == ["11VCCRLEUPH3VEXA", "11VCARLE00H3VEXA"]
+        assert channels[0].unit == unit
+
+    def test_calculate_olc(self):
+        t = np.arange(-0.01, 0.2, 1e-4)
+        channel = pyisomme.Channel("10VEHCCG0000VEXA", pd.DataFrame(np.where(t < 0, 15.6, np.maximum(15.6 - 300 * t, 0)), index=t), unit="km/h")
+        c_olc, c_olc_visual = pyisomme.calculate.calculate_olc(channel)
+        assert c_olc.code == "10VEHC0OLC00VEXX"
+        assert c_olc_visual.code == "10VEHC0OLC00VEXA"
+
+        # t_2 is first sample reaching restraining phase displacement
+        t_1, t_2 = c_olc.info.get("t_1 [s]"), c_olc.info.get("t_2 [s]")
+        v = channel.get_data(unit="m/s")
+        s_rel = cumulative_trapezoid(-v + np.interp(0, t, v), t, initial=0)
+        s_rel -= np.interp(0, t, s_rel)
+        for t_i, s_i, v_i in zip(t, s_rel, v):
+            if t_1 < t_i <= t_2:
+                olc = (v[0] - v_i) / (t_i - t_1)
+                reached = s_i - olc * (1/2*t_i**2 + 1/2*t_1**2 - t_1*t_i) >= 0.065 + 0.235
+                assert reached == (t_i == t_2)
+        assert np.isclose(c_olc.get_data()[0], (v[0] - np.interp(t_2, t, v)) / (t_2 - t_1) / 9.81)
+
     def test_calculate_tibia_index(self):
         # Repair wring data
         for channel in self.v1.channels:
@@ -349,6 +762,65 @@ class TestReport(unittest.TestCase):
         report.export_pptx("out/UN_Frontal_50kmh_R137.pptx")
         report.print_results()
 
+    def test_calculate_workers(self):
+        output = []
+        for workers, lazy, fork in ((None, False, True), (2, False, True), (2, True, True), (2, True, False)):
+            isomme_list = [pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", test_number), "[!B][013]*", lazy=lazy) for test_number in ("11391", "14084")]
+            for channel in isomme_list[0].channels + isomme_list[1].channels:
+                if channel.code.position == "1":
+                    channel.set_code(fine_location_3="H3")
+                if channel.code.position == "3":
+                    channel.set_code(fine_location_3="HF")
+
+            report = pyisomme.report.un.frontal_50kmh_r137.UN_Frontal_50kmh_R137(isomme_list)
+            with unittest.mock.patch("pyisomme.report.report.use_fork", return_value=fork):
+                report.calculate(workers=workers)
+            with contextlib.redirect_stdout(io.StringIO()) as stdout:
+                report.print_results()
+            output.append((stdout.getvalue(), [str(channel.unit) for isomme in isomme_list for channel in isomme.channels]))
+        assert output[0] == output[1] == output[2] == output[3]
+
+    def test_calculate_workers_derived_channels(self):
+        isomme_list = [pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", test_number), "[!B][013]*") for test_number in ("11391", "14084")]
+        for channel in isomme_list[0].channels + isomme_list[1].channels:
+            if channel.code.position == "1":
+                channel.set_code(fine_location_3="H3")
+            if channel.code.position == "3":
+                channel.set_code(fine_location_3="HF")
+
+        report = pyisomme.report.un.frontal_50kmh_r137.UN_Frontal_50kmh_R137(isomme_list)
+        # Mocks count calls of this process only, calls in forked workers are not counted
+        with unittest.mock.patch("pyisomme.report.report.use_fork", return_value=True):
+            with unittest.mock.patch.object(pyisomme.Channel, "cfc", autospec=True, side_effect=pyisomme.Channel.cfc) as cfc:
+                with unittest.mock.patch.object(pyisomme.Isomme, "get_channel_uncached", autospec=True, side_effect=pyisomme.Isomme.get_channel_uncached) as get_channel_uncached:
+                    report.calculate(workers=2)
+        assert cfc.call_count == 0
+        # Only channels of the tests are taken from the tests again
+        raw_channels = {id(criterion.channel) for isomme in isomme_list for criterion in report.criterion_overall[isomme].get_subcriteria(pyisomme.report.criterion.Criterion)
+                        if any(criterion.channel is channel for channel in isomme.channels)}
+        assert get_channel_uncached.call_count <= len(raw_channels)
+
+    def test_export_pptx_workers(self):
+        isomme_list = [pyisomme.Isomme().read(os.path.join(__file__, "..", "..", "data", "nhtsa", test_number), "[!B][013]*") for test_number in ("11391", "14084")]
+        for channel in isomme_list[0].channels + isomme_list[1].channels:
+            if channel.code.position == "1":
+                channel.set_code(fine_location_3="H3")
+            if channel.code.position == "3":
+                channel.set_code(fine_location_3="HF")
+
+        report = pyisomme.report.un.frontal_50kmh_r137.UN_Frontal_50kmh_R137(isomme_list)
+        report.calculate()
+        output = []
+        image_cache = pyisomme.Image_Cache()
+        for idx, (workers, cache) in enumerate([(None, None), (2, None), (None, image_cache), (2, image_cache)]):
+            path = f"out/UN_Frontal_50kmh_R137_workers_{idx}.pptx"
+            report.export_pptx(path, workers=workers, image_cache=cache)
+            with zipfile.ZipFile(path) as file:
+                output.append({name: file.read(name) for name in file.namelist() if fnmatch.fnmatch(name, "ppt/*/*.*")})
+        assert len([name for name in output[0] if name.startswith("ppt/media/")]) == len(image_cache) > 0
+        assert output[0] == output[1] == output[2] == output[3]
+        assert len(matplotlib.pyplot.get_fignums()) == 0
+
     def test_UN_Frontal_56kmh_ODB_R94(self):
         for channel in self.v1.channels + self.v2.channels:
             if channel.code.position == "1":
@@ -380,7 +852,61 @@ class TestReport(unittest.TestCase):
         report.print_results()
 
 class TestPlotting(unittest.TestCase):
-    pass
+    def test_render(self):
+        isomme = pyisomme.Isomme(test_number="1234")
+        isomme.add_sample_channel(code="11HEAD0000H3ACXP", unit="m/s^2", y_range=[0, 300])
+        plot = pyisomme.Plot_Line({isomme: [["11HEAD0000H3ACXP"]]})
+        assert plot.fig.number in matplotlib.pyplot.get_fignums()
+        image = plot.render()
+        assert image.startswith(b"\x89PNG")
+        assert plot.fig.number not in matplotlib.pyplot.get_fignums()
+
+    def test_decimate_min_max(self):
+        t = np.linspace(0, 1, 100001)
+        data = pd.DataFrame(np.sin(50 * t) + np.random.default_rng(0).normal(0, 0.1, len(t)), index=t)
+        decimated = pyisomme.decimate_min_max(data, 1000)
+        assert len(decimated) <= 1002
+        assert decimated.index.is_monotonic_increasing
+        assert decimated.index[0] == t[0] and decimated.index[-1] == t[-1]
+        assert decimated.max().iloc[0] == data.max().iloc[0] and decimated.min().iloc[0] == data.min().iloc[0]
+        assert (data.loc[decimated.index] == decimated).all().all()
+
+        # Envelope: minimum and maximum of each bucket (201 samples) kept
+        for idx in (0, 37, 497):
+            bucket = data.iloc[201 * idx:201 * (idx + 1)]
+            assert bucket.idxmax().iloc[0] in decimated.index and bucket.idxmin().iloc[0] in decimated.index
+
+        assert len(pyisomme.decimate_min_max(data.iloc[:1000], 1000)) == 1000
+
+        # Plotted channels are cropped and decimated, but not modified
+        isomme = pyisomme.Isomme(test_number="1234")
+        isomme.add_sample_channel(code="11HEAD0000H3ACXP", unit="m/s^2", y_range=[0, 300])
+        isomme.add_sample_channel(code="11HEAD0000H3ACYP", unit=pyisomme.unit.g0, y_range=[0, 30])
+        channel_y = isomme.channels[1]
+        version = channel_y.version
+        plot = pyisomme.Plot_Line({isomme: [[isomme.channels[0], channel_y]]}, xlim=(0, 50), max_points=10)
+        assert channel_y.unit == pyisomme.Unit(pyisomme.unit.g0) and channel_y.version == version
+        for line in plot.fig.axes[0].get_lines()[:2]:
+            assert len(line.get_xdata()) <= 12
+            assert 0 <= np.min(line.get_xdata()) and np.max(line.get_xdata()) <= 50
+        plot.close()
+
+    def test_image_cache(self):
+        isomme = pyisomme.Isomme(test_number="1234")
+        isomme.add_sample_channel(code="11HEAD0000H3ACXP", unit="m/s^2", y_range=[0, 300])
+        limits = pyisomme.Limits(limit_list=[pyisomme.Limit(["?1HEAD*"], func=10)])
+        key = pyisomme.get_content_key(({isomme: [[isomme.channels[0]]]}, limits, np.nan))
+        assert pyisomme.get_content_key(({isomme: [[isomme.channels[0]]]}, limits, np.nan)) == key
+        isomme.channels[0].scale_y(2)
+        assert pyisomme.get_content_key(({isomme: [[isomme.channels[0]]]}, limits, np.nan)) != key
+
+        image_cache = pyisomme.Image_Cache(max_size=10)
+        image_cache.set("a", b"12345")
+        image_cache.set("b", b"12345")
+        assert image_cache.get("a") == b"12345"
+        image_cache.set("c", b"12345")  # "b" least recently used
+        assert image_cache.get("b") is None
+        assert image_cache.get("a") == b"12345" and len(image_cache) == 2 and image_cache.size == 10
 
 
 class TestCorrelation(unittest.TestCase):